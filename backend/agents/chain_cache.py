@@ -0,0 +1,182 @@
+"""
+=============================================================================
+Sentinel Orchestrator Network (SON) - Chain Data Cache
+=============================================================================
+
+Response cache for network-global chain data that every scan re-fetches
+but that only changes per block or per epoch:
+
+- Top stake pools list and pool details   (StakeAnalyzer)
+- Pool metadata                           (StakeAnalyzer)
+- Recent governance proposals             (VoteDoctor)
+- Latest epoch protocol parameters        (VoteDoctor)
+
+Each endpoint has its own freshness policy (TTL in seconds). Policies
+marked `epoch_scoped` are additionally dropped as soon as a new epoch is
+observed (from the `epoch` field of the protocol parameters response).
+The protocol parameters are the epoch probe, so they get a short TTL:
+a rollover is noticed within minutes, well before the hour-long TTLs of
+the epoch-scoped entries would expire on their own.
+
+The cache is consulted by the shared ChainClient for GET requests only;
+only 200 responses are stored. Hit/miss counters are kept per policy.
+
+TTLs can be overridden via environment, e.g. CHAIN_CACHE_POOL_DETAIL_TTL=60
+
+=============================================================================
+"""
+
+import os
+import re
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional
+
+import httpx
+
+logger = logging.getLogger("SON.chain_cache")
+
+# Maximum number of cached responses across all policies
+CHAIN_CACHE_MAX_ENTRIES = int(os.getenv("CHAIN_CACHE_MAX_ENTRIES", "2048"))
+
+
+# =============================================================================
+# CACHE POLICIES
+# =============================================================================
+
+@dataclass
+class CachePolicy:
+    """Freshness policy for one family of upstream endpoints."""
+    name: str
+    path_pattern: str  # Regex matched against the URL path
+    ttl: float  # Seconds
+    epoch_scoped: bool = False  # Invalidate when a new epoch is observed
+    hits: int = 0
+    misses: int = 0
+    _regex: re.Pattern = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._regex = re.compile(self.path_pattern)
+        env_ttl = os.getenv(f"CHAIN_CACHE_{self.name.upper()}_TTL")
+        if env_ttl:
+            self.ttl = float(env_ttl)
+
+    def matches(self, path: str) -> bool:
+        return self._regex.search(path) is not None
+
+
+def default_policies() -> List[CachePolicy]:
+    """Build the default per-endpoint freshness policies."""
+    return [
+        CachePolicy("pool_list", r"/v0/pools$", ttl=3600, epoch_scoped=True),
+        CachePolicy("pool_detail", r"/v0/pools/[^/]+$", ttl=300),
+        CachePolicy("pool_metadata", r"/v0/pools/[^/]+/metadata$", ttl=3600, epoch_scoped=True),
+        CachePolicy("governance_proposals", r"/v0/governance/proposals$", ttl=120),
+        # Epoch probe: refreshed often so rollovers invalidate the entries above
+        CachePolicy("epoch_parameters", r"/v0/epochs/latest/parameters$", ttl=300),
+    ]
+
+
+# =============================================================================
+# CHAIN CACHE
+# =============================================================================
+
+@dataclass
+class _CacheEntry:
+    response: httpx.Response
+    expires_at: float
+    epoch: Optional[int]
+    policy: CachePolicy
+
+
+class ChainCache:
+    """
+    TTL / epoch-keyed cache of upstream responses.
+
+    Entries are keyed by the same request key the ChainClient uses for
+    coalescing, and evicted least-recently-used beyond `max_entries`.
+    """
+
+    def __init__(
+        self,
+        policies: Optional[List[CachePolicy]] = None,
+        max_entries: int = CHAIN_CACHE_MAX_ENTRIES,
+    ):
+        self.policies = policies if policies is not None else default_policies()
+        self.max_entries = max_entries
+        self.current_epoch: Optional[int] = None
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+
+    def policy_for(self, method: str, url: str) -> Optional[CachePolicy]:
+        """Find the caching policy for a request, if any."""
+        if method.upper() != "GET":
+            return None
+        path = httpx.URL(url).path
+        for policy in self.policies:
+            if policy.matches(path):
+                return policy
+        return None
+
+    def get(self, key: Hashable, policy: CachePolicy) -> Optional[httpx.Response]:
+        """Get a fresh cached response, counting the hit or miss."""
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > time.monotonic():
+            self._entries.move_to_end(key)
+            policy.hits += 1
+            return entry.response
+
+        if entry is not None:
+            del self._entries[key]
+        policy.misses += 1
+        return None
+
+    def put(self, key: Hashable, policy: CachePolicy, response: httpx.Response) -> None:
+        """Store a successful response under its policy's TTL."""
+        if response.status_code != 200:
+            return
+
+        if policy.name == "epoch_parameters":
+            try:
+                self.observe_epoch(int(response.json().get("epoch")))
+            except (TypeError, ValueError, AttributeError):
+                pass
+
+        self._entries[key] = _CacheEntry(
+            response=response,
+            expires_at=time.monotonic() + policy.ttl,
+            epoch=self.current_epoch,
+            policy=policy,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def observe_epoch(self, epoch: int) -> None:
+        """Record the current epoch, dropping epoch-scoped entries on rollover."""
+        if self.current_epoch is not None and epoch > self.current_epoch:
+            stale = [
+                key for key, entry in self._entries.items()
+                if entry.policy.epoch_scoped and entry.epoch != epoch
+            ]
+            for key in stale:
+                del self._entries[key]
+            logger.info(f"Epoch {epoch} started - dropped {len(stale)} epoch-scoped cache entries")
+        if self.current_epoch is None or epoch > self.current_epoch:
+            self.current_epoch = epoch
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-policy hit/miss counters."""
+        return {
+            "entries": len(self._entries),
+            "epoch": self.current_epoch,
+            "policies": {
+                p.name: {"ttl": p.ttl, "hits": p.hits, "misses": p.misses}
+                for p in self.policies
+            },
+        }
@@ -0,0 +1,378 @@
+"""
+=============================================================================
+Sentinel Orchestrator Network (SON) - Shared Chain Data Client
+=============================================================================
+
+This module provides a single, process-wide HTTP client for every agent that
+talks to Cardano chain-data providers (Blockfrost, Koios, IPFS gateways).
+
+Instead of each specialist opening its own `httpx.AsyncClient` per scan
+(and paying a fresh TCP+TLS handshake every time), all agents share one
+keep-alive connection pool:
+
+- Connection-pool limits (max connections / keep-alive connections)
+- HTTP/2 when the optional `h2` package is installed
+- Pre-warming of upstream connections at application startup
+- Graceful close on application shutdown
+- In-flight request coalescing ("singleflight"): identical concurrent
+  requests share a single upstream call and its response; the call is
+  cancelled once every caller waiting on it has been cancelled
+- TTL/epoch-scoped caching of network-global lookups (see chain_cache.py)
+- Per-provider rate limiting with priority lanes and 429/Retry-After
+  back-off (see rate_governor.py)
+- Response observers: passive consumers (e.g. the spent-UTxO index) see
+  every successful upstream response whose path matches their pattern
+
+Usage:
+    from agents.chain_client import get_chain_client
+
+    client = get_chain_client()
+    resp = await client.get(f"{blockfrost_url}/v0/addresses/{addr}", headers=headers)
+
+Configuration (all optional, via environment):
+    CHAIN_HTTP_TIMEOUT          Default request timeout in seconds (30)
+    CHAIN_HTTP_MAX_CONNECTIONS  Max open connections across all hosts (100)
+    CHAIN_HTTP_MAX_KEEPALIVE    Max idle keep-alive connections (20)
+    CHAIN_HTTP_KEEPALIVE_EXPIRY Idle connection expiry in seconds (30)
+    CHAIN_HTTP2                 Enable HTTP/2 if available (true)
+    CHAIN_TLS_VERIFY            Verify upstream TLS certificates (true)
+    CHAIN_HTTP_MAX_RETRIES      Retries of a request answered with 429 (2)
+
+=============================================================================
+"""
+
+import os
+import re
+import json
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from .chain_cache import ChainCache, CachePolicy
+from .rate_governor import QueueTicket, RateGovernor, current_priority, parse_retry_after
+
+# HTTP/2 support is optional - httpx needs the `h2` package for it
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger("SON.chain_client")
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+CHAIN_HTTP_TIMEOUT = float(os.getenv("CHAIN_HTTP_TIMEOUT", "30"))
+CHAIN_HTTP_MAX_CONNECTIONS = int(os.getenv("CHAIN_HTTP_MAX_CONNECTIONS", "100"))
+CHAIN_HTTP_MAX_KEEPALIVE = int(os.getenv("CHAIN_HTTP_MAX_KEEPALIVE", "20"))
+CHAIN_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("CHAIN_HTTP_KEEPALIVE_EXPIRY", "30"))
+CHAIN_HTTP2 = os.getenv("CHAIN_HTTP2", "true").lower() == "true"
+CHAIN_TLS_VERIFY = os.getenv("CHAIN_TLS_VERIFY", "true").lower() == "true"
+CHAIN_HTTP_MAX_RETRIES = int(os.getenv("CHAIN_HTTP_MAX_RETRIES", "2"))
+
+# Upstream hosts pre-warmed at startup (one cheap request each)
+DEFAULT_WARMUP_URLS = [
+    os.getenv("BLOCKFROST_API_URL", "https://cardano-preprod.blockfrost.io/api") + "/v0/health",
+    os.getenv("KOIOS_API_URL", "https://preprod.koios.rest/api/v1") + "/tip",
+]
+
+
+# =============================================================================
+# CHAIN CLIENT
+# =============================================================================
+
+@dataclass
+class _InflightRequest:
+    """An upstream call shared by every caller of an identical request."""
+    task: asyncio.Task
+    ticket: QueueTicket  # Rate-governor lane: the highest priority among callers
+    waiters: int = 0
+
+
+class ChainClient:
+    """
+    Pooled, keep-alive HTTP client shared by all chain-data agents.
+
+    The underlying `httpx.AsyncClient` is created lazily on first use so the
+    client can be constructed at import time, before an event loop exists.
+    Per-request options (headers, timeout, json body) are passed straight
+    through to httpx.
+
+    Requests are coalesced by (method, URL, body, headers): while one
+    upstream call is in flight, identical requests wait on it instead of
+    issuing their own. The upstream call runs as its own task, so a caller
+    being cancelled (e.g. by the Oracle deadline) never cancels it for the
+    other waiters; it is cancelled only when no waiter is left.
+    """
+
+    def __init__(
+        self,
+        timeout: float = CHAIN_HTTP_TIMEOUT,
+        max_connections: int = CHAIN_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections: int = CHAIN_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry: float = CHAIN_HTTP_KEEPALIVE_EXPIRY,
+        http2: bool = CHAIN_HTTP2,
+        verify: bool = CHAIN_TLS_VERIFY,
+        max_retries: int = CHAIN_HTTP_MAX_RETRIES,
+    ):
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.verify = verify
+        self.max_retries = max_retries
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Cache for network-global data (pools, proposals, epoch params)
+        self.cache = ChainCache()
+
+        # Per-provider token buckets with priority lanes
+        self.governor = RateGovernor()
+
+        # (path regex, callback) pairs fed every successful upstream response
+        self._observers: List[Tuple[re.Pattern, Callable[[str, httpx.Response], None]]] = []
+
+        # Singleflight: request key -> in-flight upstream call
+        self._inflight: Dict[Tuple, _InflightRequest] = {}
+        self.stats = {
+            "requests": 0,   # Calls made by agents
+            "upstream": 0,   # Calls actually sent upstream
+            "coalesced": 0,  # Calls served by another in-flight request
+            "abandoned": 0,  # Upstream calls cancelled with no caller left
+        }
+
+        if http2 and not HTTP2_AVAILABLE:
+            logger.debug("h2 package not installed - chain client using HTTP/1.1")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Get the underlying httpx client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+                verify=self.verify,
+            )
+            logger.info(
+                f"Chain client pool opened (http2={self.http2}, "
+                f"max_connections={self.limits.max_connections})"
+            )
+        return self._client
+
+    @property
+    def is_open(self) -> bool:
+        """Check whether the connection pool is currently open."""
+        return self._client is not None and not self._client.is_closed
+
+    # -------------------------------------------------------------------------
+    # REQUEST METHODS
+    # -------------------------------------------------------------------------
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a request through the shared connection pool.
+
+        Cacheable GETs are answered from the chain cache while fresh. If an
+        identical request is already in flight, wait for it and return its
+        response instead of calling upstream again. When the last caller
+        waiting on an upstream call is cancelled (scan early exit or
+        deadline), the call is cancelled too - even if it is still queued in
+        the rate governor - so abandoned scans don't spend provider quota.
+        """
+        self.stats["requests"] += 1
+        key = self._request_key(method, url, kwargs)
+
+        policy = self.cache.policy_for(method, url)
+        if policy is not None:
+            cached = self.cache.get(key, policy)
+            if cached is not None:
+                return cached
+
+        flight = self._inflight.get(key)
+        if flight is None:
+            ticket = QueueTicket(current_priority())
+            task = asyncio.ensure_future(self._send(method, url, key, policy, ticket, **kwargs))
+            flight = _InflightRequest(task, ticket)
+            self._inflight[key] = flight
+            task.add_done_callback(lambda t, k=key: self._request_done(k, t))
+        else:
+            self.stats["coalesced"] += 1
+            # An interactive caller joining a background request moves it up a lane
+            flight.ticket.raise_priority(current_priority())
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller was cancelled: drop the call (new callers get a fresh one)
+                self._forget(key, flight.task)
+                flight.task.cancel()
+                self.stats["abandoned"] += 1
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        key: Tuple,
+        policy: Optional[CachePolicy],
+        ticket: QueueTicket,
+        **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Send a single request upstream and cache it if a policy applies.
+
+        Each attempt waits for the provider's rate governor in the lane of
+        the highest-priority caller (`ticket`); a 429 pauses the provider
+        for its Retry-After period and the request is retried.
+        """
+        for attempt in range(self.max_retries + 1):
+            await self.governor.acquire(url, ticket)
+            self.stats["upstream"] += 1
+            response = await self.client.request(method, url, **kwargs)
+            if response.status_code != 429 or attempt == self.max_retries:
+                break
+            self.governor.throttled(url, parse_retry_after(response.headers.get("Retry-After")))
+        if policy is not None:
+            self.cache.put(key, policy, response)
+        if response.status_code == 200 and self._observers:
+            self._notify_observers(url, response)
+        return response
+
+    def add_response_observer(
+        self,
+        path_pattern: str,
+        callback: Callable[[str, httpx.Response], None]
+    ) -> None:
+        """
+        Register a callback for successful upstream responses.
+
+        The callback runs once per upstream response (not for cache hits or
+        coalesced waiters) whose URL path matches `path_pattern`.
+        """
+        self._observers.append((re.compile(path_pattern), callback))
+
+    def _notify_observers(self, url: str, response: httpx.Response) -> None:
+        """Pass a response to matching observers; observer errors are logged only."""
+        path = httpx.URL(url).path
+        for regex, callback in self._observers:
+            if regex.search(path):
+                try:
+                    callback(url, response)
+                except Exception as e:
+                    logger.debug(f"Response observer failed for {path}: {e}")
+
+    def _forget(self, key: Tuple, task: asyncio.Task) -> None:
+        """Stop coalescing new callers onto an upstream call."""
+        flight = self._inflight.get(key)
+        if flight is not None and flight.task is task:
+            del self._inflight[key]
+
+    def _request_done(self, key: Tuple, task: asyncio.Task) -> None:
+        """Forget a finished in-flight request."""
+        self._forget(key, task)
+        # Mark the exception as retrieved - every waiter may have been cancelled
+        if not task.cancelled():
+            task.exception()
+
+    @staticmethod
+    def _request_key(method: str, url: str, kwargs: Dict[str, Any]) -> Tuple:
+        """Build the coalescing key for a request."""
+        full_url = str(httpx.URL(url, params=kwargs.get("params")))
+        body = kwargs.get("json")
+        if body is not None:
+            body = json.dumps(body, sort_keys=True, separators=(',', ':'))
+        else:
+            body = kwargs.get("content") or kwargs.get("data")
+            if isinstance(body, dict):
+                body = tuple(sorted(body.items()))
+        headers = tuple(sorted((kwargs.get("headers") or {}).items()))
+        return (method.upper(), full_url, body, headers)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a GET request through the shared connection pool."""
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a POST request through the shared connection pool."""
+        return await self.request("POST", url, **kwargs)
+
+    # -------------------------------------------------------------------------
+    # LIFECYCLE
+    # -------------------------------------------------------------------------
+
+    async def warm_up(self, urls: Optional[List[str]] = None, timeout: float = 5.0) -> Dict[str, bool]:
+        """
+        Open connections to upstream hosts ahead of the first scan.
+
+        Failures are logged and ignored - warm-up is an optimization only.
+
+        Args:
+            urls: URLs to touch (defaults to Blockfrost health + Koios tip)
+            timeout: Per-request timeout for warm-up requests
+
+        Returns:
+            Dict mapping URL to whether the warm-up request succeeded
+        """
+        urls = urls or DEFAULT_WARMUP_URLS
+
+        async def _touch(url: str) -> bool:
+            try:
+                await self.get(url, timeout=timeout)
+                return True
+            except Exception as e:
+                logger.debug(f"Warm-up request to {url} failed: {e}")
+                return False
+
+        results = await asyncio.gather(*(_touch(url) for url in urls))
+        warmed = dict(zip(urls, results))
+        logger.info(f"Chain client warmed {sum(results)}/{len(urls)} upstream hosts")
+        return warmed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request counters, in-flight count, cache and governor counters."""
+        return {
+            **self.stats,
+            "in_flight": len(self._inflight),
+            "cache": self.cache.get_stats(),
+            "governor": self.governor.get_stats(),
+        }
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("Chain client pool closed")
+        self._client = None
+
+
+# =============================================================================
+# PROCESS-WIDE INSTANCE
+# =============================================================================
+
+_chain_client: Optional[ChainClient] = None
+
+
+def get_chain_client() -> ChainClient:
+    """Get the process-wide shared chain client."""
+    global _chain_client
+    if _chain_client is None:
+        _chain_client = ChainClient()
+    return _chain_client
+
+
+async def close_chain_client() -> None:
+    """Close the process-wide shared chain client (call on shutdown)."""
+    if _chain_client is not None:
+        await _chain_client.aclose()
@@ -12,6 +12,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from dotenv import load_dotenv
 
+from ..llm_config import gemini_configure_options
+
 try:
     import google.generativeai as genai
     GEMINI_AVAILABLE = True
@@ -60,7 +62,7 @@ These rules are derived from the Cardano Constitution (simplified).
             api_key = os.getenv("GOOGLE_API_KEY")
             model_name = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-exp")
             if api_key:
-                genai.configure(api_key=api_key)
+                genai.configure(api_key=api_key, **gemini_configure_options())
                 self.model = genai.GenerativeModel(
                     model_name,
                     generation_config={
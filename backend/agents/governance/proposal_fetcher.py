@@ -4,7 +4,6 @@ ProposalFetcher Agent
 Fetches governance proposal metadata from IPFS and Blockfrost.
 """
 
-import httpx
 import json
 import logging
 import os
@@ -13,6 +12,7 @@ from dataclasses import dataclass
 
 from dotenv import load_dotenv
 from ..llm_config import AgentLLM
+from ..chain_client import get_chain_client
 
 @dataclass
 class ProposalMetadata:
@@ -32,12 +32,15 @@ class ProposalFetcher:
     Supports CIP-100/108 format.
     """
     
-    # Multiple IPFS gateways for redundancy
+    # Multiple IPFS gateways for redundancy (comma-separated IPFS_GATEWAYS overrides)
     IPFS_GATEWAYS = [
-        "https://ipfs.io/ipfs/",
-        "https://cloudflare-ipfs.com/ipfs/",
-        "https://gateway.pinata.cloud/ipfs/",
-        "https://dweb.link/ipfs/"
+        gateway.strip()
+        for gateway in os.getenv(
+            "IPFS_GATEWAYS",
+            "https://ipfs.io/ipfs/,https://cloudflare-ipfs.com/ipfs/,"
+            "https://gateway.pinata.cloud/ipfs/,https://dweb.link/ipfs/",
+        ).split(",")
+        if gateway.strip()
     ]
     
     def __init__(self):
@@ -74,28 +77,28 @@ class ProposalFetcher:
         if len(ipfs_hash) < 40:
              raise ValueError(f"Invalid IPFS Hash: '{ipfs_hash}'. Too short.")
 
+        client = get_chain_client()
         for gateway in self.IPFS_GATEWAYS:
             url = f"{gateway}{ipfs_hash}"
             try:
-                async with httpx.AsyncClient(timeout=timeout) as client:
-                    response = await client.get(url)
+                response = await client.get(url, timeout=timeout)
+                
+                if response.status_code == 200:
+                    metadata = response.json()
+                    
+                    # Validate CIP-100 structure
+                    if "body" in metadata:
+                        body = metadata['body']
+                        return ProposalMetadata(
+                            title=body.get('title', 'Untitled Proposal'),
+                            abstract=body.get('abstract', '')[:500],
+                            motivation=body.get('motivation', '')[:2000],
+                            rationale=body.get('rationale', '')[:2000],
+                            amount=body.get('amount', 0),
+                            references=body.get('references', [])[:5],
+                            ipfs_hash=ipfs_hash
+                        )
                     
-                    if response.status_code == 200:
-                        metadata = response.json()
-                        
-                        # Validate CIP-100 structure
-                        if "body" in metadata:
-                            body = metadata['body']
-                            return ProposalMetadata(
-                                title=body.get('title', 'Untitled Proposal'),
-                                abstract=body.get('abstract', '')[:500],
-                                motivation=body.get('motivation', '')[:2000],
-                                rationale=body.get('rationale', '')[:2000],
-                                amount=body.get('amount', 0),
-                                references=body.get('references', [])[:5],
-                                ipfs_hash=ipfs_hash
-                            )
-                        
             except Exception as e:
                 self.logger.debug(f"Gateway {gateway} failed: {e}")
                 continue
@@ -0,0 +1,204 @@
+"""
+=============================================================================
+Sentinel Orchestrator Network (SON) - Koios Micro-Batcher
+=============================================================================
+
+Koios bulk endpoints (`tx_info`, `address_info`, `account_info`) accept
+arrays of identifiers, but agents look identifiers up one at a time. This
+module collects single lookups that arrive within a short window - across
+all concurrent scans - into one array POST, then splits the response rows
+back to each caller by their identifier.
+
+With the default settings, N concurrent lookups cost ceil(N / 50) upstream
+requests instead of N.
+
+Usage:
+    from agents.koios_batcher import get_koios_batcher
+
+    row = await get_koios_batcher().fetch(koios_url, "tx_info", tx_hash)
+    if row is not None:
+        ...  # found on chain
+
+Configuration (all optional, via environment):
+    KOIOS_BATCH_WINDOW_MS  How long to wait for more lookups (20)
+    KOIOS_BATCH_MAX_SIZE   Max identifiers per POST (50)
+
+=============================================================================
+"""
+
+import os
+import re
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from .chain_client import get_chain_client
+
+logger = logging.getLogger("SON.koios_batcher")
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+KOIOS_BATCH_WINDOW_MS = float(os.getenv("KOIOS_BATCH_WINDOW_MS", "20"))
+KOIOS_BATCH_MAX_SIZE = int(os.getenv("KOIOS_BATCH_MAX_SIZE", "50"))
+
+# Batchable endpoint -> (request array field, response row identifier field)
+BATCH_ENDPOINTS: Dict[str, Tuple[str, str]] = {
+    "tx_info": ("_tx_hashes", "tx_hash"),
+    "address_info": ("_addresses", "address"),
+    "account_info": ("_stake_addresses", "stake_address"),
+}
+
+
+_HEX_RE = re.compile(r"^[0-9a-fA-F]+$")
+
+
+def normalize_identifier(identifier: str) -> str:
+    """Lowercase hex identifiers (tx hashes): Koios accepts either case but returns lowercase."""
+    return identifier.lower() if _HEX_RE.match(identifier) else identifier
+
+
+# =============================================================================
+# KOIOS BATCHER
+# =============================================================================
+
+@dataclass
+class _PendingBatch:
+    """Identifiers collected for one (base URL, endpoint) pair."""
+    waiters: Dict[str, List[asyncio.Future]] = field(default_factory=dict)
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class KoiosBatcher:
+    """
+    Collects single-identifier Koios lookups into array requests.
+
+    A batch is flushed when its window expires or when it reaches
+    `max_size` distinct identifiers. Identical identifiers in one batch are
+    sent once. Requests go through the shared ChainClient, so pooling and
+    coalescing still apply.
+    """
+
+    def __init__(
+        self,
+        window_ms: float = KOIOS_BATCH_WINDOW_MS,
+        max_size: int = KOIOS_BATCH_MAX_SIZE,
+    ):
+        self.window = window_ms / 1000.0
+        self.max_size = max_size
+        self._pending: Dict[Tuple[str, str], _PendingBatch] = {}
+        # Batches being sent (referenced so their tasks aren't collected)
+        self._sending: Set[asyncio.Task] = set()
+        self.stats = {
+            "lookups": 0,   # Identifiers requested by agents
+            "batches": 0,   # Array POSTs sent
+            "items": 0,     # Distinct identifiers sent upstream
+        }
+
+    async def fetch(self, base_url: str, endpoint: str, identifier: str) -> Optional[Dict[str, Any]]:
+        """
+        Look one identifier up on a batchable Koios endpoint.
+
+        Args:
+            base_url: Koios base URL (network-specific)
+            endpoint: One of BATCH_ENDPOINTS (e.g. "tx_info")
+            identifier: Tx hash, address or stake address
+
+        Returns:
+            The Koios response row for the identifier, or None if not found
+
+        Raises:
+            httpx.HTTPStatusError: The batch was answered with a non-200
+                status (the identifier's presence is unknown)
+            httpx.TransportError: The batch request failed
+        """
+        if endpoint not in BATCH_ENDPOINTS:
+            raise ValueError(f"Koios endpoint '{endpoint}' does not support batching")
+
+        self.stats["lookups"] += 1
+        identifier = normalize_identifier(identifier)
+        key = (base_url, endpoint)
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = _PendingBatch()
+            self._pending[key] = batch
+            batch.timer = asyncio.get_running_loop().call_later(
+                self.window, self._flush, key
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        batch.waiters.setdefault(identifier, []).append(future)
+
+        if len(batch.waiters) >= self.max_size:
+            self._flush(key)
+
+        return await future
+
+    def _flush(self, key: Tuple[str, str]) -> None:
+        """Detach a pending batch and send it."""
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.ensure_future(self._send(key, batch))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send(self, key: Tuple[str, str], batch: _PendingBatch) -> None:
+        """POST one batch and resolve every waiter with its row (or the error)."""
+        base_url, endpoint = key
+        request_field, row_field = BATCH_ENDPOINTS[endpoint]
+        identifiers = list(batch.waiters)
+        self.stats["batches"] += 1
+        self.stats["items"] += len(identifiers)
+
+        try:
+            resp = await get_chain_client().post(
+                f"{base_url}/{endpoint}", json={request_field: identifiers}
+            )
+            if resp.status_code != 200:
+                logger.warning(f"Koios {endpoint} batch of {len(identifiers)} returned {resp.status_code}")
+                # Not found and not answered are different things: fail the lookups
+                raise httpx.HTTPStatusError(
+                    f"Koios {endpoint} returned {resp.status_code}", request=resp.request, response=resp
+                )
+            rows: Dict[str, Dict[str, Any]] = {}
+            for row in resp.json() or []:
+                if isinstance(row, dict) and row.get(row_field):
+                    rows[normalize_identifier(row[row_field])] = row
+        except Exception as e:
+            for futures in batch.waiters.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for identifier, futures in batch.waiters.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(rows.get(identifier))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get lookup/batch counters and the number of batches being collected."""
+        return {**self.stats, "pending_batches": len(self._pending)}
+
+
+# =============================================================================
+# PROCESS-WIDE INSTANCE
+# =============================================================================
+
+_koios_batcher: Optional[KoiosBatcher] = None
+
+
+def get_koios_batcher() -> KoiosBatcher:
+    """Get the process-wide Koios batcher."""
+    global _koios_batcher
+    if _koios_batcher is None:
+        _koios_batcher = KoiosBatcher()
+    return _koios_batcher
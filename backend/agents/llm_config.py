@@ -39,6 +39,9 @@ GEMINI_API_KEY = os.getenv("GOOGLE_API_KEY")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
 LLM_ENABLED = os.getenv("LLM_ENABLED", "true").lower() == "true"
 
+# Override the Gemini API host (e.g. the offline upstream simulator)
+GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT", "")
+
 logger = logging.getLogger("SON.llm")
 
 
@@ -46,6 +49,13 @@ logger = logging.getLogger("SON.llm")
 # LLM CLIENT INITIALIZATION
 # =============================================================================
 
+def gemini_configure_options() -> Dict[str, Any]:
+    """Extra genai.configure() arguments for a custom GEMINI_API_ENDPOINT."""
+    if not GEMINI_API_ENDPOINT:
+        return {}
+    return {"transport": "rest", "client_options": {"api_endpoint": GEMINI_API_ENDPOINT}}
+
+
 def init_gemini_client() -> bool:
     """Initialize the Gemini API client."""
     if not GEMINI_AVAILABLE:
@@ -61,7 +71,7 @@ def init_gemini_client() -> bool:
         return False
     
     try:
-        genai.configure(api_key=GEMINI_API_KEY)
+        genai.configure(api_key=GEMINI_API_KEY, **gemini_configure_options())
         logger.info(f"Gemini client initialized with model: {GEMINI_MODEL}")
         return True
     except Exception as e:
@@ -0,0 +1,166 @@
+"""
+=============================================================================
+Sentinel Orchestrator Network (SON) - Network Routing
+=============================================================================
+
+Decides which Cardano network (preprod or mainnet) an identifier lives on,
+so agents query the right Koios instance instead of probing preprod first
+and mainnet second.
+
+- Bech32 prefixes are decisive: `addr_test` / `stake_test` are testnet
+  (routed to preprod), `addr` / `stake` are mainnet.
+- Identifiers that carry no network tag (bare 64-hex tx hashes, policy
+  IDs) are ambiguous: the caller queries every network in parallel and
+  takes the first positive answer ("hedged" lookup).
+- Whichever network an identifier resolved to is remembered in a bounded
+  LRU, so repeat scans of the same target hit one network directly.
+
+Usage:
+    from agents.network_router import detect_network, get_network_cache
+
+    network = detect_network(address) or get_network_cache().get(address)
+
+Configuration (all optional, via environment):
+    KOIOS_API_URL            Preprod Koios base URL
+    KOIOS_MAINNET_API_URL    Mainnet Koios base URL
+    NETWORK_CACHE_MAX_ENTRIES  Learned identifier->network entries (10000)
+
+=============================================================================
+"""
+
+import os
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("SON.network_router")
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+PREPROD = "preprod"
+MAINNET = "mainnet"
+
+# Koios base URL per network, in hedging preference order
+KOIOS_NETWORK_URLS: Dict[str, str] = {
+    PREPROD: os.getenv("KOIOS_API_URL", "https://preprod.koios.rest/api/v1"),
+    MAINNET: os.getenv("KOIOS_MAINNET_API_URL", "https://api.koios.rest/api/v1"),
+}
+
+NETWORK_CACHE_MAX_ENTRIES = int(os.getenv("NETWORK_CACHE_MAX_ENTRIES", "10000"))
+
+# Bech32 human-readable prefixes that pin an identifier to a network.
+# Testnet prefixes must be checked before their mainnet counterparts.
+_NETWORK_PREFIXES = (
+    ("addr_test1", PREPROD),
+    ("stake_test1", PREPROD),
+    ("addr1", MAINNET),
+    ("stake1", MAINNET),
+)
+
+
+# =============================================================================
+# DETECTION
+# =============================================================================
+
+def detect_network(identifier: str) -> Optional[str]:
+    """
+    Detect the network of an identifier from its bech32 prefix.
+
+    Returns:
+        "preprod" or "mainnet", or None when the identifier is ambiguous
+        (tx hashes, policy IDs and other network-agnostic values)
+    """
+    if not identifier:
+        return None
+    lowered = identifier.lower()
+    for prefix, network in _NETWORK_PREFIXES:
+        if lowered.startswith(prefix):
+            return network
+    return None
+
+
+def network_for_url(url: str) -> Optional[str]:
+    """Infer which network a provider base URL serves (e.g. Blockfrost)."""
+    lowered = url.lower()
+    if "preprod" in lowered:
+        return PREPROD
+    if "mainnet" in lowered or "api.koios.rest" in lowered:
+        return MAINNET
+    return None
+
+
+# =============================================================================
+# LEARNED NETWORK CACHE
+# =============================================================================
+
+class NetworkCache:
+    """
+    Bounded LRU remembering which network each identifier resolved to.
+
+    Only positive resolutions are stored - an identifier that was not found
+    anywhere is queried again next time.
+    """
+
+    def __init__(self, max_entries: int = NETWORK_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, identifier: str) -> Optional[str]:
+        """Get the learned network for an identifier, if any."""
+        network = self._entries.get(identifier)
+        if network is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(identifier)
+        self.hits += 1
+        return network
+
+    def remember(self, identifier: str, network: str) -> None:
+        """Record the network an identifier resolved to."""
+        self._entries[identifier] = network
+        self._entries.move_to_end(identifier)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget all learned networks."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get entry count and hit/miss counters."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def candidate_networks(identifier: str, cache: Optional["NetworkCache"] = None) -> List[str]:
+    """
+    List the networks worth querying for an identifier.
+
+    A bech32 prefix or a learned resolution yields a single network;
+    otherwise every configured network is returned for a hedged lookup.
+    """
+    network = detect_network(identifier)
+    if network is None and cache is not None:
+        network = cache.get(identifier)
+    if network is not None:
+        return [network]
+    return list(KOIOS_NETWORK_URLS)
+
+
+# =============================================================================
+# PROCESS-WIDE INSTANCE
+# =============================================================================
+
+_network_cache: Optional[NetworkCache] = None
+
+
+def get_network_cache() -> NetworkCache:
+    """Get the process-wide learned network cache."""
+    global _network_cache
+    if _network_cache is None:
+        _network_cache = NetworkCache()
+    return _network_cache
@@ -20,11 +20,12 @@ Based on simplified_agent_flow.txt:
 =============================================================================
 """
 
+import os
 import asyncio
 import base64
 import json
 from typing import Any, Dict, Optional, List
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import nacl.signing
 from nacl.signing import SigningKey
@@ -37,6 +38,8 @@ from .specialists import (
     MempoolSniffer,
     ReplayDetector,
 )
+from .scan_planner import get_scan_planner
+from .target_router import TargetType, classify_target
 
 
 # =============================================================================
@@ -52,6 +55,59 @@ class AggregatedResult:
     findings: List[str]
     specialist_results: Dict[str, Any]
     confidence: float  # 0.0 - 1.0
+    missing: List[str] = field(default_factory=list)  # Specialists that timed out
+    decided_by: Optional[str] = None  # Specialist whose result settled the verdict early
+    timings: Dict[str, float] = field(default_factory=dict)  # Specialist -> milliseconds until done
+
+
+# Severities that force a DANGER vote in fusion, so may end collection early
+DECISIVE_SEVERITIES = (Severity.HIGH, Severity.CRITICAL)
+
+
+@dataclass
+class DecisiveRule:
+    """
+    A specialist outcome that settles the verdict on its own.
+
+    Any HIGH or CRITICAL severity already forces a DANGER vote in fusion,
+    so once a matching result arrives the remaining specialists cannot
+    change the verdict and are cancelled.
+    """
+    min_severity: Severity
+    specialist: str = "*"  # Specialist name, or "*" for any
+    require_success: bool = True  # Ignore results from failed scans
+
+    def __post_init__(self):
+        # A lower threshold would cancel specialists on results that don't force DANGER
+        if self.min_severity not in DECISIVE_SEVERITIES:
+            raise ValueError(
+                f"Decisive severity must be one of {[s.value for s in DECISIVE_SEVERITIES]}, "
+                f"not {self.min_severity.value}"
+            )
+
+    def matches(self, name: str, result: Dict[str, Any]) -> bool:
+        if self.specialist not in ("*", name):
+            return False
+        if self.require_success and not result.get("success", True):
+            return False
+        try:
+            severity = Severity(result.get("severity", "low"))
+        except ValueError:
+            return False
+        return OracleAgent._severity_rank(severity) >= OracleAgent._severity_rank(self.min_severity)
+
+
+def default_decisive_rules() -> List[DecisiveRule]:
+    """Build decisive rules from ORACLE_DECISIVE_SEVERITY ("none" disables)."""
+    level = os.getenv("ORACLE_DECISIVE_SEVERITY", "critical").strip().lower()
+    if level in ("", "none", "off"):
+        return []
+    allowed = [s.value for s in DECISIVE_SEVERITIES]
+    if level not in allowed:
+        raise ValueError(
+            f"ORACLE_DECISIVE_SEVERITY must be one of {allowed} or 'none', not {level!r}"
+        )
+    return [DecisiveRule(min_severity=Severity(level))]
 
 
 class OracleAgent(BaseAgent):
@@ -80,6 +136,32 @@ class OracleAgent(BaseAgent):
         "ReplayDetector": 0.20, # Replay attacks are severe
     }
     
+    # Per-specialist deadlines in seconds; finished results are kept when
+    # a slower specialist misses its deadline
+    DEFAULT_SPECIALIST_TIMEOUT = float(os.getenv("ORACLE_SPECIALIST_TIMEOUT", "10.0"))
+    SPECIALIST_TIMEOUTS = {
+        "BlockScanner": DEFAULT_SPECIALIST_TIMEOUT,
+        "StakeAnalyzer": DEFAULT_SPECIALIST_TIMEOUT,
+        "VoteDoctor": DEFAULT_SPECIALIST_TIMEOUT,
+        "MempoolSniffer": DEFAULT_SPECIALIST_TIMEOUT,
+        "ReplayDetector": DEFAULT_SPECIALIST_TIMEOUT,
+    }
+    
+    # Specialists that can produce findings for each kind of target
+    # (see target_router); unrecognized targets get every specialist
+    SPECIALIST_PROFILES = {
+        TargetType.PAYMENT_ADDRESS: (
+            "BlockScanner", "StakeAnalyzer", "VoteDoctor", "MempoolSniffer", "ReplayDetector",
+        ),
+        TargetType.STAKE_ADDRESS: ("BlockScanner", "StakeAnalyzer", "VoteDoctor"),
+        TargetType.TX_HASH: ("BlockScanner", "MempoolSniffer", "ReplayDetector"),
+        TargetType.POLICY_ID: ("BlockScanner",),
+        TargetType.GOV_ACTION_ID: ("BlockScanner", "VoteDoctor"),
+    }
+    
+    # Outcomes that end specialist collection early (see DecisiveRule)
+    DECISIVE_RULES = default_decisive_rules()
+    
     def __init__(self, enable_llm: bool = True):
         """
         Initialize the Oracle Agent with all specialist agents.
@@ -208,6 +290,9 @@ class OracleAgent(BaseAgent):
                 for name, result in aggregated.specialist_results.items()
             },
             "confidence": aggregated.confidence,
+            "missing_specialists": aggregated.missing,
+            "decided_by": aggregated.decided_by,
+            "timings": aggregated.timings,
             "evidence": self.generate_hash(
                 f"{policy_id}|{oracle_status}|{aggregated.overall_risk}"
             ),
@@ -239,7 +324,8 @@ class OracleAgent(BaseAgent):
         context: Dict[str, Any]
     ) -> AggregatedResult:
         """
-        Run all specialist agents in parallel and aggregate results.
+        Run the specialists that apply to the target in parallel and
+        aggregate results.
         
         Args:
             target: Address or policy ID to analyze
@@ -248,50 +334,70 @@ class OracleAgent(BaseAgent):
         Returns:
             AggregatedResult with Bayesian-fused risk assessment
         """
-        self.logger.info(f"Running {len(self.specialists)} specialists in parallel")
-        
-        # Create tasks for all specialists
-        tasks = {}
-        for name, specialist in self.specialists.items():
-            tasks[name] = specialist.scan(target, context)
-        
-        # Run all specialists concurrently with timeout protection
+        specialists = self._route_specialists(target)
+        self.logger.info(f"Running {len(specialists)} specialists in parallel")
+        
+        # Fetch the chain data every specialist needs once, into a shared snapshot
+        requires = set()
+        for specialist in specialists.values():
+            requires.update(getattr(specialist, "REQUIRES", ()))
+        snapshot = get_scan_planner().plan(target, requires)
+        context = {**context, "snapshot": snapshot}
+        
+        # Start every specialist with its own deadline
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        tasks: Dict[asyncio.Task, str] = {}
+        deadlines: Dict[str, float] = {}
+        for name, specialist in specialists.items():
+            tasks[asyncio.ensure_future(specialist.scan(target, context))] = name
+            deadlines[name] = started + self.SPECIALIST_TIMEOUTS.get(name, self.DEFAULT_SPECIALIST_TIMEOUT)
+        
+        # Collect results as they complete; cancel only the stragglers
         results = {}
+        timings: Dict[str, float] = {}
+        pending = set(tasks)
         try:
-            # FIXED: Added timeout to prevent hanging on slow specialists
-            gathered = await asyncio.wait_for(
-                asyncio.gather(*tasks.values(), return_exceptions=True),
-                timeout=10.0  # 10 second overall timeout
-            )
-            
-            for name, result in zip(tasks.keys(), gathered):
-                if isinstance(result, Exception):
-                    self.logger.warning(f"{name} failed with: {result}")
-                    results[name] = {
-                        "risk_score": 0.1,
-                        "severity": "low",
-                        "findings": [f"Specialist error: {str(result)}"],
-                        "metadata": {"error": True},
-                        "success": False,
-                    }
-                else:
-                    results[name] = {
-                        "risk_score": result.risk_score,
-                        "severity": result.severity.value,
-                        "findings": result.findings,
-                        "metadata": result.metadata,
-                        "success": result.success,
-                    }
-                    self.logger.debug(f"{name}: risk={result.risk_score:.2f}, severity={result.severity.value}")
-        
-        except asyncio.TimeoutError:
-            self.logger.error("Specialist execution timeout - some specialists may be unresponsive")
-            # Return partial results with timeout indication
-            for name in tasks.keys():
-                if name not in results:
+            while pending:
+                next_deadline = min(deadlines[tasks[t]] for t in pending)
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=max(0.0, next_deadline - loop.time()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                
+                for task in done:
+                    results[tasks[task]] = self._specialist_result(tasks[task], task)
+                    timings[tasks[task]] = round((loop.time() - started) * 1000, 1)
+                    
+                # Stop waiting once a decisive outcome has arrived
+                decided_by = self._decisive_specialist(results)
+                if decided_by and pending:
+                    self.logger.info(
+                        f"{decided_by} result is decisive - cancelling {len(pending)} outstanding specialists"
+                    )
+                    for task in pending:
+                        task.cancel()
+                        results[tasks[task]] = {
+                            "risk_score": 0.0,
+                            "severity": "info",
+                            "findings": [f"Skipped - verdict already decided by {decided_by}"],
+                            "metadata": {"skipped": True},
+                            "success": False,
+                        }
+                    pending = set()
+                    break
+                    
+                # Cancel specialists whose deadline has passed
+                now = loop.time()
+                for task in [t for t in pending if deadlines[tasks[t]] <= now]:
+                    task.cancel()
+                    pending.discard(task)
+                    name = tasks[task]
+                    self.logger.warning(f"{name} timed out - continuing with {len(results)} completed results")
                     results[name] = {
-                        "risk_score": 0.15,
-                        "severity": "low",
+                        "risk_score": 0.0,
+                        "severity": "info",
                         "findings": ["Specialist timed out"],
                         "metadata": {"timeout": True},
                         "success": False,
@@ -299,18 +405,76 @@ class OracleAgent(BaseAgent):
                     
         except Exception as e:
             self.logger.error(f"Specialist execution error: {e}")
+        finally:
+            for task in pending:
+                task.cancel()
+            # Stop fetches nobody is waiting for any more (early exit / timeouts)
+            snapshot.cancel()
         
         # Aggregate using Bayesian fusion
-        return self._bayesian_fusion(results)
+        aggregated = self._bayesian_fusion(results)
+        aggregated.timings = timings
+        return aggregated
+    
+    def _route_specialists(self, target: str) -> Dict[str, Any]:
+        """Select the specialists in the target type's profile."""
+        target_type = classify_target(target).type
+        profile = self.SPECIALIST_PROFILES.get(target_type)
+        if profile is None:
+            return dict(self.specialists)
+        selected = {name: self.specialists[name] for name in profile if name in self.specialists}
+        self.logger.info(f"Target is a {target_type.value} - routing to {', '.join(selected)}")
+        return selected
+    
+    def _decisive_specialist(self, results: Dict[str, Any]) -> Optional[str]:
+        """Get the first specialist whose result matches a decisive rule."""
+        for name, result in results.items():
+            if any(rule.matches(name, result) for rule in self.DECISIVE_RULES):
+                return name
+        return None
+    
+    def _specialist_result(self, name: str, task: asyncio.Task) -> Dict[str, Any]:
+        """Convert a finished specialist task into a result entry."""
+        if task.cancelled():
+            return {
+                "risk_score": 0.0,
+                "severity": "info",
+                "findings": ["Specialist cancelled"],
+                "metadata": {"timeout": True},
+                "success": False,
+            }
+            
+        error = task.exception()
+        if error is not None:
+            self.logger.warning(f"{name} failed with: {error}")
+            return {
+                "risk_score": 0.1,
+                "severity": "low",
+                "findings": [f"Specialist error: {str(error)}"],
+                "metadata": {"error": True},
+                "success": False,
+            }
+            
+        result = task.result()
+        self.logger.debug(f"{name}: risk={result.risk_score:.2f}, severity={result.severity.value}")
+        return {
+            "risk_score": result.risk_score,
+            "severity": result.severity.value,
+            "findings": result.findings,
+            "metadata": result.metadata,
+            "success": result.success,
+        }
     
     def _bayesian_fusion(self, specialist_results: Dict[str, Any]) -> AggregatedResult:
         """
         Aggregate specialist results using weighted Bayesian fusion.
         
         The fusion formula:
-        - Overall risk = weighted sum of individual risks
-        - Confidence adjusted by successful specialist count
-        - Severity = max severity from all specialists
+        - Overall risk = weighted sum of individual risks, over the
+          specialists whose results arrived (timed-out ones are left out)
+        - Confidence = weight share of specialists that succeeded, so a
+          missing heavy-weight specialist lowers it more than a light one
+        - Severity = max severity from all arrived specialists
         
         Args:
             specialist_results: Results from all specialists
@@ -322,10 +486,25 @@ class OracleAgent(BaseAgent):
         total_weight = 0.0
         max_severity = Severity.LOW
         all_findings = []
-        successful_count = 0
+        successful_weight = 0.0
+        expected_weight = 0.0
+        missing = []
+        skipped = 0
         
         for name, result in specialist_results.items():
+            # Specialists skipped after a decisive outcome don't count at all
+            if result.get("metadata", {}).get("skipped"):
+                skipped += 1
+                continue
+            
             weight = self.SPECIALIST_WEIGHTS.get(name, 0.1)
+            expected_weight += weight
+            
+            # Timed-out specialists contribute nothing but lower confidence
+            if result.get("metadata", {}).get("timeout"):
+                missing.append(name)
+                continue
+            
             risk = result.get("risk_score", 0.0)
             
             # Apply weight
@@ -334,7 +513,7 @@ class OracleAgent(BaseAgent):
             
             # Track success
             if result.get("success", True):
-                successful_count += 1
+                successful_weight += weight
             
             # Collect findings
             findings = result.get("findings", [])
@@ -359,8 +538,8 @@ class OracleAgent(BaseAgent):
         elif max_severity == Severity.HIGH:
             overall_risk = max(overall_risk, 0.75)
         
-        # Calculate confidence based on specialist success rate
-        confidence = successful_count / len(specialist_results) if specialist_results else 0.0
+        # Calculate confidence based on the weight of specialists that succeeded
+        confidence = successful_weight / expected_weight if expected_weight > 0 else 0.0
         
         # Determine vote based on overall risk
         if overall_risk >= 0.7:
@@ -377,9 +556,12 @@ class OracleAgent(BaseAgent):
             findings=all_findings,
             specialist_results=specialist_results,
             confidence=confidence,
+            missing=missing,
+            decided_by=self._decisive_specialist(specialist_results) if skipped else None,
         )
     
-    def _severity_rank(self, severity: Severity) -> int:
+    @staticmethod
+    def _severity_rank(severity: Severity) -> int:
         """Get numeric rank for severity comparison."""
         ranks = {
             Severity.LOW: 1,
@@ -464,6 +646,9 @@ class OracleAgent(BaseAgent):
             "risk_score": aggregated.overall_risk,
             "severity": aggregated.severity.value,
             "confidence": aggregated.confidence,
+            "missing_specialists": aggregated.missing,
+            "decided_by": aggregated.decided_by,
+            "timings": aggregated.timings,
             "findings": aggregated.findings,
             "specialist_results": aggregated.specialist_results,
             "evidence_hash": evidence_hash,
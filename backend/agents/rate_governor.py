@@ -0,0 +1,325 @@
+"""
+=============================================================================
+Sentinel Orchestrator Network (SON) - Upstream Rate Governor
+=============================================================================
+
+Keeps request rates to each chain-data provider within plan limits, so a
+burst of scans queues locally instead of drawing a wall of 429s.
+
+- One token bucket per provider (sustained rate + burst capacity)
+- Priority lanes: interactive wallet scans are always served before
+  background governance analysis waiting on the same provider
+- 429 / Retry-After feedback: the bucket is drained and paused for the
+  advertised period before any lane is served again
+- Queue depth and wait-time metrics per provider, for plan sizing
+
+The priority of a request is taken from the calling context, so callers
+only need to mark background work once:
+
+    from agents.rate_governor import Priority, upstream_priority
+
+    with upstream_priority(Priority.BACKGROUND):
+        await sentiment_analyzer.analyze(gov_action_id)
+
+A request shared by several callers (see ChainClient coalescing) waits
+with a QueueTicket, which moves it up a lane while it is queued when a
+higher-priority caller joins.
+
+Configuration (all optional, via environment):
+    BLOCKFROST_RATE_PER_SEC  Sustained Blockfrost requests/second (10)
+    BLOCKFROST_BURST         Blockfrost burst capacity (500)
+    KOIOS_RATE_PER_SEC       Sustained Koios requests/second (10)
+    KOIOS_BURST              Koios burst capacity (50)
+
+=============================================================================
+"""
+
+import os
+import time
+import asyncio
+import logging
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+import httpx
+
+logger = logging.getLogger("SON.rate_governor")
+
+
+# =============================================================================
+# PRIORITY
+# =============================================================================
+
+class Priority(IntEnum):
+    """Request priority lanes (lower value is served first)."""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+_current_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "upstream_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextmanager
+def upstream_priority(priority: Priority) -> Iterator[None]:
+    """Run the enclosed upstream requests in the given priority lane."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> Priority:
+    """Get the priority lane of the calling context."""
+    return _current_priority.get()
+
+
+class QueueTicket:
+    """
+    A shared request's place in a provider queue.
+
+    Holds the request's lane; raising it while the request is queued moves
+    the request to the back of the higher lane.
+    """
+
+    def __init__(self, priority: Priority):
+        self.priority = priority
+        self._provider: Optional["ProviderGovernor"] = None
+        self._future: Optional[asyncio.Future] = None
+
+    def raise_priority(self, priority: Priority) -> None:
+        """Serve the request in `priority`'s lane if that is higher than its own."""
+        if priority >= self.priority:
+            return
+        self.priority = priority
+        if self._future is not None and not self._future.done():
+            self._provider._move(self._future, priority)
+
+
+def parse_retry_after(value: Optional[str], default: float = 1.0) -> float:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+# =============================================================================
+# TOKEN BUCKET
+# =============================================================================
+
+class TokenBucket:
+    """Token bucket with a sustained refill rate and a burst capacity."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def time_until_token(self) -> float:
+        """Seconds until a token can be taken (0 if one is available now)."""
+        now = time.monotonic()
+        self._refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self) -> bool:
+        """Take a token if one is available."""
+        if self.time_until_token() > 0:
+            return False
+        self.tokens -= 1
+        return True
+
+    def pause(self, seconds: float) -> None:
+        """Drain the bucket and block it for `seconds` (upstream said 429)."""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = 0.0
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+
+# =============================================================================
+# PROVIDER GOVERNOR
+# =============================================================================
+
+class ProviderGovernor:
+    """
+    Rate governor for one upstream provider.
+
+    Requests that find a token and no queue go straight through. Otherwise
+    they wait in their priority lane; a single dispatcher task hands out
+    tokens as they refill, always draining higher-priority lanes first.
+    """
+
+    def __init__(self, name: str, host_marker: str, rate: float, burst: float):
+        self.name = name
+        self.host_marker = host_marker
+        self.bucket = TokenBucket(rate, burst)
+        self._lanes: Dict[Priority, Deque[asyncio.Future]] = {p: deque() for p in Priority}
+        self._dispatcher: Optional[asyncio.Task] = None
+        self.stats = {
+            "granted": 0,      # Requests let through
+            "queued": 0,       # Requests that had to wait
+            "throttled": 0,    # 429 responses fed back
+            "total_wait": 0.0, # Seconds spent waiting, summed
+            "max_wait": 0.0,   # Longest single wait in seconds
+        }
+
+    def matches(self, url: str) -> bool:
+        # Path prefix covers the offline upstream simulator (/blockfrost/..., /koios/...)
+        parsed = httpx.URL(url)
+        return self.host_marker in parsed.host or parsed.path.startswith(f"/{self.host_marker}/")
+
+    def _has_waiters(self) -> bool:
+        return any(self._lanes.values())
+
+    async def acquire(self, priority: Priority, ticket: Optional[QueueTicket] = None) -> None:
+        """Wait for permission to send one request (`ticket` lets its lane be raised)."""
+        if not self._has_waiters() and self.bucket.take():
+            self.stats["granted"] += 1
+            return
+
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        self._lanes[priority].append(future)
+        self.stats["queued"] += 1
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+        if ticket is not None:
+            ticket._provider, ticket._future = self, future
+        try:
+            await future
+        finally:
+            if ticket is not None:
+                ticket._provider = ticket._future = None
+
+        waited = time.monotonic() - started
+        self.stats["granted"] += 1
+        self.stats["total_wait"] += waited
+        self.stats["max_wait"] = max(self.stats["max_wait"], waited)
+
+    async def _dispatch(self) -> None:
+        """Hand tokens to queued requests, highest priority first."""
+        while self._has_waiters():
+            delay = self.bucket.time_until_token()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            future = self._next_waiter()
+            if future is not None:
+                self.bucket.take()
+                future.set_result(None)
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        """Pop the first still-waiting request from the highest lane."""
+        for priority in Priority:
+            lane = self._lanes[priority]
+            while lane:
+                future = lane.popleft()
+                if not future.done():  # Skip callers that gave up
+                    return future
+        return None
+
+    def _move(self, future: asyncio.Future, priority: Priority) -> None:
+        """Move a queued request to the back of another lane."""
+        for lane in self._lanes.values():
+            if future in lane:
+                lane.remove(future)
+                break
+        self._lanes[priority].append(future)
+
+    def throttled(self, retry_after: float) -> None:
+        """Feed a 429 back into the bucket."""
+        self.stats["throttled"] += 1
+        self.bucket.pause(retry_after)
+        logger.warning(f"{self.name} rate limited upstream - pausing {retry_after:.1f}s")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth per lane and wait-time counters."""
+        queued = self.stats["queued"]
+        return {
+            "rate_per_sec": self.bucket.rate,
+            "burst": self.bucket.capacity,
+            "tokens": round(self.bucket.tokens, 2),
+            "queue_depth": {p.name.lower(): len(self._lanes[p]) for p in Priority},
+            **self.stats,
+            "avg_wait": self.stats["total_wait"] / queued if queued else 0.0,
+        }
+
+
+# =============================================================================
+# RATE GOVERNOR
+# =============================================================================
+
+def default_providers() -> List[ProviderGovernor]:
+    """Build governors for the providers with published rate limits."""
+    return [
+        ProviderGovernor(
+            "blockfrost", "blockfrost",
+            rate=float(os.getenv("BLOCKFROST_RATE_PER_SEC", "10")),
+            burst=float(os.getenv("BLOCKFROST_BURST", "500")),
+        ),
+        ProviderGovernor(
+            "koios", "koios",
+            rate=float(os.getenv("KOIOS_RATE_PER_SEC", "10")),
+            burst=float(os.getenv("KOIOS_BURST", "50")),
+        ),
+    ]
+
+
+class RateGovernor:
+    """Routes each request to its provider's governor (ungoverned hosts pass)."""
+
+    def __init__(self, providers: Optional[List[ProviderGovernor]] = None):
+        self.providers = providers if providers is not None else default_providers()
+
+    def provider_for(self, url: str) -> Optional[ProviderGovernor]:
+        for provider in self.providers:
+            if provider.matches(url):
+                return provider
+        return None
+
+    async def acquire(self, url: str, ticket: Optional[QueueTicket] = None) -> None:
+        """
+        Wait until a request to `url` may be sent.
+
+        The request waits in the ticket's lane if one is given, else in the
+        calling context's lane.
+        """
+        provider = self.provider_for(url)
+        if provider is not None:
+            if ticket is None:
+                await provider.acquire(current_priority())
+            else:
+                await provider.acquire(ticket.priority, ticket)
+
+    def throttled(self, url: str, retry_after: float) -> None:
+        """Record a 429 from `url` and pause its provider."""
+        provider = self.provider_for(url)
+        if provider is not None:
+            provider.throttled(retry_after)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {p.name: p.get_stats() for p in self.providers}
@@ -0,0 +1,478 @@
+"""
+=============================================================================
+Sentinel Orchestrator Network (SON) - Scan Planner
+=============================================================================
+
+Builds one fetch plan per scan instead of letting every specialist decide
+on its own what to download. Specialists declare the chain data they need
+(`REQUIRES`); the planner takes the union for a target, fetches each
+upstream resource exactly once - concurrently, in dependency order - into
+a typed `ChainSnapshot`, and specialists analyze that snapshot.
+
+    address info  ─┬─> account ─> delegated pool (+ metadata)
+                   └─> DRep registration
+    address txs   ───> tx details / UTxOs / redeemers (10 most recent)
+    top pools     ───> top-5 pool details
+    proposals, epoch parameters, address UTxOs, Koios verification
+
+Every requirement is started as its own task when the plan is made, so a
+specialist only waits for the resources it declared. Fetch failures are
+stored on the resource and re-raised when a specialist reads it, so
+specialists keep their own timeout/error handling. Transaction details
+land one by one, so a specialist can fold them in as they arrive
+(`ChainSnapshot.tx_details_as_completed`) instead of waiting for the last.
+
+Because analysis reads only the snapshot, a specialist can be benchmarked
+without a network by constructing a `ChainSnapshot` directly:
+
+    snapshot = ChainSnapshot(target=addr, address=Resource(200, {...}), ...)
+    result = StakeAnalyzer().analyze(snapshot)
+
+=============================================================================
+"""
+
+import os
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .chain_client import get_chain_client
+from .koios_batcher import get_koios_batcher
+from .network_router import (
+    KOIOS_NETWORK_URLS,
+    candidate_networks,
+    detect_network,
+    get_network_cache,
+    network_for_url,
+)
+from .target_router import Target, TargetType, classify_target
+
+logger = logging.getLogger("SON.scan_planner")
+
+
+# =============================================================================
+# REQUIREMENTS
+# =============================================================================
+
+# Resource groups a specialist can declare in its REQUIRES set
+ADDRESS = "address"                 # /addresses/{addr} (also yields the stake address)
+ADDRESS_UTXOS = "address_utxos"     # /addresses/{addr}/utxos
+ADDRESS_TXS = "address_txs"         # /addresses/{addr}/transactions (20 most recent)
+ACCOUNT = "account"                 # /accounts/{stake}
+DREP = "drep"                       # /governance/dreps/{stake}
+POOL = "pool"                       # Delegated pool details + metadata
+TOP_POOLS = "top_pools"             # /pools (top 10) + details of the top 5
+PROPOSALS = "proposals"             # /governance/proposals (20 most recent)
+EPOCH_PARAMETERS = "epoch_parameters"  # /epochs/latest/parameters
+TX_DETAILS = "tx_details"           # /txs/{h} for the target tx or recent address txs
+TX_BUNDLES = "tx_bundles"           # /txs/{h}/utxos + /redeemers for the same txs
+VERIFICATION = "verification"       # Blockfrost/Koios on-chain existence check
+
+# Requirements whose fetch needs another requirement's result first
+DEPENDENCIES: Dict[str, List[str]] = {
+    ACCOUNT: [ADDRESS],
+    DREP: [ADDRESS],
+    POOL: [ACCOUNT],
+    TX_DETAILS: [ADDRESS_TXS],
+    TX_BUNDLES: [ADDRESS_TXS],
+    VERIFICATION: [ADDRESS],
+}
+
+# How many recent address transactions are fetched and analyzed in detail
+RECENT_TX_COUNT = 20
+DETAILED_TX_COUNT = 10
+TOP_POOL_COUNT = 10
+TOP_POOL_DETAIL_COUNT = 5
+
+# Koios lookups that are single GETs rather than batched POSTs (endpoint -> query parameter)
+KOIOS_QUERY_PARAMS: Dict[str, str] = {
+    "policy_asset_list": "_asset_policy",
+}
+
+
+# =============================================================================
+# SNAPSHOT
+# =============================================================================
+
+@dataclass
+class Resource:
+    """
+    One fetched upstream resource.
+
+    Mirrors the parts of an httpx response that analysis uses
+    (`status_code`, `json()`); a failed fetch re-raises its error on access.
+    """
+    status: int = 0
+    data: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def status_code(self) -> int:
+        if self.error is not None:
+            raise self.error
+        return self.status
+
+    def json(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.data
+
+
+@dataclass
+class ChainSnapshot:
+    """All upstream data fetched for one scan target."""
+    target: str
+    target_info: Optional[Target] = None  # Parsed target (see target_router)
+    stake_address: Optional[str] = None
+    address: Optional[Resource] = None
+    address_utxos: Optional[Resource] = None
+    address_txs: Optional[Resource] = None
+    account: Optional[Resource] = None
+    drep: Optional[Resource] = None
+    pool: Optional[Resource] = None
+    pool_metadata: Optional[Resource] = None
+    top_pools: Optional[Resource] = None
+    top_pool_details: Dict[str, Resource] = field(default_factory=dict)
+    proposals: Optional[Resource] = None
+    epoch_parameters: Optional[Resource] = None
+    tx_hashes: List[str] = field(default_factory=list)  # Txs covered by tx_* maps, newest first
+    txs: Dict[str, Resource] = field(default_factory=dict)
+    tx_utxos: Dict[str, Resource] = field(default_factory=dict)
+    tx_redeemers: Dict[str, Resource] = field(default_factory=dict)
+    verification: Optional[Resource] = None  # data: {"source": ..., "searched": [...]}
+    _tasks: Dict[str, asyncio.Task] = field(default_factory=dict, repr=False)
+    _semaphore: Optional[asyncio.Semaphore] = field(default=None, repr=False)
+    _tx_arrivals: Dict[str, asyncio.Future] = field(default_factory=dict, repr=False)
+
+    async def wait(self, requires: Iterable[str]) -> None:
+        """Wait until the given requirements have been fetched."""
+        tasks = [self._tasks[r] for r in requires if r in self._tasks]
+        if tasks:
+            await asyncio.gather(*(asyncio.shield(t) for t in tasks))
+
+    def _tx_arrival(self, tx_hash: str) -> asyncio.Future:
+        """Future resolved with a transaction's detail once it is fetched."""
+        future = self._tx_arrivals.get(tx_hash)
+        if future is None:
+            future = self._tx_arrivals[tx_hash] = asyncio.get_running_loop().create_future()
+        return future
+
+    async def tx_details_as_completed(self, tx_hashes: List[str]) -> AsyncIterator[Tuple[int, Resource]]:
+        """
+        Yield `(index into tx_hashes, detail)` as each transaction detail is fetched.
+
+        Details also land in `txs` as usual. Without a TX_DETAILS fetch in
+        flight (e.g. a hand-built snapshot) they are read from `txs` in order;
+        a hash the plan never fetched raises KeyError, like `txs[h]`.
+        """
+        task = self._tasks.get(TX_DETAILS)
+        if task is None:
+            for index, tx_hash in enumerate(tx_hashes):
+                yield index, self.txs[tx_hash]
+            return
+
+        pending = [(index, self._tx_arrival(tx_hash)) for index, tx_hash in enumerate(tx_hashes)]
+        fetching = asyncio.shield(task)
+        while pending:
+            await asyncio.wait({f for _, f in pending} | {fetching}, return_when=asyncio.FIRST_COMPLETED)
+            for index, future in pending:
+                if future.done():
+                    yield index, future.result()
+            pending = [(index, future) for index, future in pending if not future.done()]
+            if pending and fetching.done():
+                fetching.result()  # Re-raise a cancelled fetch
+                raise KeyError(tx_hashes[pending[0][0]])
+
+    def cancel(self) -> None:
+        """Stop fetches nobody is waiting for any more (e.g. on early exit)."""
+        for task in self._tasks.values():
+            task.cancel()
+
+
+# =============================================================================
+# PLANNER
+# =============================================================================
+
+def is_tx_target(target: str) -> bool:
+    """Check whether a target is a transaction hash (`tx_` prefix or 64 hex)."""
+    return target.startswith("tx_") or len(target) == 64
+
+
+class ScanPlanner:
+    """Fetches the union of specialist requirements for a target, once each."""
+
+    # Upper bound on concurrent per-transaction requests per scan
+    # (3 sub-resources x 10 transactions = one round trip)
+    MAX_CONCURRENT_TX_FETCHES = 30
+
+    def __init__(self):
+        self.blockfrost_url = os.getenv("BLOCKFROST_API_URL", "https://cardano-preprod.blockfrost.io/api")
+        self.blockfrost_key = os.getenv("BLOCKFROST_API_KEY", "")
+        self.network_cache = get_network_cache()
+
+    def plan(self, target: str, requires: Iterable[str]) -> ChainSnapshot:
+        """
+        Start fetching everything the given requirements need.
+
+        Returns immediately; use `snapshot.wait(requires)` before analysis.
+        """
+        snapshot = ChainSnapshot(target=target, target_info=classify_target(target))
+        fetchers: Dict[str, Callable[[ChainSnapshot], Awaitable[None]]] = {
+            ADDRESS: self._fetch_address,
+            ADDRESS_UTXOS: self._fetch_address_utxos,
+            ADDRESS_TXS: self._fetch_address_txs,
+            ACCOUNT: self._fetch_account,
+            DREP: self._fetch_drep,
+            POOL: self._fetch_pool,
+            TOP_POOLS: self._fetch_top_pools,
+            PROPOSALS: self._fetch_proposals,
+            EPOCH_PARAMETERS: self._fetch_epoch_parameters,
+            TX_DETAILS: self._fetch_tx_details,
+            TX_BUNDLES: self._fetch_tx_bundles,
+            VERIFICATION: self._fetch_verification,
+        }
+
+        # Expand dependencies so e.g. POOL also schedules ACCOUNT and ADDRESS
+        wanted: List[str] = []
+        pending = list(requires)
+        while pending:
+            requirement = pending.pop()
+            if requirement in wanted:
+                continue
+            if requirement not in fetchers:
+                raise ValueError(f"Unknown scan requirement: {requirement}")
+            wanted.append(requirement)
+            pending.extend(DEPENDENCIES.get(requirement, []))
+
+        # All tasks exist before any runs, so each can wait on its dependencies
+        snapshot._semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_TX_FETCHES)
+        for requirement in wanted:
+            snapshot._tasks[requirement] = asyncio.ensure_future(
+                self._run(requirement, fetchers[requirement], snapshot)
+            )
+        return snapshot
+
+    async def fetch(self, target: str, requires: Iterable[str]) -> ChainSnapshot:
+        """Plan and wait for a complete snapshot."""
+        requires = list(requires)
+        snapshot = self.plan(target, requires)
+        await snapshot.wait(requires)
+        return snapshot
+
+    async def _run(self, requirement: str, fetcher, snapshot: ChainSnapshot) -> None:
+        """Run one fetcher after its dependencies; errors are kept on resources."""
+        await snapshot.wait(DEPENDENCIES.get(requirement, []))
+        await fetcher(snapshot)
+
+    # -------------------------------------------------------------------------
+    # UPSTREAM HELPERS
+    # -------------------------------------------------------------------------
+
+    async def _get(self, path: str, semaphore: Optional[asyncio.Semaphore] = None) -> Resource:
+        """GET a Blockfrost path into a Resource, capturing any error."""
+        try:
+            client = get_chain_client()
+            headers = {"project_id": self.blockfrost_key}
+            if semaphore is not None:
+                async with semaphore:
+                    resp = await client.get(f"{self.blockfrost_url}{path}", headers=headers)
+            else:
+                resp = await client.get(f"{self.blockfrost_url}{path}", headers=headers)
+            data = resp.json() if resp.status_code == 200 else None
+            return Resource(status=resp.status_code, data=data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return Resource(error=e)
+
+    def _blockfrost_verifies(self, info: Target) -> bool:
+        """Check whether the Blockfrost address lookup doubles as verification."""
+        # Hashes, policy IDs and stake addresses are never valid /addresses/ lookups
+        if not self.blockfrost_key or not info.raw \
+                or info.type not in (TargetType.PAYMENT_ADDRESS, TargetType.UNKNOWN):
+            return False
+        network = detect_network(info.raw)
+        blockfrost_network = network_for_url(self.blockfrost_url)
+        return network is None or blockfrost_network is None or network == blockfrost_network
+
+    # -------------------------------------------------------------------------
+    # FETCHERS
+    # -------------------------------------------------------------------------
+
+    async def _fetch_address(self, snapshot: ChainSnapshot) -> None:
+        target = snapshot.target
+        if target.startswith("stake"):
+            snapshot.stake_address = target
+            return
+        if not (target.startswith("addr") or self._blockfrost_verifies(snapshot.target_info)):
+            return
+        snapshot.address = await self._get(f"/v0/addresses/{target}")
+        if snapshot.address.error is None and snapshot.address.status == 200:
+            snapshot.stake_address = snapshot.address.data.get("stake_address")
+
+    async def _fetch_address_utxos(self, snapshot: ChainSnapshot) -> None:
+        if snapshot.target.startswith("addr"):
+            snapshot.address_utxos = await self._get(f"/v0/addresses/{snapshot.target}/utxos")
+
+    async def _fetch_address_txs(self, snapshot: ChainSnapshot) -> None:
+        target = snapshot.target
+        if is_tx_target(target):
+            snapshot.tx_hashes = [target.replace("tx_", "")]
+        elif target.startswith("addr"):
+            snapshot.address_txs = await self._get(
+                f"/v0/addresses/{target}/transactions?count={RECENT_TX_COUNT}&order=desc"
+            )
+            if snapshot.address_txs.error is None and snapshot.address_txs.status == 200:
+                snapshot.tx_hashes = [
+                    tx.get("tx_hash") for tx in snapshot.address_txs.data[:DETAILED_TX_COUNT]
+                ]
+
+    async def _fetch_account(self, snapshot: ChainSnapshot) -> None:
+        if snapshot.stake_address:
+            snapshot.account = await self._get(f"/v0/accounts/{snapshot.stake_address}")
+
+    async def _fetch_drep(self, snapshot: ChainSnapshot) -> None:
+        if snapshot.stake_address:
+            snapshot.drep = await self._get(f"/v0/governance/dreps/{snapshot.stake_address}")
+
+    async def _fetch_pool(self, snapshot: ChainSnapshot) -> None:
+        account = snapshot.account
+        if account is None or account.error is not None or account.status != 200:
+            return
+        pool_id = account.data.get("pool_id")
+        if not pool_id:
+            return
+        snapshot.pool, snapshot.pool_metadata = await asyncio.gather(
+            self._get(f"/v0/pools/{pool_id}"),
+            self._get(f"/v0/pools/{pool_id}/metadata"),
+        )
+
+    async def _fetch_top_pools(self, snapshot: ChainSnapshot) -> None:
+        snapshot.top_pools = await self._get(f"/v0/pools?count={TOP_POOL_COUNT}&order=desc")
+        if snapshot.top_pools.error is None and snapshot.top_pools.status == 200:
+            pool_ids = snapshot.top_pools.data[:TOP_POOL_DETAIL_COUNT]
+            details = await asyncio.gather(*(self._get(f"/v0/pools/{p}") for p in pool_ids))
+            snapshot.top_pool_details = dict(zip(pool_ids, details))
+
+    async def _fetch_proposals(self, snapshot: ChainSnapshot) -> None:
+        snapshot.proposals = await self._get("/v0/governance/proposals?count=20&order=desc")
+
+    async def _fetch_epoch_parameters(self, snapshot: ChainSnapshot) -> None:
+        snapshot.epoch_parameters = await self._get("/v0/epochs/latest/parameters")
+
+    async def _fetch_tx_details(self, snapshot: ChainSnapshot) -> None:
+        async def _fetch_detail(tx_hash: str) -> None:
+            detail = await self._get(f"/v0/txs/{tx_hash}", snapshot._semaphore)
+            snapshot.txs[tx_hash] = detail
+            arrival = snapshot._tx_arrival(tx_hash)
+            if not arrival.done():
+                arrival.set_result(detail)
+
+        # Each detail is published as soon as it lands (see tx_details_as_completed)
+        await asyncio.gather(*(_fetch_detail(h) for h in snapshot.tx_hashes))
+
+    async def _fetch_tx_bundles(self, snapshot: ChainSnapshot) -> None:
+        hashes = snapshot.tx_hashes
+        results = await asyncio.gather(*(
+            self._get(f"/v0/txs/{h}{path}", snapshot._semaphore)
+            for h in hashes for path in ("/utxos", "/redeemers")
+        ))
+        snapshot.tx_utxos.update(zip(hashes, results[0::2]))
+        snapshot.tx_redeemers.update(zip(hashes, results[1::2]))
+
+    async def _fetch_verification(self, snapshot: ChainSnapshot) -> None:
+        """Verify the target exists on chain: Blockfrost first, else Koios."""
+        target = snapshot.target
+        address = snapshot.address
+        if self._blockfrost_verifies(snapshot.target_info) and address is not None and address.error is None \
+                and address.status == 200:
+            blockfrost_network = network_for_url(self.blockfrost_url)
+            if blockfrost_network:
+                self.network_cache.remember(target, blockfrost_network)
+            snapshot.verification = Resource(200, {"source": "blockfrost", "searched": []})
+            return
+
+        # Koios fallback - by target type
+        info = snapshot.target_info
+        endpoint, identifier = "address_info", target
+        if info.type in (TargetType.TX_HASH, TargetType.GOV_ACTION_ID):
+            endpoint, identifier = "tx_info", info.tx_hash
+        elif info.type is TargetType.STAKE_ADDRESS:
+            endpoint = "account_info"
+        elif info.type is TargetType.POLICY_ID:
+            # Koios echoes hashes in lowercase
+            endpoint, identifier = "policy_asset_list", target.lower()
+        networks = candidate_networks(identifier, self.network_cache)
+        try:
+            network = await self._koios_lookup(endpoint, identifier, networks)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            snapshot.verification = Resource(error=e)
+            return
+        source = f"koios_{network}" if network else None
+        snapshot.verification = Resource(200, {"source": source, "searched": networks})
+
+    async def _koios_lookup(self, endpoint: str, identifier: str, networks: List[str]) -> Optional[str]:
+        """
+        Look an identifier up on Koios across candidate networks.
+
+        With several candidates the queries run in parallel and the first
+        positive answer wins; the remaining queries are cancelled. Lookups
+        go through the Koios batcher, so concurrent scans share array POSTs.
+
+        Returns:
+            The network the identifier was found on, or None
+        """
+        batcher = get_koios_batcher()
+
+        async def _query(network: str) -> Optional[str]:
+            base_url = KOIOS_NETWORK_URLS[network]
+            if endpoint in KOIOS_QUERY_PARAMS:
+                resp = await get_chain_client().get(
+                    f"{base_url}/{endpoint}", params={KOIOS_QUERY_PARAMS[endpoint]: identifier}
+                )
+                resp.raise_for_status()
+                row = (resp.json() or [None])[0]
+            else:
+                row = await batcher.fetch(base_url, endpoint, identifier)
+            return network if row is not None else None
+
+        tasks = [asyncio.ensure_future(_query(network)) for network in networks]
+        error: Optional[Exception] = None
+        answered = False
+        try:
+            for next_answer in asyncio.as_completed(tasks):
+                try:
+                    network = await next_answer
+                except Exception as e:
+                    error = error or e
+                    continue
+                if network:
+                    self.network_cache.remember(identifier, network)
+                    return network
+                answered = True
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        # Not found anywhere - only a failure if no network gave a clean answer
+        if error is not None and not answered:
+            raise error
+        return None
+
+
+# =============================================================================
+# PROCESS-WIDE INSTANCE
+# =============================================================================
+
+_scan_planner: Optional[ScanPlanner] = None
+
+
+def get_scan_planner() -> ScanPlanner:
+    """Get the process-wide scan planner."""
+    global _scan_planner
+    if _scan_planner is None:
+        _scan_planner = ScanPlanner()
+    return _scan_planner
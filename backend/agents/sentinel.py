@@ -21,6 +21,7 @@ import base64
 import json
 import hashlib
 import asyncio
+import time
 from typing import Any, Dict, Optional, TYPE_CHECKING
 from enum import Enum
 
@@ -129,11 +130,16 @@ class SentinelAgent(BaseAgent):
         
         self.log_start(policy_id or tx_cbor[:16] if tx_cbor else "unknown")
         
+        # Milliseconds spent per pipeline stage, reported with the result
+        timings: Dict[str, float] = {}
+        
         # Step 0: Ultra-Fast Hydra Check (Off-chain)
         if self.hydra_enabled and self.hydra_node:
             self.logger.info("Attempting Ultra-Fast Hydra Check...")
+            stage_started = time.perf_counter()
             try:
                 hydra_result = await self.hydra_node.validate_transaction_offchain(tx_cbor, policy_id)
+                timings["hydra"] = self._elapsed_ms(stage_started)
                 
                 if hydra_result.get("verified"):
                     self.logger.info(f"Hydra Verdict: {hydra_result['verdict']} ({hydra_result['latency_ms']}ms)")
@@ -148,14 +154,18 @@ class SentinelAgent(BaseAgent):
                         risk_score=hydra_result['risk_score'],
                         compliance_result={"status": "hydra_verified", "checks": []},
                         oracle_result=None,
-                        reason=hydra_result['reason']
+                        reason=hydra_result['reason'],
+                        timings=timings
                     )
             except Exception as e:
+                timings["hydra"] = self._elapsed_ms(stage_started)
                 self.logger.error(f"Hydra check failed: {e}")
                 # Fallback to standard flow
         
         # Step 1: Protocol compliance check
+        stage_started = time.perf_counter()
         compliance_result = self._check_protocol_compliance(policy_id, tx_cbor)
+        timings["compliance"] = self._elapsed_ms(stage_started)
         
         # If compliance fails → immediate DANGER verdict
         if compliance_result["status"] == ComplianceStatus.INVALID:
@@ -166,14 +176,17 @@ class SentinelAgent(BaseAgent):
                 risk_score=100,
                 compliance_result=compliance_result,
                 oracle_result=None,
-                reason=f"Protocol violation: {compliance_result['reason']}"
+                reason=f"Protocol violation: {compliance_result['reason']}",
+                timings=timings
             )
         
         # Step 2: If network check needed, send HIRE_REQUEST to Oracle
         oracle_result = None
         if compliance_result["status"] == ComplianceStatus.REQUIRES_NETWORK_CHECK:
             self.logger.info("Compliance passed - sending HIRE_REQUEST to Oracle")
+            stage_started = time.perf_counter()
             oracle_result = await self._hire_oracle(policy_id, user_tip)
+            timings["oracle"] = self._elapsed_ms(stage_started)
             
             if oracle_result is None:
                 self.logger.error("Oracle HIRE_REQUEST failed")
@@ -183,7 +196,8 @@ class SentinelAgent(BaseAgent):
                     risk_score=50,
                     compliance_result=compliance_result,
                     oracle_result=None,
-                    reason="Oracle unavailable - network check incomplete"
+                    reason="Oracle unavailable - network check incomplete",
+                    timings=timings
                 )
         
         # Step 3: Determine final verdict
@@ -199,7 +213,8 @@ class SentinelAgent(BaseAgent):
             risk_score=risk_score,
             compliance_result=compliance_result,
             oracle_result=oracle_result,
-            reason=reason
+            reason=reason,
+            timings=timings
         )
     
     # -------------------------------------------------------------------------
@@ -456,7 +471,8 @@ class SentinelAgent(BaseAgent):
         risk_score: int,
         compliance_result: Dict[str, Any],
         oracle_result: Optional[Dict[str, Any]],
-        reason: str
+        reason: str,
+        timings: Optional[Dict[str, float]] = None
     ) -> Dict[str, Any]:
         """Build the final result dictionary."""
         evidence_data = f"{policy_id}|{verdict.value}|{risk_score}|{self.get_timestamp()}"
@@ -472,5 +488,11 @@ class SentinelAgent(BaseAgent):
             "oracle_result": oracle_result,
             "evidence_hash": evidence_hash,
             "timestamp": self.get_timestamp(),
-            "llm_enabled": self.has_llm
+            "llm_enabled": self.has_llm,
+            "timings": timings or {}
         }
+    
+    @staticmethod
+    def _elapsed_ms(started: float) -> float:
+        """Milliseconds since a time.perf_counter() reading."""
+        return round((time.perf_counter() - started) * 1000, 1)
@@ -19,6 +19,9 @@ from enum import Enum
 import nacl.signing
 from nacl.signing import SigningKey
 
+from ..scan_planner import ChainSnapshot, VERIFICATION, get_scan_planner
+from ..target_router import TargetType
+
 
 class Severity(Enum):
     CRITICAL = "critical"
@@ -55,6 +58,17 @@ class BlockScanner:
     - Communicates via IACP/2.0 protocol with signed envelopes
     """
     
+    # Chain data this specialist analyzes (see scan_planner)
+    REQUIRES = frozenset({VERIFICATION})
+    
+    # How unverified targets are described in findings
+    TARGET_KINDS = {
+        TargetType.TX_HASH: "Transaction",
+        TargetType.GOV_ACTION_ID: "Governance action",
+        TargetType.POLICY_ID: "Policy",
+        TargetType.STAKE_ADDRESS: "Stake address",
+    }
+    
     def __init__(self):
         self.name = "BlockScanner"
         self.did = "did:masumi:block_scanner_01"
@@ -114,7 +128,22 @@ class BlockScanner:
         
         Args:
             address: Cardano address or transaction hash to analyze
-            context: Additional context from the scan request
+            context: Additional context from the scan request; a shared
+                `snapshot` (ChainSnapshot) is used instead of fetching
+            
+        Returns:
+            ScanResult with risk assessment and findings
+        """
+        snapshot = context.get("snapshot") or get_scan_planner().plan(address, self.REQUIRES)
+        await snapshot.wait(self.REQUIRES)
+        return self.analyze(snapshot)
+        
+    def analyze(self, snapshot: ChainSnapshot) -> ScanResult:
+        """
+        Verify the target exists on chain from a prefetched snapshot.
+        
+        Args:
+            snapshot: Chain data covering this specialist's REQUIRES
             
         Returns:
             ScanResult with risk assessment and findings
@@ -126,97 +155,28 @@ class BlockScanner:
         metadata = {"agent": self.name}
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # 1. Try Blockfrost first (if key exists)
-                if self.blockfrost_key:
-                    headers = {"project_id": self.blockfrost_key}
-                    # ... (existing Blockfrost logic for blocks) ...
-                    # For brevity, we focus on the asset/address check which is what matters for the user
-                    
-                    if address and not address.startswith("tx_"):
-                        addr_resp = await client.get(
-                            f"{self.blockfrost_url}/v0/addresses/{address}",
-                            headers=headers
-                        )
-                        if addr_resp.status_code == 200:
-                            metadata["source"] = "blockfrost"
-                            metadata["status"] = "verified"
-                            return ScanResult(0.0, Severity.INFO, ["Verified on-chain via Blockfrost"], metadata)
-                        elif addr_resp.status_code == 404:
-                            # Fallback to Koios before declaring 404
-                            pass 
-                        else:
-                            # Fallback to Koios on API error
-                            pass
-
-                # 2. Fallback to Koios (No Key Required)
-                # Check if it's a transaction hash (64 chars) or address
-                is_tx = len(address) == 64
+            # Blockfrost first (if key exists), else Koios (No Key Required)
+            verification = snapshot.verification
+            source = verification.json()["source"] if verification is not None else None
+            
+            if source:
+                metadata["source"] = source
+                metadata["status"] = "verified"
+                if source == "blockfrost":
+                    return ScanResult(0.0, Severity.INFO, ["Verified on-chain via Blockfrost"], metadata)
+                return ScanResult(0.0, Severity.INFO, [f"Verified on-chain via Koios ({source})"], metadata)
                 
-                if is_tx:
-                    # Try Preprod first
-                    koios_url = "https://preprod.koios.rest/api/v1/tx_info"
-                    payload = {"_tx_hashes": [address]}
-                    resp = await client.post(koios_url, json=payload)
-                    
-                    found = False
-                    if resp.status_code == 200:
-                        data = resp.json()
-                        if data and len(data) > 0:
-                            found = True
-                            metadata["source"] = "koios_preprod"
-                            
-                    # If not found on Preprod, try Mainnet
-                    if not found:
-                        koios_url = "https://api.koios.rest/api/v1/tx_info"
-                        resp = await client.post(koios_url, json=payload)
-                        if resp.status_code == 200:
-                            data = resp.json()
-                            if data and len(data) > 0:
-                                found = True
-                                metadata["source"] = "koios_mainnet"
-
-                    if found:
-                        metadata["status"] = "verified"
-                        return ScanResult(0.0, Severity.INFO, [f"Verified on-chain via Koios ({metadata['source']})"], metadata)
-                    else:
-                        findings.append("Transaction not found on chain (Preprod/Mainnet) - High Risk")
-                        risk_score += 0.9
-                        
-                else:
-                    # Assume address/asset - Try Preprod
-                    koios_url = "https://preprod.koios.rest/api/v1/address_info"
-                    payload = {"_addresses": [address]}
-                    resp = await client.post(koios_url, json=payload)
-                    
-                    found = False
-                    if resp.status_code == 200:
-                        data = resp.json()
-                        if data and len(data) > 0:
-                            found = True
-                            metadata["source"] = "koios_preprod"
-                            
-                    # If not found, try Mainnet
-                    if not found:
-                        koios_url = "https://api.koios.rest/api/v1/address_info"
-                        resp = await client.post(koios_url, json=payload)
-                        if resp.status_code == 200:
-                            data = resp.json()
-                            if data and len(data) > 0:
-                                found = True
-                                metadata["source"] = "koios_mainnet"
-                                
-                    if found:
-                        metadata["status"] = "verified"
-                        return ScanResult(0.0, Severity.INFO, [f"Verified on-chain via Koios ({metadata['source']})"], metadata)
-                    else:
-                        findings.append("Address not found on chain (Preprod/Mainnet) - High Risk")
-                        risk_score += 0.9
+            # Name what was looked up (transaction, policy, ...) in the finding
+            kind = self.TARGET_KINDS.get(snapshot.target_info.type, "Address")
+            searched = verification.json()["searched"] if verification is not None else []
+            searched = "/".join(n.capitalize() for n in searched)
+            findings.append(f"{kind} not found on chain ({searched}) - High Risk")
+            risk_score += 0.9
 
-                if risk_score > 0.8:
-                     findings.append("Asset/Transaction verification failed on all sources")
+            if risk_score > 0.8:
+                 findings.append("Asset/Transaction verification failed on all sources")
 
-                        
+                    
         except httpx.TimeoutException:
             return ScanResult(
                 risk_score=0.8,
@@ -9,16 +9,27 @@ DID: did:masumi:mempool_sniffer_01
 
 import httpx
 import os
+import asyncio
 import json
 import base64
 import logging
-from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List
 from enum import Enum
 
 import nacl.signing
 from nacl.signing import SigningKey
 
+from ..scan_planner import (
+    ADDRESS_TXS,
+    ADDRESS_UTXOS,
+    TX_DETAILS,
+    ChainSnapshot,
+    Resource,
+    get_scan_planner,
+    is_tx_target,
+)
+
 
 class Severity(Enum):
     CRITICAL = "critical"
@@ -39,6 +50,14 @@ class ScanResult:
     error: Optional[str] = None
 
 
+@dataclass
+class TxActivity:
+    """Fee and timing statistics of recent transactions, folded in one detail at a time."""
+    tx_times: List[int] = field(default_factory=list)
+    high_fee_count: int = 0
+    suspicious_fees: Dict[int, int] = field(default_factory=dict)  # tx index -> fee
+
+
 class MempoolSniffer:
     """
     Mempool transaction analysis specialist.
@@ -61,6 +80,9 @@ class MempoolSniffer:
     HIGH_FEE_THRESHOLD = 2_000_000  # 2 ADA
     SUSPICIOUS_FEE_THRESHOLD = 10_000_000  # 10 ADA
     
+    # Chain data this specialist analyzes (see scan_planner)
+    REQUIRES = frozenset({ADDRESS_UTXOS, ADDRESS_TXS, TX_DETAILS})
+    
     def __init__(self):
         self.name = "MempoolSniffer"
         self.did = "did:masumi:mempool_sniffer_01"
@@ -120,147 +142,187 @@ class MempoolSniffer:
         
         Args:
             address: Cardano address to check for pending transactions
-            context: Additional context from the scan request
+            context: Additional context from the scan request; a shared
+                `snapshot` (ChainSnapshot) is used instead of fetching
+            
+        Returns:
+            ScanResult with mempool analysis findings
+        """
+        snapshot = context.get("snapshot") or get_scan_planner().plan(address, self.REQUIRES)
+        activity = None
+        if snapshot.target.startswith("addr"):
+            activity = await self._reduce_activity(snapshot)
+        await snapshot.wait(self.REQUIRES)
+        return self.analyze(snapshot, activity)
+        
+    @staticmethod
+    def _burst_hashes(recent_txs: list) -> List[str]:
+        """Transactions checked for bursts and fee outliers (none if too few)."""
+        if len(recent_txs) < 5:
+            return []
+        return [tx.get("tx_hash") for tx in recent_txs[:5]]
+        
+    def _add_tx_detail(self, activity: TxActivity, index: int, tx_detail_resp: Resource) -> None:
+        """Fold one transaction detail into the activity statistics."""
+        if tx_detail_resp.status_code == 200:
+            tx_detail = tx_detail_resp.json()
+            activity.tx_times.append(tx_detail.get("block_time", 0))
+            
+            fee = int(tx_detail.get("fees", 0))
+            if fee > self.HIGH_FEE_THRESHOLD:
+                activity.high_fee_count += 1
+                
+            if fee > self.SUSPICIOUS_FEE_THRESHOLD:
+                activity.suspicious_fees[index] = fee
+                
+    async def _reduce_activity(self, snapshot: ChainSnapshot) -> Optional[TxActivity]:
+        """
+        Build the activity statistics while transaction details are still arriving.
+        
+        Returns None if the data is unusable, so `analyze` reports the
+        problem with its usual error handling.
+        """
+        try:
+            await snapshot.wait([ADDRESS_TXS])
+            if snapshot.address_txs.status_code != 200:
+                return None
+            tx_hashes = self._burst_hashes(snapshot.address_txs.json()[:10])
+            activity = TxActivity()
+            async for index, tx_detail_resp in snapshot.tx_details_as_completed(tx_hashes):
+                self._add_tx_detail(activity, index, tx_detail_resp)
+            return activity
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            return None
+        
+    def analyze(self, snapshot: ChainSnapshot, activity: Optional[TxActivity] = None) -> ScanResult:
+        """
+        Analyze recent transaction activity from a prefetched snapshot.
+        
+        Args:
+            snapshot: Chain data covering this specialist's REQUIRES
+            activity: Statistics already reduced from the snapshot's recent
+                transaction details (computed here if omitted)
             
         Returns:
             ScanResult with mempool analysis findings
         """
+        address = snapshot.target
         findings = []
         risk_score = 0.0
         metadata = {"agent": self.name}
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                headers = {"project_id": self.blockfrost_key}
-                
-                # Note: Blockfrost doesn't have direct mempool access on preprod
-                # We analyze recent transactions and UTxOs as proxy
+            # Note: Blockfrost doesn't have direct mempool access on preprod
+            # We analyze recent transactions and UTxOs as proxy
+            
+            if address and address.startswith("addr"):
+                utxo_resp = snapshot.address_utxos
+                txs_resp = snapshot.address_txs
                 
-                if address and address.startswith("addr"):
-                    # Get address UTxOs (unspent outputs)
-                    utxo_resp = await client.get(
-                        f"{self.blockfrost_url}/v0/addresses/{address}/utxos",
-                        headers=headers
-                    )
+                if utxo_resp.status_code == 200:
+                    utxos = utxo_resp.json()
+                    metadata["utxo_count"] = len(utxos)
                     
-                    if utxo_resp.status_code == 200:
-                        utxos = utxo_resp.json()
-                        metadata["utxo_count"] = len(utxos)
-                        
-                        total_value = 0
-                        has_native_tokens = False
-                        token_count = 0
-                        
-                        for utxo in utxos:
-                            total_value += int(utxo.get("amount", [{}])[0].get("quantity", 0))
-                            amounts = utxo.get("amount", [])
-                            if len(amounts) > 1:
-                                has_native_tokens = True
-                                token_count += len(amounts) - 1
-                                
-                        metadata["total_value_ada"] = total_value / 1_000_000
-                        metadata["has_native_tokens"] = has_native_tokens
-                        metadata["native_token_count"] = token_count
-                        
-                        # Large number of UTxOs could indicate dust attack or complex activity
-                        if len(utxos) > 50:
-                            findings.append(f"High UTxO count ({len(utxos)}) - possible fragmentation or dust attack")
-                            risk_score += 0.15
-                            
-                        if len(utxos) > 200:
-                            findings.append("Extreme UTxO fragmentation detected")
-                            risk_score += 0.25
-                            
-                    elif utxo_resp.status_code == 404:
-                        findings.append("No UTxOs found for address")
-                        metadata["utxo_count"] = 0
-                        
-                    # Get recent transactions for this address
-                    txs_resp = await client.get(
-                        f"{self.blockfrost_url}/v0/addresses/{address}/transactions?count=10&order=desc",
-                        headers=headers
-                    )
+                    total_value = 0
+                    has_native_tokens = False
+                    token_count = 0
                     
-                    if txs_resp.status_code == 200:
-                        recent_txs = txs_resp.json()
-                        metadata["recent_tx_count"] = len(recent_txs)
-                        
-                        # Analyze transaction patterns
-                        if len(recent_txs) >= 5:
-                            # Check for rapid transaction bursts
-                            tx_hashes = [tx.get("tx_hash") for tx in recent_txs[:5]]
-                            tx_times = []
-                            high_fee_count = 0
+                    for utxo in utxos:
+                        total_value += int(utxo.get("amount", [{}])[0].get("quantity", 0))
+                        amounts = utxo.get("amount", [])
+                        if len(amounts) > 1:
+                            has_native_tokens = True
+                            token_count += len(amounts) - 1
                             
-                            for tx_hash in tx_hashes:
-                                tx_detail_resp = await client.get(
-                                    f"{self.blockfrost_url}/v0/txs/{tx_hash}",
-                                    headers=headers
-                                )
-                                if tx_detail_resp.status_code == 200:
-                                    tx_detail = tx_detail_resp.json()
-                                    tx_times.append(tx_detail.get("block_time", 0))
-                                    
-                                    fee = int(tx_detail.get("fees", 0))
-                                    if fee > self.HIGH_FEE_THRESHOLD:
-                                        high_fee_count += 1
-                                        
-                                    if fee > self.SUSPICIOUS_FEE_THRESHOLD:
-                                        findings.append(f"Suspiciously high fee transaction: {fee/1_000_000:.2f} ADA")
-                                        risk_score += 0.2
-                                        
-                            # Check time gaps between transactions
-                            if len(tx_times) >= 2:
-                                tx_times.sort(reverse=True)
-                                gaps = [tx_times[i] - tx_times[i+1] for i in range(len(tx_times)-1)]
-                                avg_gap = sum(gaps) / len(gaps) if gaps else 0
-                                
-                                if avg_gap < 60:  # Less than 1 minute average
-                                    findings.append(f"Rapid transaction pattern detected (avg {avg_gap:.0f}s between txs)")
-                                    risk_score += 0.2
-                                    
-                            if high_fee_count >= 2:
-                                findings.append(f"Multiple high-fee transactions ({high_fee_count}) - possible priority transaction pattern")
-                                risk_score += 0.15
-                                
-                elif address and address.startswith("tx_"):
-                    # Direct transaction hash analysis
-                    tx_hash = address.replace("tx_", "")
-                    tx_resp = await client.get(
-                        f"{self.blockfrost_url}/v0/txs/{tx_hash}",
-                        headers=headers
-                    )
+                    metadata["total_value_ada"] = total_value / 1_000_000
+                    metadata["has_native_tokens"] = has_native_tokens
+                    metadata["native_token_count"] = token_count
                     
-                    if tx_resp.status_code == 200:
-                        tx_data = tx_resp.json()
-                        fee = int(tx_data.get("fees", 0))
-                        size = tx_data.get("size", 0)
+                    # Large number of UTxOs could indicate dust attack or complex activity
+                    if len(utxos) > 50:
+                        findings.append(f"High UTxO count ({len(utxos)}) - possible fragmentation or dust attack")
+                        risk_score += 0.15
+                        
+                    if len(utxos) > 200:
+                        findings.append("Extreme UTxO fragmentation detected")
+                        risk_score += 0.25
                         
-                        metadata["transaction"] = {
-                            "hash": tx_hash,
-                            "fee_ada": fee / 1_000_000,
-                            "size_bytes": size,
-                            "block": tx_data.get("block"),
-                            "slot": tx_data.get("slot"),
-                        }
+                elif utxo_resp.status_code == 404:
+                    findings.append("No UTxOs found for address")
+                    metadata["utxo_count"] = 0
+                    
+                # Analyze recent transactions for this address
+                if txs_resp.status_code == 200:
+                    recent_txs = txs_resp.json()[:10]
+                    metadata["recent_tx_count"] = len(recent_txs)
+                    
+                    # Analyze transaction patterns
+                    tx_hashes = self._burst_hashes(recent_txs)
+                    if tx_hashes:
+                        # Check for rapid transaction bursts
+                        if activity is None:
+                            activity = TxActivity()
+                            for index, tx_hash in enumerate(tx_hashes):
+                                self._add_tx_detail(activity, index, snapshot.txs[tx_hash])
+                        tx_times = list(activity.tx_times)
+                        high_fee_count = activity.high_fee_count
                         
-                        # Analyze fee efficiency
-                        if size > 0:
-                            fee_per_byte = fee / size
-                            metadata["transaction"]["fee_per_byte"] = fee_per_byte
+                        # Report fee outliers in transaction order, not arrival order
+                        for index in sorted(activity.suspicious_fees):
+                            findings.append(f"Suspiciously high fee transaction: {activity.suspicious_fees[index]/1_000_000:.2f} ADA")
+                            risk_score += 0.2
+                            
+                        # Check time gaps between transactions
+                        if len(tx_times) >= 2:
+                            tx_times.sort(reverse=True)
+                            gaps = [tx_times[i] - tx_times[i+1] for i in range(len(tx_times)-1)]
+                            avg_gap = sum(gaps) / len(gaps) if gaps else 0
                             
-                            if fee_per_byte > 100:  # High fee per byte
-                                findings.append(f"Transaction has elevated fee-per-byte ratio: {fee_per_byte:.2f}")
-                                risk_score += 0.1
+                            if avg_gap < 60:  # Less than 1 minute average
+                                findings.append(f"Rapid transaction pattern detected (avg {avg_gap:.0f}s between txs)")
+                                risk_score += 0.2
                                 
-                        if fee > self.SUSPICIOUS_FEE_THRESHOLD:
-                            findings.append(f"Transaction fee significantly above normal: {fee/1_000_000:.2f} ADA")
+                        if high_fee_count >= 2:
+                            findings.append(f"Multiple high-fee transactions ({high_fee_count}) - possible priority transaction pattern")
                             risk_score += 0.15
                             
-                    elif tx_resp.status_code == 404:
-                        findings.append("Transaction not found - may still be in mempool or invalid")
-                        risk_score += 0.1
+            elif address and is_tx_target(address):
+                # Direct transaction hash analysis (`tx_` prefixed or bare 64-hex hash)
+                tx_hash = address.replace("tx_", "")
+                tx_resp = snapshot.txs[tx_hash]
+                
+                if tx_resp.status_code == 200:
+                    tx_data = tx_resp.json()
+                    fee = int(tx_data.get("fees", 0))
+                    size = tx_data.get("size", 0)
+                    
+                    metadata["transaction"] = {
+                        "hash": tx_hash,
+                        "fee_ada": fee / 1_000_000,
+                        "size_bytes": size,
+                        "block": tx_data.get("block"),
+                        "slot": tx_data.get("slot"),
+                    }
+                    
+                    # Analyze fee efficiency
+                    if size > 0:
+                        fee_per_byte = fee / size
+                        metadata["transaction"]["fee_per_byte"] = fee_per_byte
                         
+                        if fee_per_byte > 100:  # High fee per byte
+                            findings.append(f"Transaction has elevated fee-per-byte ratio: {fee_per_byte:.2f}")
+                            risk_score += 0.1
+                            
+                    if fee > self.SUSPICIOUS_FEE_THRESHOLD:
+                        findings.append(f"Transaction fee significantly above normal: {fee/1_000_000:.2f} ADA")
+                        risk_score += 0.15
+                        
+                elif tx_resp.status_code == 404:
+                    findings.append("Transaction not found - may still be in mempool or invalid")
+                    risk_score += 0.1
+                    
         except httpx.TimeoutException:
             return ScanResult(
                 risk_score=0.15,
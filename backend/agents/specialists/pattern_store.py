@@ -0,0 +1,251 @@
+"""
+Replay Pattern Store
+====================
+Bounded, persistent table of transaction-pattern digests for ReplayDetector.
+
+Layout: a set-associative, array-backed hash table. Each digest maps to one
+bucket of `ways` slots; a slot is a fixed 32-byte record
+
+    digest (16 bytes) | count (uint32) | last_seen (uint32, unix seconds) | txs (64-bit bloom)
+
+so memory is fixed at `buckets * ways * 32` bytes regardless of traffic.
+
+`count` is the number of distinct transactions seen with the pattern: the
+slot's Bloom filter remembers which tx hashes were already counted, so
+rescanning the same address (or the same tx) never inflates it. A filter
+false positive can only undercount, never report a replay that isn't there.
+Entries older than `max_age` are treated as absent and are the first to be
+overwritten; when a bucket is full of live entries the least recently seen
+one is evicted.
+
+The table lives in a memory-mapped file, so every uvicorn worker and
+specialist replica on a host sees the same patterns, and a restart picks up
+where it left off. Without a file path it falls back to process memory.
+
+Configuration (all optional, via environment):
+    REPLAY_PATTERN_STORE_PATH     Backing file ("" = in-memory only;
+                                  default: backend/data/son_replay_patterns.bin)
+    REPLAY_PATTERN_STORE_BUCKETS  Number of buckets (4096)
+    REPLAY_PATTERN_STORE_WAYS     Slots per bucket (8)
+    REPLAY_PATTERN_MAX_AGE        Seconds a pattern is remembered (604800)
+"""
+
+import os
+import mmap
+import time
+import struct
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+# Cross-process write locking is optional (POSIX only)
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger("SON.PatternStore")
+
+DIGEST_SIZE = 16
+
+_HEADER = struct.Struct("<8sII")  # magic, buckets, ways
+_SLOT = struct.Struct("<16sIIQ")  # digest, count, last_seen, tx bloom
+_MAGIC = b"SONPAT02"
+
+# Bits set per tx hash in a slot's 64-bit Bloom filter
+_BLOOM_HASHES = 3
+
+# Default: backend/data, next to the result store (a volume in the container)
+REPLAY_PATTERN_STORE_PATH = os.getenv(
+    "REPLAY_PATTERN_STORE_PATH",
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        "data", "son_replay_patterns.bin",
+    ),
+)
+REPLAY_PATTERN_STORE_BUCKETS = int(os.getenv("REPLAY_PATTERN_STORE_BUCKETS", "4096"))
+REPLAY_PATTERN_STORE_WAYS = int(os.getenv("REPLAY_PATTERN_STORE_WAYS", "8"))
+REPLAY_PATTERN_MAX_AGE = int(os.getenv("REPLAY_PATTERN_MAX_AGE", str(7 * 24 * 3600)))
+
+
+class PatternStore:
+    """
+    Fixed-size digest -> (distinct tx count, last_seen) table, optionally
+    file-backed.
+
+    Every access holds a thread lock and an exclusive lock on the backing
+    file, so increments from concurrent threads and processes are never
+    lost and readers never see a half-written slot. An evicted pattern
+    counts from 1 again if it reappears.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = REPLAY_PATTERN_STORE_PATH,
+        buckets: int = REPLAY_PATTERN_STORE_BUCKETS,
+        ways: int = REPLAY_PATTERN_STORE_WAYS,
+        max_age: int = REPLAY_PATTERN_MAX_AGE,
+    ):
+        self.buckets = buckets
+        self.ways = ways
+        self.max_age = max_age
+        self.path = path or None
+        self.evictions = 0
+        self._fd: Optional[int] = None
+        self._thread_lock = threading.Lock()
+
+        size = _HEADER.size + buckets * ways * _SLOT.size
+        if self.path:
+            try:
+                self._buf = self._open_mapped(self.path, size)
+            except OSError as e:
+                logger.warning(f"Pattern store file {self.path} unavailable ({e}) - using memory only")
+                self.path = None
+        if not self.path:
+            self._buf = bytearray(size)
+            _HEADER.pack_into(self._buf, 0, _MAGIC, buckets, ways)
+
+    def _open_mapped(self, path: str, size: int) -> mmap.mmap:
+        """Map the backing file, (re)initializing it if its geometry differs."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        with self._locked():
+            fresh = os.fstat(self._fd).st_size != size
+            if not fresh:
+                magic, buckets, ways = _HEADER.unpack(os.pread(self._fd, _HEADER.size, 0))
+                fresh = (magic, buckets, ways) != (_MAGIC, self.buckets, self.ways)
+            if fresh:
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, _HEADER.pack(_MAGIC, self.buckets, self.ways), 0)
+                logger.info(f"Initialized replay pattern store at {path}")
+        return mmap.mmap(self._fd, size)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the thread lock and an exclusive lock on the backing file."""
+        with self._thread_lock:
+            if self._fd is None or not FCNTL_AVAILABLE:
+                yield
+                return
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _bucket_offset(self, digest: bytes) -> int:
+        bucket = int.from_bytes(digest[:8], "little") % self.buckets
+        return _HEADER.size + bucket * self.ways * _SLOT.size
+
+    def _is_live(self, count: int, last_seen: int, now: int) -> bool:
+        return count > 0 and now - last_seen <= self.max_age
+
+    @staticmethod
+    def _tx_bits(tx_hash: str) -> int:
+        """Bloom filter bits of a transaction hash."""
+        h = hashlib.blake2b(tx_hash.encode(), digest_size=_BLOOM_HASHES).digest()
+        bits = 0
+        for byte in h:
+            bits |= 1 << (byte & 63)
+        return bits
+
+    def observe(self, digest: bytes, tx_hash: str) -> int:
+        """
+        Record that a transaction has a pattern.
+
+        Args:
+            digest: 16-byte pattern digest
+            tx_hash: Transaction with this pattern; one already recorded
+                for the pattern is not counted again
+
+        Returns:
+            How many distinct transactions have had the pattern, including
+            this one
+        """
+        if len(digest) != DIGEST_SIZE:
+            raise ValueError(f"Pattern digest must be {DIGEST_SIZE} bytes")
+
+        now = int(time.time())
+        base = self._bucket_offset(digest)
+        tx_bits = self._tx_bits(tx_hash)
+
+        with self._locked():
+            victim = None
+            victim_seen = None
+            for way in range(self.ways):
+                offset = base + way * _SLOT.size
+                slot_digest, count, last_seen, txs = _SLOT.unpack_from(self._buf, offset)
+                live = self._is_live(count, last_seen, now)
+
+                if live and slot_digest == digest:
+                    if txs & tx_bits != tx_bits:
+                        count += 1
+                    _SLOT.pack_into(self._buf, offset, digest, count, now, txs | tx_bits)
+                    return count
+
+                # Prefer an empty/expired slot, else the least recently seen
+                seen = last_seen if live else -1
+                if victim is None or seen < victim_seen:
+                    victim, victim_seen = offset, seen
+
+            if victim_seen is not None and victim_seen >= 0:
+                self.evictions += 1
+            _SLOT.pack_into(self._buf, victim, digest, 1, now, tx_bits)
+            return 1
+
+    def count(self, digest: bytes) -> int:
+        """Get how many distinct transactions had a pattern (0 if unknown or expired)."""
+        now = int(time.time())
+        base = self._bucket_offset(digest)
+        with self._locked():
+            for way in range(self.ways):
+                slot_digest, count, last_seen, _ = _SLOT.unpack_from(self._buf, base + way * _SLOT.size)
+                if slot_digest == digest and self._is_live(count, last_seen, now):
+                    return count
+        return 0
+
+    def flush(self) -> None:
+        """Write dirty pages of the mapped file back to disk."""
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.flush()
+
+    def close(self) -> None:
+        """Flush and unmap the backing file."""
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.flush()
+            self._buf.close()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get capacity, live entry count and eviction counter."""
+        now = int(time.time())
+        live = 0
+        with self._locked():
+            for offset in range(_HEADER.size, len(self._buf), _SLOT.size):
+                _, count, last_seen, _ = _SLOT.unpack_from(self._buf, offset)
+                if self._is_live(count, last_seen, now):
+                    live += 1
+        return {
+            "capacity": self.buckets * self.ways,
+            "live_entries": live,
+            "evictions": self.evictions,
+            "max_age": self.max_age,
+            "path": self.path,
+        }
+
+
+_pattern_store: Optional[PatternStore] = None
+
+
+def get_pattern_store() -> PatternStore:
+    """Get the process-wide replay pattern store."""
+    global _pattern_store
+    if _pattern_store is None:
+        _pattern_store = PatternStore()
+    return _pattern_store
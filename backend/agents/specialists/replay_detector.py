@@ -20,6 +20,10 @@ from enum import Enum
 import nacl.signing
 from nacl.signing import SigningKey
 
+from ..scan_planner import ADDRESS_TXS, TX_BUNDLES, TX_DETAILS, ChainSnapshot, get_scan_planner
+from .pattern_store import get_pattern_store
+from .spend_index import get_spend_index
+
 
 class Severity(Enum):
     CRITICAL = "critical"
@@ -57,6 +61,9 @@ class ReplayDetector:
     - Communicates via IACP/2.0 protocol with signed envelopes
     """
     
+    # Chain data this specialist analyzes (see scan_planner)
+    REQUIRES = frozenset({ADDRESS_TXS, TX_DETAILS, TX_BUNDLES})
+    
     def __init__(self):
         self.name = "ReplayDetector"
         self.did = "did:masumi:replay_detector_01"
@@ -77,8 +84,11 @@ class ReplayDetector:
         self.public_key = self.private_key.verify_key
         self.logger.info(f"ReplayDetector initialized with DID: {self.did}")
         
-        # In production, this would be a persistent cache (Redis, etc.)
-        self._seen_tx_patterns: dict[str, int] = {}
+        # Bounded, file-backed pattern table shared across workers and restarts
+        self._seen_tx_patterns = get_pattern_store()
+        
+        # Spent UTxO -> spending txs, fed by every /txs/{h}/utxos download
+        self._spend_index = get_spend_index()
         
     def get_public_key_b64(self) -> str:
         """Get base64-encoded public key for registration."""
@@ -113,8 +123,8 @@ class ReplayDetector:
         from datetime import datetime, timezone
         return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
         
-    def _compute_tx_pattern_hash(self, inputs: list, outputs: list) -> str:
-        """Compute a hash of transaction input/output pattern for replay detection."""
+    def _compute_tx_pattern_hash(self, inputs: list, outputs: list) -> bytes:
+        """Compute a 16-byte digest of transaction input/output pattern for replay detection."""
         pattern_data = []
         
         # Normalize inputs
@@ -128,7 +138,7 @@ class ReplayDetector:
                 pattern_data.append(f"o:{out.get('address', '')}:{amt.get('unit', '')}:{amt.get('quantity', '')}")
                 
         pattern_str = "|".join(pattern_data)
-        return hashlib.sha256(pattern_str.encode()).hexdigest()[:16]
+        return hashlib.sha256(pattern_str.encode()).digest()[:16]
         
     async def scan(self, address: str, context: dict) -> ScanResult:
         """
@@ -136,142 +146,135 @@ class ReplayDetector:
         
         Args:
             address: Cardano address or transaction hash to analyze
-            context: Additional context from the scan request
+            context: Additional context from the scan request; a shared
+                `snapshot` (ChainSnapshot) is used instead of fetching
+            
+        Returns:
+            ScanResult with replay detection findings
+        """
+        snapshot = context.get("snapshot") or get_scan_planner().plan(address, self.REQUIRES)
+        await snapshot.wait(self.REQUIRES)
+        return self.analyze(snapshot)
+        
+    def analyze(self, snapshot: ChainSnapshot) -> ScanResult:
+        """
+        Analyze prefetched transactions for replay and double-spend indicators.
+        
+        Besides the snapshot, this consults (and updates) the shared pattern
+        store and spend index.
+        
+        Args:
+            snapshot: Chain data covering this specialist's REQUIRES
             
         Returns:
             ScanResult with replay detection findings
         """
+        address = snapshot.target
         findings = []
         risk_score = 0.0
         metadata = {"agent": self.name}
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                headers = {"project_id": self.blockfrost_key}
-                
-                transactions_to_analyze = []
+            # Recent transactions of an address target (a tx target is just itself)
+            if snapshot.address_txs is not None and snapshot.address_txs.status_code == 200:
+                metadata["transactions_analyzed"] = len(snapshot.tx_hashes)
                 
-                if address.startswith("tx_") or len(address) == 64:
-                    # Direct transaction hash
-                    tx_hash = address.replace("tx_", "")
-                    transactions_to_analyze.append(tx_hash)
-                elif address.startswith("addr"):
-                    # Get recent transactions for address
-                    txs_resp = await client.get(
-                        f"{self.blockfrost_url}/v0/addresses/{address}/transactions?count=20&order=desc",
-                        headers=headers
-                    )
+            # Analyze each transaction (in list order, so pattern bookkeeping stays deterministic)
+            for tx_hash in snapshot.tx_hashes:
+                tx_resp = snapshot.txs[tx_hash]
+                utxo_resp = snapshot.tx_utxos[tx_hash]
+                redeemers_resp = snapshot.tx_redeemers[tx_hash]
+                if tx_resp.status_code != 200:
+                    continue
                     
-                    if txs_resp.status_code == 200:
-                        recent_txs = txs_resp.json()
-                        transactions_to_analyze = [tx.get("tx_hash") for tx in recent_txs[:10]]
-                        metadata["transactions_analyzed"] = len(transactions_to_analyze)
-                        
-                # Analyze each transaction
-                for tx_hash in transactions_to_analyze:
-                    # Get full transaction details
-                    tx_resp = await client.get(
-                        f"{self.blockfrost_url}/v0/txs/{tx_hash}",
-                        headers=headers
-                    )
+                tx_data = tx_resp.json()
+                
+                if utxo_resp.status_code != 200:
+                    continue
                     
-                    if tx_resp.status_code != 200:
-                        continue
-                        
-                    tx_data = tx_resp.json()
+                utxo_data = utxo_resp.json()
+                inputs = utxo_data.get("inputs", [])
+                outputs = utxo_data.get("outputs", [])
+                
+                # Compute pattern hash
+                pattern_hash = self._compute_tx_pattern_hash(inputs, outputs)
+                
+                # Check for other transactions with the same pattern (potential replay)
+                seen_count = self._seen_tx_patterns.observe(pattern_hash, tx_hash)
+                if seen_count > 1:
+                    findings.append(f"Similar transaction pattern detected (seen in {seen_count} transactions)")
+                    risk_score += 0.3
                     
-                    # Get UTxOs (inputs and outputs)
-                    utxo_resp = await client.get(
-                        f"{self.blockfrost_url}/v0/txs/{tx_hash}/utxos",
-                        headers=headers
+                # Check for cross-transaction double spends (inputs already indexed)
+                for ref, others in self._spend_index.conflicts(tx_hash, inputs).items():
+                    findings.append(
+                        f"Double-spend: input {ref[:16]}...#{ref.split('#')[-1]} also spent by {others[0][:16]}..."
                     )
+                    risk_score += 0.5
                     
-                    if utxo_resp.status_code != 200:
-                        continue
-                        
-                    utxo_data = utxo_resp.json()
-                    inputs = utxo_data.get("inputs", [])
-                    outputs = utxo_data.get("outputs", [])
+                # Check for script validation issues
+                if tx_data.get("valid_contract") is False:
+                    findings.append(f"Transaction {tx_hash[:16]}... has invalid contract execution")
+                    risk_score += 0.4
                     
-                    # Compute pattern hash
-                    pattern_hash = self._compute_tx_pattern_hash(inputs, outputs)
-                    
-                    # Check for similar patterns (potential replay)
-                    if pattern_hash in self._seen_tx_patterns:
-                        prev_count = self._seen_tx_patterns[pattern_hash]
-                        findings.append(f"Similar transaction pattern detected (seen {prev_count + 1} times)")
-                        risk_score += 0.3
-                        self._seen_tx_patterns[pattern_hash] = prev_count + 1
-                    else:
-                        self._seen_tx_patterns[pattern_hash] = 1
-                        
-                    # Check for script validation issues
-                    if tx_data.get("valid_contract") is False:
-                        findings.append(f"Transaction {tx_hash[:16]}... has invalid contract execution")
-                        risk_score += 0.4
+                # Check redeemers (script executions)
+                if redeemers_resp.status_code == 200:
+                    redeemers = redeemers_resp.json()
+                    if redeemers:
+                        metadata["has_scripts"] = True
+                        metadata["redeemer_count"] = len(redeemers)
                         
-                    # Check redeemers (script executions)
-                    redeemers_resp = await client.get(
-                        f"{self.blockfrost_url}/v0/txs/{tx_hash}/redeemers",
-                        headers=headers
-                    )
+                        for redeemer in redeemers:
+                            # Check execution units
+                            # Blockfrost returns execution units as strings
+                            ex_units = int(redeemer.get("unit_mem", 0)), int(redeemer.get("unit_steps", 0))
+                            if ex_units[0] > 10_000_000 or ex_units[1] > 5_000_000_000:
+                                findings.append("High execution unit consumption - complex script execution")
+                                risk_score += 0.1
+                                
+                # Analyze input patterns for double-spend indicators
+                input_addresses = set()
+                for inp in inputs:
+                    inp_addr = inp.get("address", "")
+                    if inp_addr in input_addresses:
+                        findings.append("Multiple inputs from same address in single transaction")
+                        # This is actually normal, just noting it
+                    input_addresses.add(inp_addr)
                     
-                    if redeemers_resp.status_code == 200:
-                        redeemers = redeemers_resp.json()
-                        if redeemers:
-                            metadata["has_scripts"] = True
-                            metadata["redeemer_count"] = len(redeemers)
-                            
-                            for redeemer in redeemers:
-                                # Check execution units
-                                ex_units = redeemer.get("unit_mem", 0), redeemer.get("unit_steps", 0)
-                                if ex_units[0] > 10_000_000 or ex_units[1] > 5_000_000_000:
-                                    findings.append("High execution unit consumption - complex script execution")
-                                    risk_score += 0.1
-                                    
-                    # Analyze input patterns for double-spend indicators
-                    input_addresses = set()
-                    for inp in inputs:
-                        inp_addr = inp.get("address", "")
-                        if inp_addr in input_addresses:
-                            findings.append("Multiple inputs from same address in single transaction")
-                            # This is actually normal, just noting it
-                        input_addresses.add(inp_addr)
+                    # Check if input was recently created and quickly spent
+                    if inp.get("data_hash"):
+                        findings.append("Transaction uses datum-locked input (script validation)")
                         
-                        # Check if input was recently created and quickly spent
-                        if inp.get("data_hash"):
-                            findings.append("Transaction uses datum-locked input (script validation)")
-                            
-                    # Check for circular transaction patterns
-                    output_addresses = set(out.get("address", "") for out in outputs)
-                    overlap = input_addresses & output_addresses
+                # Check for circular transaction patterns
+                output_addresses = set(out.get("address", "") for out in outputs)
+                overlap = input_addresses & output_addresses
+                
+                if overlap and len(overlap) == len(input_addresses) == len(output_addresses):
+                    findings.append("Circular transaction pattern detected (outputs return to input addresses)")
+                    risk_score += 0.2
                     
-                    if overlap and len(overlap) == len(input_addresses) == len(output_addresses):
-                        findings.append("Circular transaction pattern detected (outputs return to input addresses)")
-                        risk_score += 0.2
-                        
-                    # Check for dust outputs (potential spam/attack)
-                    dust_outputs = 0
-                    for out in outputs:
-                        amounts = out.get("amount", [])
-                        ada_amount = 0
-                        for amt in amounts:
-                            if amt.get("unit") == "lovelace":
-                                ada_amount = int(amt.get("quantity", 0))
-                                break
-                        if ada_amount < 1_500_000:  # Less than 1.5 ADA (min UTxO)
-                            dust_outputs += 1
-                            
-                    if dust_outputs > 2:
-                        findings.append(f"Multiple dust outputs ({dust_outputs}) - possible fragmentation attack")
-                        risk_score += 0.15
+                # Check for dust outputs (potential spam/attack)
+                dust_outputs = 0
+                for out in outputs:
+                    amounts = out.get("amount", [])
+                    ada_amount = 0
+                    for amt in amounts:
+                        if amt.get("unit") == "lovelace":
+                            ada_amount = int(amt.get("quantity", 0))
+                            break
+                    if ada_amount < 1_500_000:  # Less than 1.5 ADA (min UTxO)
+                        dust_outputs += 1
                         
-                # Network-level check: recent failed transactions
-                if address.startswith("addr"):
-                    # This would require indexing failed txs which Blockfrost doesn't directly expose
-                    # In production, you'd have your own node or specialized indexer
-                    pass
+                if dust_outputs > 2:
+                    findings.append(f"Multiple dust outputs ({dust_outputs}) - possible fragmentation attack")
+                    risk_score += 0.15
                     
+            # Network-level check: recent failed transactions
+            if address.startswith("addr"):
+                # This would require indexing failed txs which Blockfrost doesn't directly expose
+                # In production, you'd have your own node or specialized indexer
+                pass
+                
         except httpx.TimeoutException:
             return ScanResult(
                 risk_score=0.2,
@@ -5,11 +5,16 @@ Specialist Service Wrapper for KODOSUMI Deployment
 This wrapper allows each specialist agent to run as an independent microservice
 on KODOSUMI with FastAPI, health checks, and agent registration.
 
-Usage:
-    python specialist_service.py <specialist_name>
+Usage (from the backend directory):
+    python -m agents.specialists.specialist_service <specialist_name>
     
     Example:
-        python specialist_service.py block_scanner
+        python -m agents.specialists.specialist_service block_scanner
+
+Running the file directly (`python specialist_service.py block_scanner`)
+also works: the backend directory is put on sys.path first, since the
+specialists import shared modules (chain client, scan planner) from the
+`agents` package.
 """
 
 import asyncio
@@ -26,18 +31,23 @@ logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
 logger = logging.getLogger("SON.Specialist")
 
 # Import specialist classes
-try:
-    from block_scanner import BlockScanner
-    from stake_analyzer import StakeAnalyzer
-    from vote_doctor import VoteDoctor
-    from mempool_sniffer import MempoolSniffer
-    from replay_detector import ReplayDetector
-except ImportError:
+if not __package__:
+    # Run as a script: import through the `agents` package so the
+    # specialists' package-relative imports resolve
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from agents.specialists.block_scanner import BlockScanner
+    from agents.specialists.stake_analyzer import StakeAnalyzer
+    from agents.specialists.vote_doctor import VoteDoctor
+    from agents.specialists.mempool_sniffer import MempoolSniffer
+    from agents.specialists.replay_detector import ReplayDetector
+    from agents.chain_client import get_chain_client, close_chain_client
+else:
     from .block_scanner import BlockScanner
     from .stake_analyzer import StakeAnalyzer
     from .vote_doctor import VoteDoctor
     from .mempool_sniffer import MempoolSniffer
     from .replay_detector import ReplayDetector
+    from ..chain_client import get_chain_client, close_chain_client
 
 
 # Specialist mapping
@@ -243,6 +253,11 @@ def run_specialist_service(specialist_name: str):
     @app.on_event("startup")
     async def startup():
         asyncio.create_task(auto_register_with_registry(specialist))
+        await get_chain_client().warm_up()
+    
+    @app.on_event("shutdown")
+    async def shutdown():
+        await close_chain_client()
     
     # Run server
     port = int(os.getenv("SERVICE_PORT", 8000))
@@ -0,0 +1,138 @@
+"""
+Spent UTxO Index
+================
+Inverted index from spent UTxO reference (`tx_hash#output_index`) to the
+transactions seen spending it, for cross-address double-spend detection.
+
+The index is fed passively: every `/txs/{hash}/utxos` response that any
+agent downloads through the shared ChainClient is recorded, so checking
+whether an input was also spent by another transaction is an O(1) lookup
+rather than another upstream call.
+
+Reference inputs are not spent and are ignored; collateral inputs are only
+consumed when a script fails, so they are ignored too.
+
+Memory is bounded: entries expire after `ttl` seconds and the oldest are
+dropped beyond `max_entries`.
+
+Configuration (all optional, via environment):
+    SPEND_INDEX_MAX_ENTRIES  Indexed UTxO references (200000)
+    SPEND_INDEX_TTL          Seconds an entry is kept (86400)
+"""
+
+import os
+import re
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+import httpx
+
+from ..chain_client import get_chain_client
+
+logger = logging.getLogger("SON.SpendIndex")
+
+SPEND_INDEX_MAX_ENTRIES = int(os.getenv("SPEND_INDEX_MAX_ENTRIES", "200000"))
+SPEND_INDEX_TTL = float(os.getenv("SPEND_INDEX_TTL", str(24 * 3600)))
+
+# Blockfrost transaction UTxO endpoint; group 1 is the spending tx hash
+UTXOS_PATH_PATTERN = r"/v0/txs/([0-9a-fA-F]{64})/utxos$"
+
+
+@dataclass
+class _SpendEntry:
+    spenders: List[str] = field(default_factory=list)
+    last_seen: float = 0.0
+
+
+def utxo_ref(tx_hash: str, output_index: Any) -> str:
+    """Format a UTxO reference as `tx_hash#output_index`."""
+    return f"{tx_hash}#{output_index}"
+
+
+class SpendIndex:
+    """Bounded UTxO reference -> spending transactions index with time eviction."""
+
+    def __init__(self, max_entries: int = SPEND_INDEX_MAX_ENTRIES, ttl: float = SPEND_INDEX_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, _SpendEntry]" = OrderedDict()
+        self._path_regex = re.compile(UTXOS_PATH_PATTERN)
+        self.stats = {"transactions": 0, "conflicts": 0}
+
+    def record(self, spending_tx: str, inputs: Iterable[Dict[str, Any]]) -> None:
+        """Record the inputs spent by a transaction."""
+        now = time.monotonic()
+        self.stats["transactions"] += 1
+        for inp in inputs:
+            if inp.get("reference") or inp.get("collateral"):
+                continue
+            ref = utxo_ref(inp.get("tx_hash", ""), inp.get("output_index", 0))
+            entry = self._entries.get(ref)
+            if entry is None:
+                entry = self._entries[ref] = _SpendEntry()
+            if spending_tx not in entry.spenders:
+                entry.spenders.append(spending_tx)
+                if len(entry.spenders) > 1:
+                    self.stats["conflicts"] += 1
+            entry.last_seen = now
+            self._entries.move_to_end(ref)
+        self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries and the oldest beyond capacity."""
+        while self._entries:
+            ref, entry = next(iter(self._entries.items()))
+            if len(self._entries) <= self.max_entries and now - entry.last_seen <= self.ttl:
+                break
+            del self._entries[ref]
+
+    def spenders(self, ref: str) -> List[str]:
+        """Get the transactions seen spending a UTxO reference."""
+        entry = self._entries.get(ref)
+        if entry is None or time.monotonic() - entry.last_seen > self.ttl:
+            return []
+        return list(entry.spenders)
+
+    def conflicts(self, spending_tx: str, inputs: Iterable[Dict[str, Any]]) -> Dict[str, List[str]]:
+        """
+        Find other transactions spending the same inputs.
+
+        Returns:
+            Dict mapping each contested UTxO reference to the other spenders
+        """
+        found = {}
+        for inp in inputs:
+            if inp.get("reference") or inp.get("collateral"):
+                continue
+            ref = utxo_ref(inp.get("tx_hash", ""), inp.get("output_index", 0))
+            others = [tx for tx in self.spenders(ref) if tx != spending_tx]
+            if others:
+                found[ref] = others
+        return found
+
+    def observe_response(self, url: str, response: httpx.Response) -> None:
+        """ChainClient observer: index a `/txs/{hash}/utxos` response."""
+        match = self._path_regex.search(httpx.URL(url).path)
+        if match is None:
+            return
+        data = response.json()
+        self.record(data.get("hash") or match.group(1), data.get("inputs", []))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get entry count and counters."""
+        return {**self.stats, "entries": len(self._entries), "ttl": self.ttl}
+
+
+_spend_index: Optional[SpendIndex] = None
+
+
+def get_spend_index() -> SpendIndex:
+    """Get the process-wide spend index, wired to the shared chain client."""
+    global _spend_index
+    if _spend_index is None:
+        _spend_index = SpendIndex()
+        get_chain_client().add_response_observer(UTXOS_PATH_PATTERN, _spend_index.observe_response)
+    return _spend_index
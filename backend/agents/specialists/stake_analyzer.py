@@ -19,6 +19,8 @@ from enum import Enum
 import nacl.signing
 from nacl.signing import SigningKey
 
+from ..scan_planner import ACCOUNT, ADDRESS, POOL, TOP_POOLS, ChainSnapshot, get_scan_planner
+
 
 class Severity(Enum):
     CRITICAL = "critical"
@@ -61,6 +63,9 @@ class StakeAnalyzer:
     CONCENTRATION_WARNING = 0.05  # Single entity > 5% of total stake
     MINORITY_CONTROL_THRESHOLD = 0.33  # 33% = potential minority attack
     
+    # Chain data this specialist analyzes (see scan_planner)
+    REQUIRES = frozenset({ADDRESS, ACCOUNT, POOL, TOP_POOLS})
+    
     def __init__(self):
         self.name = "StakeAnalyzer"
         self.did = "did:masumi:stake_analyzer_01"
@@ -120,139 +125,134 @@ class StakeAnalyzer:
         
         Args:
             address: Cardano address or stake address to analyze
-            context: Additional context from the scan request
+            context: Additional context from the scan request; a shared
+                `snapshot` (ChainSnapshot) is used instead of fetching
             
         Returns:
             ScanResult with stake analysis findings
         """
+        snapshot = context.get("snapshot") or get_scan_planner().plan(address, self.REQUIRES)
+        await snapshot.wait(self.REQUIRES)
+        return self.analyze(snapshot)
+        
+    def analyze(self, snapshot: ChainSnapshot) -> ScanResult:
+        """
+        Analyze stake-related data from a prefetched snapshot.
+        
+        Args:
+            snapshot: Chain data covering this specialist's REQUIRES
+            
+        Returns:
+            ScanResult with stake analysis findings
+        """
+        address = snapshot.target
         findings = []
         risk_score = 0.0
         metadata = {"agent": self.name}
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                headers = {"project_id": self.blockfrost_key}
+            # Resolve stake address from payment address if needed
+            stake_address = None
+            if address.startswith("stake"):
+                stake_address = address
+            elif address.startswith("addr"):
+                addr_resp = snapshot.address
+                if addr_resp.status_code == 200:
+                    addr_data = addr_resp.json()
+                    stake_address = addr_data.get("stake_address")
+                    metadata["payment_address"] = address
+                    
+            if stake_address:
+                metadata["stake_address"] = stake_address
                 
-                # Resolve stake address from payment address if needed
-                stake_address = None
-                if address.startswith("stake"):
-                    stake_address = address
-                elif address.startswith("addr"):
-                    addr_resp = await client.get(
-                        f"{self.blockfrost_url}/v0/addresses/{address}",
-                        headers=headers
-                    )
-                    if addr_resp.status_code == 200:
-                        addr_data = addr_resp.json()
-                        stake_address = addr_data.get("stake_address")
-                        metadata["payment_address"] = address
-                        
-                if stake_address:
-                    metadata["stake_address"] = stake_address
+                # Get stake account info
+                stake_resp = snapshot.account
+                
+                if stake_resp.status_code == 200:
+                    stake_data = stake_resp.json()
                     
-                    # Get stake account info
-                    stake_resp = await client.get(
-                        f"{self.blockfrost_url}/v0/accounts/{stake_address}",
-                        headers=headers
-                    )
+                    controlled_amount = int(stake_data.get("controlled_amount", 0))
+                    rewards_sum = int(stake_data.get("rewards_sum", 0))
+                    pool_id = stake_data.get("pool_id")
                     
-                    if stake_resp.status_code == 200:
-                        stake_data = stake_resp.json()
-                        
-                        controlled_amount = int(stake_data.get("controlled_amount", 0))
-                        rewards_sum = int(stake_data.get("rewards_sum", 0))
-                        pool_id = stake_data.get("pool_id")
+                    metadata["stake_info"] = {
+                        "controlled_amount_ada": controlled_amount / 1_000_000,
+                        "rewards_ada": rewards_sum / 1_000_000,
+                        "delegated_pool": pool_id,
+                        "active": stake_data.get("active", False),
+                    }
+                    
+                    # Large stake holder check
+                    if controlled_amount > 10_000_000_000_000:  # > 10M ADA
+                        findings.append(f"Large stake holder detected: {controlled_amount / 1_000_000:,.0f} ADA")
+                        risk_score += 0.2
                         
-                        metadata["stake_info"] = {
-                            "controlled_amount_ada": controlled_amount / 1_000_000,
-                            "rewards_ada": rewards_sum / 1_000_000,
-                            "delegated_pool": pool_id,
-                            "active": stake_data.get("active", False),
-                        }
+                    # Analyze delegated pool if exists
+                    if pool_id:
+                        pool_resp = snapshot.pool
                         
-                        # Large stake holder check
-                        if controlled_amount > 10_000_000_000_000:  # > 10M ADA
-                            findings.append(f"Large stake holder detected: {controlled_amount / 1_000_000:,.0f} ADA")
-                            risk_score += 0.2
+                        if pool_resp.status_code == 200:
+                            pool_data = pool_resp.json()
+                            
+                            live_stake = int(pool_data.get("live_stake", 0))
+                            live_saturation = float(pool_data.get("live_saturation", 0))
+                            blocks_minted = pool_data.get("blocks_minted", 0)
                             
-                        # Analyze delegated pool if exists
-                        if pool_id:
-                            pool_resp = await client.get(
-                                f"{self.blockfrost_url}/v0/pools/{pool_id}",
-                                headers=headers
-                            )
+                            metadata["pool_info"] = {
+                                "pool_id": pool_id,
+                                "live_stake_ada": live_stake / 1_000_000,
+                                "saturation": live_saturation,
+                                "blocks_minted": blocks_minted,
+                            }
                             
-                            if pool_resp.status_code == 200:
-                                pool_data = pool_resp.json()
+                            # Check saturation
+                            if live_saturation > self.SATURATION_WARNING:
+                                findings.append(f"Pool near saturation: {live_saturation*100:.1f}%")
+                                risk_score += 0.15
                                 
-                                live_stake = int(pool_data.get("live_stake", 0))
-                                live_saturation = float(pool_data.get("live_saturation", 0))
-                                blocks_minted = pool_data.get("blocks_minted", 0)
+                            if live_saturation >= 1.0:
+                                findings.append("Pool is OVERSATURATED - rewards reduction active")
+                                risk_score += 0.25
                                 
-                                metadata["pool_info"] = {
-                                    "pool_id": pool_id,
-                                    "live_stake_ada": live_stake / 1_000_000,
-                                    "saturation": live_saturation,
-                                    "blocks_minted": blocks_minted,
-                                }
+                            # Check pool metadata for legitimacy indicators
+                            pool_meta_resp = snapshot.pool_metadata
+                            
+                            if pool_meta_resp.status_code == 200:
+                                pool_meta = pool_meta_resp.json()
+                                if pool_meta.get("name"):
+                                    metadata["pool_info"]["name"] = pool_meta.get("name")
+                                if pool_meta.get("ticker"):
+                                    metadata["pool_info"]["ticker"] = pool_meta.get("ticker")
+                            elif pool_meta_resp.status_code == 404:
+                                findings.append("Pool has no metadata - potential privacy pool or new registration")
+                                risk_score += 0.1
                                 
-                                # Check saturation
-                                if live_saturation > self.SATURATION_WARNING:
-                                    findings.append(f"Pool near saturation: {live_saturation*100:.1f}%")
-                                    risk_score += 0.15
-                                    
-                                if live_saturation >= 1.0:
-                                    findings.append("Pool is OVERSATURATED - rewards reduction active")
-                                    risk_score += 0.25
-                                    
-                                # Check pool metadata for legitimacy indicators
-                                pool_meta_resp = await client.get(
-                                    f"{self.blockfrost_url}/v0/pools/{pool_id}/metadata",
-                                    headers=headers
-                                )
+                            # Check for recent pool retirement
+                            if pool_data.get("retiring_epoch"):
+                                findings.append(f"Pool retiring in epoch {pool_data.get('retiring_epoch')}")
+                                risk_score += 0.2
                                 
-                                if pool_meta_resp.status_code == 200:
-                                    pool_meta = pool_meta_resp.json()
-                                    if pool_meta.get("name"):
-                                        metadata["pool_info"]["name"] = pool_meta.get("name")
-                                    if pool_meta.get("ticker"):
-                                        metadata["pool_info"]["ticker"] = pool_meta.get("ticker")
-                                elif pool_meta_resp.status_code == 404:
-                                    findings.append("Pool has no metadata - potential privacy pool or new registration")
-                                    risk_score += 0.1
-                                    
-                                # Check for recent pool retirement
-                                if pool_data.get("retiring_epoch"):
-                                    findings.append(f"Pool retiring in epoch {pool_data.get('retiring_epoch')}")
-                                    risk_score += 0.2
-                                    
-                    elif stake_resp.status_code == 404:
-                        findings.append("Stake address not registered on chain")
-                        metadata["stake_registered"] = False
-                else:
-                    findings.append("No stake address associated with this payment address")
-                    
-                # Network-wide stake concentration check (sampling top pools)
-                pools_resp = await client.get(
-                    f"{self.blockfrost_url}/v0/pools?count=10&order=desc",
-                    headers=headers
-                )
+                elif stake_resp.status_code == 404:
+                    findings.append("Stake address not registered on chain")
+                    metadata["stake_registered"] = False
+            else:
+                findings.append("No stake address associated with this payment address")
                 
-                if pools_resp.status_code == 200:
-                    top_pools = pools_resp.json()
-                    # Get stake amounts for top pools
-                    total_top_stake = 0
-                    for pool_id_item in top_pools[:5]:
-                        pool_detail = await client.get(
-                            f"{self.blockfrost_url}/v0/pools/{pool_id_item}",
-                            headers=headers
-                        )
-                        if pool_detail.status_code == 200:
-                            total_top_stake += int(pool_detail.json().get("live_stake", 0))
-                            
-                    if total_top_stake > 0:
-                        metadata["top_5_pools_stake_ada"] = total_top_stake / 1_000_000
+            # Network-wide stake concentration check (sampling top pools)
+            pools_resp = snapshot.top_pools
+            
+            if pools_resp.status_code == 200:
+                top_pools = pools_resp.json()
+                # Get stake amounts for top pools
+                total_top_stake = 0
+                for pool_id_item in top_pools[:5]:
+                    pool_detail = snapshot.top_pool_details[pool_id_item]
+                    if pool_detail.status_code == 200:
+                        total_top_stake += int(pool_detail.json().get("live_stake", 0))
                         
+                if total_top_stake > 0:
+                    metadata["top_5_pools_stake_ada"] = total_top_stake / 1_000_000
+                    
         except httpx.TimeoutException:
             return ScanResult(
                 risk_score=0.2,
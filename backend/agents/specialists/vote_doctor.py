@@ -19,6 +19,10 @@ from enum import Enum
 import nacl.signing
 from nacl.signing import SigningKey
 
+from ..scan_planner import (
+    ACCOUNT, ADDRESS, DREP, EPOCH_PARAMETERS, PROPOSALS, ChainSnapshot, get_scan_planner,
+)
+
 
 class Severity(Enum):
     CRITICAL = "critical"
@@ -56,6 +60,9 @@ class VoteDoctor:
     - Communicates via IACP/2.0 protocol with signed envelopes
     """
     
+    # Chain data this specialist analyzes (see scan_planner)
+    REQUIRES = frozenset({ADDRESS, DREP, ACCOUNT, PROPOSALS, EPOCH_PARAMETERS})
+    
     def __init__(self):
         self.name = "VoteDoctor"
         self.did = "did:masumi:vote_doctor_01"
@@ -115,125 +122,123 @@ class VoteDoctor:
         
         Args:
             address: Cardano address to analyze for governance activity
-            context: Additional context from the scan request
+            context: Additional context from the scan request; a shared
+                `snapshot` (ChainSnapshot) is used instead of fetching
             
         Returns:
             ScanResult with governance analysis findings
         """
+        snapshot = context.get("snapshot") or get_scan_planner().plan(address, self.REQUIRES)
+        await snapshot.wait(self.REQUIRES)
+        return self.analyze(snapshot)
+        
+    def analyze(self, snapshot: ChainSnapshot) -> ScanResult:
+        """
+        Analyze governance-related activity from a prefetched snapshot.
+        
+        Args:
+            snapshot: Chain data covering this specialist's REQUIRES
+            
+        Returns:
+            ScanResult with governance analysis findings
+        """
+        address = snapshot.target
         findings = []
         risk_score = 0.0
         metadata = {"agent": self.name}
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                headers = {"project_id": self.blockfrost_key}
-                
-                # Resolve stake address for governance checks
-                stake_address = None
-                if address.startswith("stake"):
-                    stake_address = address
-                elif address.startswith("addr"):
-                    addr_resp = await client.get(
-                        f"{self.blockfrost_url}/v0/addresses/{address}",
-                        headers=headers
-                    )
-                    if addr_resp.status_code == 200:
-                        stake_address = addr_resp.json().get("stake_address")
-                        
-                if stake_address:
-                    metadata["stake_address"] = stake_address
+            # Resolve stake address for governance checks
+            stake_address = None
+            if address.startswith("stake"):
+                stake_address = address
+            elif address.startswith("addr"):
+                addr_resp = snapshot.address
+                if addr_resp.status_code == 200:
+                    stake_address = addr_resp.json().get("stake_address")
                     
-                    # Check if address is registered as a DRep
-                    drep_resp = await client.get(
-                        f"{self.blockfrost_url}/v0/governance/dreps/{stake_address}",
-                        headers=headers
-                    )
+            if stake_address:
+                metadata["stake_address"] = stake_address
+                
+                # Check if address is registered as a DRep
+                drep_resp = snapshot.drep
+                
+                if drep_resp.status_code == 200:
+                    drep_data = drep_resp.json()
+                    metadata["drep_info"] = {
+                        "is_drep": True,
+                        "drep_id": drep_data.get("drep_id"),
+                        "active": drep_data.get("active", False),
+                        "amount": int(drep_data.get("amount", 0)) / 1_000_000,
+                    }
+                    findings.append(f"Address is registered as DRep with {metadata['drep_info']['amount']:,.0f} ADA voting power")
                     
-                    if drep_resp.status_code == 200:
-                        drep_data = drep_resp.json()
-                        metadata["drep_info"] = {
-                            "is_drep": True,
-                            "drep_id": drep_data.get("drep_id"),
-                            "active": drep_data.get("active", False),
-                            "amount": int(drep_data.get("amount", 0)) / 1_000_000,
-                        }
-                        findings.append(f"Address is registered as DRep with {metadata['drep_info']['amount']:,.0f} ADA voting power")
-                        
-                        # Large DRep voting power could indicate concentration
-                        if metadata["drep_info"]["amount"] > 50_000_000:  # > 50M ADA
-                            findings.append("DRep has significant voting power concentration")
-                            risk_score += 0.25
-                            
-                    elif drep_resp.status_code == 404:
-                        metadata["drep_info"] = {"is_drep": False}
+                    # Large DRep voting power could indicate concentration
+                    if metadata["drep_info"]["amount"] > 50_000_000:  # > 50M ADA
+                        findings.append("DRep has significant voting power concentration")
+                        risk_score += 0.25
                         
-                    # Check DRep delegation for this stake address
-                    account_resp = await client.get(
-                        f"{self.blockfrost_url}/v0/accounts/{stake_address}",
-                        headers=headers
-                    )
+                elif drep_resp.status_code == 404:
+                    metadata["drep_info"] = {"is_drep": False}
                     
-                    if account_resp.status_code == 200:
-                        account_data = account_resp.json()
-                        drep_delegation = account_data.get("drep_id")
-                        
-                        if drep_delegation:
-                            metadata["delegated_to_drep"] = drep_delegation
-                            
-                            # Check if delegated to "Always Abstain" or "Always No Confidence"
-                            if drep_delegation == "drep_always_abstain":
-                                findings.append("Address uses 'Always Abstain' governance delegation")
-                            elif drep_delegation == "drep_always_no_confidence":
-                                findings.append("Address uses 'Always No Confidence' governance delegation")
-                                risk_score += 0.1  # Could indicate dissatisfaction or attack preparation
-                                
-                # Get recent governance actions
-                gov_actions_resp = await client.get(
-                    f"{self.blockfrost_url}/v0/governance/proposals?count=20&order=desc",
-                    headers=headers
-                )
+                # Check DRep delegation for this stake address
+                account_resp = snapshot.account
                 
-                if gov_actions_resp.status_code == 200:
-                    proposals = gov_actions_resp.json()
-                    metadata["recent_proposals_count"] = len(proposals)
+                if account_resp.status_code == 200:
+                    account_data = account_resp.json()
+                    drep_delegation = account_data.get("drep_id")
                     
-                    # Analyze proposal types
-                    action_types = {}
-                    for proposal in proposals:
-                        action_type = proposal.get("governance_type", "unknown")
-                        action_types[action_type] = action_types.get(action_type, 0) + 1
+                    if drep_delegation:
+                        metadata["delegated_to_drep"] = drep_delegation
                         
-                    metadata["proposal_types"] = action_types
-                    
-                    # Check for concerning governance actions
-                    concerning_actions = ["HardForkInitiation", "NoConfidence", "NewConstitution"]
-                    for action_type, count in action_types.items():
-                        if action_type in concerning_actions:
-                            findings.append(f"Active {action_type} proposals detected ({count} total)")
-                            risk_score += 0.15
+                        # Check if delegated to "Always Abstain" or "Always No Confidence"
+                        if drep_delegation == "drep_always_abstain":
+                            findings.append("Address uses 'Always Abstain' governance delegation")
+                        elif drep_delegation == "drep_always_no_confidence":
+                            findings.append("Address uses 'Always No Confidence' governance delegation")
+                            risk_score += 0.1  # Could indicate dissatisfaction or attack preparation
                             
-                    # Check for treasury withdrawal proposals
-                    if "TreasuryWithdrawals" in action_types:
-                        findings.append(f"Treasury withdrawal proposals active: {action_types['TreasuryWithdrawals']}")
-                        risk_score += 0.1
-                        
-                elif gov_actions_resp.status_code == 404:
-                    findings.append("No governance proposals found (may be pre-Conway era)")
+            # Get recent governance actions
+            gov_actions_resp = snapshot.proposals
+            
+            if gov_actions_resp.status_code == 200:
+                proposals = gov_actions_resp.json()
+                metadata["recent_proposals_count"] = len(proposals)
+                
+                # Analyze proposal types
+                action_types = {}
+                for proposal in proposals:
+                    action_type = proposal.get("governance_type", "unknown")
+                    action_types[action_type] = action_types.get(action_type, 0) + 1
                     
-                # Check epoch-level governance parameters
-                epoch_resp = await client.get(
-                    f"{self.blockfrost_url}/v0/epochs/latest/parameters",
-                    headers=headers
-                )
+                metadata["proposal_types"] = action_types
                 
-                if epoch_resp.status_code == 200:
-                    params = epoch_resp.json()
-                    if params.get("drep_deposit"):
-                        metadata["governance_params"] = {
-                            "drep_deposit_ada": int(params.get("drep_deposit", 0)) / 1_000_000,
-                            "gov_action_deposit_ada": int(params.get("gov_action_deposit", 0)) / 1_000_000,
-                        }
+                # Check for concerning governance actions
+                concerning_actions = ["HardForkInitiation", "NoConfidence", "NewConstitution"]
+                for action_type, count in action_types.items():
+                    if action_type in concerning_actions:
+                        findings.append(f"Active {action_type} proposals detected ({count} total)")
+                        risk_score += 0.15
                         
+                # Check for treasury withdrawal proposals
+                if "TreasuryWithdrawals" in action_types:
+                    findings.append(f"Treasury withdrawal proposals active: {action_types['TreasuryWithdrawals']}")
+                    risk_score += 0.1
+                    
+            elif gov_actions_resp.status_code == 404:
+                findings.append("No governance proposals found (may be pre-Conway era)")
+                
+            # Check epoch-level governance parameters
+            epoch_resp = snapshot.epoch_parameters
+            
+            if epoch_resp.status_code == 200:
+                params = epoch_resp.json()
+                if params.get("drep_deposit"):
+                    metadata["governance_params"] = {
+                        "drep_deposit_ada": int(params.get("drep_deposit", 0)) / 1_000_000,
+                        "gov_action_deposit_ada": int(params.get("gov_action_deposit", 0)) / 1_000_000,
+                    }
+                    
         except httpx.TimeoutException:
             return ScanResult(
                 risk_score=0.15,
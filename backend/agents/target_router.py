@@ -0,0 +1,166 @@
+"""
+=============================================================================
+Sentinel Orchestrator Network (SON) - Target Routing
+=============================================================================
+
+Classifies a scan target by parsing it, so the Oracle only dispatches the
+specialists that can say something about that kind of target:
+
+    Target               Recognized as
+    -------------------  ---------------------------------------------------
+    payment address      bech32 `addr` / `addr_test`, Shelley header type 0-7
+    stake address        bech32 `stake` / `stake_test`, header type 14-15
+    transaction hash     64 hex characters, optionally `tx_`-prefixed
+    policy ID            56 hex characters (28-byte script hash)
+    governance action    CIP-129 bech32 `gov_action`, or `<tx hash>#<index>`
+
+Bech32 strings are checksum-verified and their header byte checked, so a
+mistyped address is reported as UNKNOWN (and gets the full specialist set)
+rather than being routed as something it is not.
+
+Usage:
+    from agents.target_router import TargetType, classify_target
+
+    if classify_target(target).type is TargetType.POLICY_ID:
+        ...
+
+=============================================================================
+"""
+
+import re
+from dataclasses import dataclass
+from enum import Enum
+from typing import List, Optional, Tuple
+
+
+# =============================================================================
+# TARGET TYPES
+# =============================================================================
+
+class TargetType(Enum):
+    """Kinds of scan targets the specialists understand."""
+    PAYMENT_ADDRESS = "payment_address"
+    STAKE_ADDRESS = "stake_address"
+    TX_HASH = "tx_hash"
+    POLICY_ID = "policy_id"
+    GOV_ACTION_ID = "gov_action_id"
+    UNKNOWN = "unknown"
+
+
+@dataclass
+class Target:
+    """A classified scan target."""
+    raw: str
+    type: TargetType
+    tx_hash: Optional[str] = None      # Tx hash for TX_HASH and GOV_ACTION_ID
+    action_index: Optional[int] = None  # Index for GOV_ACTION_ID
+
+
+# =============================================================================
+# BECH32
+# =============================================================================
+
+_BECH32_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+_BECH32_GENERATOR = (0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)
+
+
+def _bech32_polymod(values: List[int]) -> int:
+    chk = 1
+    for value in values:
+        top = chk >> 25
+        chk = (chk & 0x1FFFFFF) << 5 ^ value
+        for i in range(5):
+            chk ^= _BECH32_GENERATOR[i] if (top >> i) & 1 else 0
+    return chk
+
+
+def _hrp_expand(hrp: str) -> List[int]:
+    return [ord(c) >> 5 for c in hrp] + [0] + [ord(c) & 31 for c in hrp]
+
+
+def bech32_decode(value: str) -> Optional[Tuple[str, bytes]]:
+    """
+    Decode a bech32 string into (human-readable part, payload bytes).
+
+    Cardano addresses exceed BIP-173's 90 character limit, so no length
+    limit is enforced.
+
+    Returns:
+        (hrp, payload) or None if the string is not valid bech32
+    """
+    if value.lower() != value and value.upper() != value:
+        return None
+    value = value.lower()
+    pos = value.rfind("1")
+    if pos < 1 or pos + 7 > len(value):
+        return None
+    hrp = value[:pos]
+    if any(ord(c) < 33 or ord(c) > 126 for c in hrp):
+        return None
+    try:
+        data = [_BECH32_CHARSET.index(c) for c in value[pos + 1:]]
+    except ValueError:
+        return None
+    if _bech32_polymod(_hrp_expand(hrp) + data) != 1:
+        return None
+
+    # Regroup 5-bit words (minus the 6-word checksum) into bytes
+    acc = bits = 0
+    payload = bytearray()
+    for word in data[:-6]:
+        acc = (acc << 5) | word
+        bits += 5
+        if bits >= 8:
+            bits -= 8
+            payload.append((acc >> bits) & 0xFF)
+    if bits >= 5 or (acc & ((1 << bits) - 1)):
+        return None
+    return hrp, bytes(payload)
+
+
+# =============================================================================
+# CLASSIFICATION
+# =============================================================================
+
+_HEX_RE = re.compile(r"^[0-9a-fA-F]+$")
+_GOV_ACTION_RE = re.compile(r"^([0-9a-fA-F]{64})#(\d+)$")
+
+
+def _is_hex(value: str, length: int) -> bool:
+    return len(value) == length and bool(_HEX_RE.match(value))
+
+
+def classify_target(target: str) -> Target:
+    """
+    Classify a scan target by its encoding.
+
+    Hashes are accepted in either case; `tx_hash` is normalized to
+    lowercase, the form upstream APIs return.
+    """
+    value = (target or "").strip()
+
+    if value.startswith("tx_"):
+        return Target(target, TargetType.TX_HASH, tx_hash=value[3:].lower())
+    if _is_hex(value, 64):
+        return Target(target, TargetType.TX_HASH, tx_hash=value.lower())
+    if _is_hex(value, 56):
+        return Target(target, TargetType.POLICY_ID)
+
+    match = _GOV_ACTION_RE.match(value)
+    if match:
+        return Target(target, TargetType.GOV_ACTION_ID, tx_hash=match.group(1).lower(), action_index=int(match.group(2)))
+
+    decoded = bech32_decode(value)
+    if decoded is None or not decoded[1]:
+        return Target(target, TargetType.UNKNOWN)
+    hrp, payload = decoded
+    header_type = payload[0] >> 4
+
+    if hrp in ("addr", "addr_test") and header_type <= 7:
+        return Target(target, TargetType.PAYMENT_ADDRESS)
+    if hrp in ("stake", "stake_test") and header_type in (14, 15):
+        return Target(target, TargetType.STAKE_ADDRESS)
+    if hrp == "gov_action" and len(payload) in (33, 34):
+        index = int.from_bytes(payload[32:], "big")
+        return Target(target, TargetType.GOV_ACTION_ID, tx_hash=payload[:32].hex(), action_index=index)
+    return Target(target, TargetType.UNKNOWN)
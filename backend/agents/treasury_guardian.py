@@ -12,9 +12,11 @@ import asyncio
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-import httpx
 from dotenv import load_dotenv
 
+from .chain_client import get_chain_client
+from .llm_config import gemini_configure_options
+
 try:
     import google.generativeai as genai
     GEMINI_AVAILABLE = True
@@ -37,7 +39,7 @@ class TreasuryGuardian:
     """
 
     NCL_ANNUAL_CAP = 47_250_000_000_000  # 47.25M ADA in lovelace
-    KOIOS_BASE_URL = "https://api.koios.rest/api/v1"
+    KOIOS_BASE_URL = os.getenv("KOIOS_MAINNET_API_URL", "https://api.koios.rest/api/v1")
 
     TREASURY_ANALYSIS_RULES = """
 CARDANO TREASURY RISK ANALYSIS FRAMEWORK:
@@ -69,16 +71,11 @@ CARDANO TREASURY RISK ANALYSIS FRAMEWORK:
         # Load environment variables
         load_dotenv()
 
-        self.koios_client = httpx.AsyncClient(
-            base_url=self.KOIOS_BASE_URL,
-            headers={"accept": "application/json"}
-        )
-
         # Initialize Gemini
         if GEMINI_AVAILABLE:
             api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
             if api_key:
-                genai.configure(api_key=api_key)
+                genai.configure(api_key=api_key, **gemini_configure_options())
                 self.model = genai.GenerativeModel(
                     'gemini-2.0-flash-exp',
                     generation_config={
@@ -226,7 +223,11 @@ CRITICAL RISK INDICATORS:
                 "limit": "500"
             }
 
-            response = await self.koios_client.get("/tx_info", params=params)
+            response = await get_chain_client().get(
+                f"{self.KOIOS_BASE_URL}/tx_info",
+                params=params,
+                headers={"accept": "application/json"}
+            )
             data = response.json()
 
             # Extract transaction amounts (mock treasury filtering)
@@ -322,5 +323,4 @@ CRITICAL RISK INDICATORS:
         """
 
     async def close(self):
-        """Cleanup resources"""
-        await self.koios_client.aclose()
+        """Cleanup resources (the shared chain client is closed on app shutdown)"""
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+=============================================================================
+Sentinel Orchestrator Network (SON) - End-to-End Scan Benchmark
+=============================================================================
+
+Drives the public scan flow exactly like the frontend does - `POST
+/api/v1/scan`, then wait on `/ws/scan/{task_id}` for the result - at one
+or more concurrency levels, and reports per level:
+
+- throughput (completed scans / second)
+- end-to-end latency p50/p95/p99 (POST sent -> result received)
+- per-stage breakdown: Hydra, compliance, Oracle, each specialist, and
+  the remaining overhead (queueing, signing, WebSocket delivery)
+- upstream calls per scan, by provider (from the simulator's counters)
+
+By default the upstream simulator and the API server are started as
+subprocesses on free ports, so no provider quota is used and runs are
+reproducible (`SIM_*` variables tune the simulator, see
+upstream_simulator.py). Point `--server` / `--simulator` at running
+instances to benchmark a deployment instead.
+
+Usage:
+    python benchmark_scan.py --concurrency 1,8,32 --scans 200 --output bench.json
+
+Results are JSON, so runs can be diffed or plotted over time.
+
+=============================================================================
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import hashlib
+import argparse
+import statistics
+import subprocess
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import httpx
+import websockets
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Server-side stages reported in the scan result (see SentinelAgent.process)
+PIPELINE_STAGES = ("hydra", "compliance", "oracle")
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """Summarize a sample as p50/p95/p99/mean/max (nearest-rank)."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+
+    return {
+        "p50": round(rank(50), 1),
+        "p95": round(rank(95), 1),
+        "p99": round(rank(99), 1),
+        "mean": round(statistics.fmean(ordered), 1),
+        "max": round(ordered[-1], 1),
+        "count": len(ordered),
+    }
+
+
+def make_targets(count: int, tx_ratio: float, seed: int) -> List[str]:
+    """Deterministic mix of policy IDs (56 hex) and tx hashes (64 hex)."""
+    targets = []
+    for i in range(count):
+        digest = hashlib.sha256(f"benchmark:{seed}:{i}".encode()).hexdigest()
+        digest = "a" + digest[1:]  # Never hit the blacklist prefixes
+        is_tx = (i * 7919 % 1000) / 1000 < tx_ratio
+        targets.append(digest if is_tx else digest[:56])
+    return targets
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_up(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                await client.get(url, timeout=1.0)
+                return
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+                await asyncio.sleep(0.2)
+
+
+def start_uvicorn(app: str, port: int, env: Dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def simulator_env(simulator_url: str) -> Dict[str, str]:
+    """Point every upstream of the API server at the simulator."""
+    return {
+        "BLOCKFROST_API_URL": f"{simulator_url}/blockfrost/preprod/api",
+        "BLOCKFROST_API_KEY": "simulated",
+        "KOIOS_API_URL": f"{simulator_url}/koios/preprod/api/v1",
+        "KOIOS_MAINNET_API_URL": f"{simulator_url}/koios/mainnet/api/v1",
+        "IPFS_GATEWAYS": f"{simulator_url}/ipfs/",
+        "GEMINI_API_ENDPOINT": simulator_url,
+        "CHAIN_HTTP2": "false",
+    }
+
+
+# =============================================================================
+# SCAN DRIVER
+# =============================================================================
+
+async def run_scan(client: httpx.AsyncClient, ws_url: str, target: str, timeout: float) -> Dict[str, Any]:
+    """Submit one scan and wait for its result on the WebSocket."""
+    started = time.perf_counter()
+    resp = await client.post("/api/v1/scan", json={"policy_id": target})
+    accepted = time.perf_counter()
+    resp.raise_for_status()
+    task_id = resp.json()["task_id"]
+
+    async with websockets.connect(f"{ws_url}/ws/scan/{task_id}", max_size=None) as ws:
+        async with asyncio.timeout(timeout):
+            while True:
+                message = json.loads(await ws.recv())
+                payload = message.get("payload", {})
+                if payload.get("task_id") == task_id and payload.get("status") in ("completed", "failed"):
+                    break
+
+    return {
+        "latency_ms": (time.perf_counter() - started) * 1000,
+        "accept_ms": (accepted - started) * 1000,
+        "payload": payload,
+    }
+
+
+async def run_level(
+    base_url: str,
+    simulator_url: Optional[str],
+    targets: List[str],
+    concurrency: int,
+    timeout: float,
+) -> Dict[str, Any]:
+    """Run all targets through `concurrency` parallel clients."""
+    ws_url = "ws" + base_url[len("http"):]
+    queue: asyncio.Queue = asyncio.Queue()
+    for target in targets:
+        queue.put_nowait(target)
+
+    scans: List[Dict[str, Any]] = []
+    errors: Counter = Counter()
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+        if simulator_url:
+            await client.post(f"{simulator_url}/_sim/reset")
+
+        async def worker() -> None:
+            while not queue.empty():
+                target = queue.get_nowait()
+                try:
+                    scans.append(await run_scan(client, ws_url, target, timeout))
+                except Exception as e:
+                    errors[type(e).__name__] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        duration = time.perf_counter() - started
+
+        upstream = None
+        if simulator_url:
+            upstream = (await client.get(f"{simulator_url}/_sim/stats")).json()
+
+    return summarize(concurrency, scans, errors, duration, upstream)
+
+
+def summarize(
+    concurrency: int,
+    scans: List[Dict[str, Any]],
+    errors: Counter,
+    duration: float,
+    upstream: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Reduce raw scan records to the reported metrics."""
+    completed = [s for s in scans if s["payload"].get("status") == "completed"]
+    stages: Dict[str, List[float]] = defaultdict(list)
+    verdicts: Counter = Counter()
+
+    for scan in completed:
+        payload = scan["payload"]
+        verdicts[payload.get("verdict")] += 1
+        timings = payload.get("timings") or {}
+        for stage in PIPELINE_STAGES:
+            if stage in timings:
+                stages[stage].append(timings[stage])
+        oracle_timings = (payload.get("oracle_result") or {}).get("timings") or {}
+        for specialist, ms in oracle_timings.items():
+            stages[f"specialist.{specialist}"].append(ms)
+        stages["overhead"].append(scan["latency_ms"] - sum(timings.get(s, 0.0) for s in PIPELINE_STAGES))
+
+    level: Dict[str, Any] = {
+        "concurrency": concurrency,
+        "scans": len(scans) + sum(errors.values()),
+        "completed": len(completed),
+        "failed": len(scans) - len(completed) + sum(errors.values()),
+        "errors": dict(errors),
+        "duration_s": round(duration, 3),
+        "throughput_per_s": round(len(completed) / duration, 2) if duration > 0 else 0.0,
+        "latency_ms": percentiles([s["latency_ms"] for s in completed]),
+        "accept_latency_ms": percentiles([s["accept_ms"] for s in scans]),
+        "stages_ms": {stage: percentiles(values) for stage, values in sorted(stages.items())},
+        "verdicts": dict(verdicts),
+    }
+    if upstream is not None and completed:
+        level["upstream_calls_per_scan"] = {
+            "total": round(upstream["total"] / len(completed), 2),
+            **{p: round(n / len(completed), 2) for p, n in upstream["providers"].items()},
+        }
+    return level
+
+
+# =============================================================================
+# ENTRY POINT
+# =============================================================================
+
+async def main(args: argparse.Namespace) -> Dict[str, Any]:
+    processes: List[subprocess.Popen] = []
+    simulator_url = args.simulator
+    base_url = args.server
+    try:
+        if not base_url and not simulator_url:
+            port = free_port()
+            processes.append(start_uvicorn("upstream_simulator:app", port, {}))
+            simulator_url = f"http://127.0.0.1:{port}"
+            await wait_until_up(f"{simulator_url}/_sim/stats")
+        if not base_url:
+            port = free_port()
+            processes.append(start_uvicorn("main:app", port, simulator_env(simulator_url)))
+            base_url = f"http://127.0.0.1:{port}"
+            await wait_until_up(f"{base_url}/")
+
+        targets = make_targets(args.scans, args.tx_ratio, args.seed)
+        if args.warmup:
+            await run_level(base_url, None, targets[:args.warmup], min(args.warmup, 4), args.timeout)
+
+        levels = []
+        for concurrency in args.concurrency:
+            level = await run_level(base_url, simulator_url, targets, concurrency, args.timeout)
+            levels.append(level)
+            latency = level["latency_ms"]
+            print(
+                f"concurrency={concurrency:>4}  {level['throughput_per_s']:>7.2f} scans/s  "
+                f"p50={latency.get('p50', 0):>8.1f}ms  p95={latency.get('p95', 0):>8.1f}ms  "
+                f"p99={latency.get('p99', 0):>8.1f}ms  failed={level['failed']}",
+                file=sys.stderr,
+            )
+
+        return {
+            "benchmark": "scan_end_to_end",
+            "started_at": datetime.utcnow().isoformat() + "Z",
+            "server": base_url,
+            "simulator": simulator_url,
+            "config": {
+                "scans_per_level": args.scans,
+                "tx_ratio": args.tx_ratio,
+                "seed": args.seed,
+                "timeout_s": args.timeout,
+                "simulator_env": {k: v for k, v in os.environ.items() if k.startswith("SIM_")},
+            },
+            "levels": levels,
+        }
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="End-to-end SON scan benchmark")
+    parser.add_argument("--concurrency", default="1,8,32",
+                        type=lambda v: [int(c) for c in v.split(",")],
+                        help="Comma-separated concurrency levels (default: 1,8,32)")
+    parser.add_argument("--scans", type=int, default=100, help="Scans per concurrency level")
+    parser.add_argument("--tx-ratio", type=float, default=0.5,
+                        help="Fraction of targets that are tx hashes (rest are policy IDs)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the target mix")
+    parser.add_argument("--warmup", type=int, default=8, help="Unmeasured warm-up scans")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-scan timeout in seconds")
+    parser.add_argument("--server", help="Benchmark a running API server instead of starting one")
+    parser.add_argument("--simulator", help="Upstream simulator URL (for upstream call counts)")
+    parser.add_argument("--output", help="Write JSON results here (default: stdout)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    results = asyncio.run(main(arguments))
+    report = json.dumps(results, indent=2)
+    if arguments.output:
+        with open(arguments.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
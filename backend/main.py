@@ -1,10 +1,16 @@
-from fastapi import FastAPI, WebSocket, HTTPException, BackgroundTasks
+from fastapi import FastAPI, WebSocket, HTTPException, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from typing import Dict, List, Any, Optional
 from pydantic import BaseModel
-from fpdf import FPDF
-from message_bus import MessageBus
+from message_bus import MessageBus, TOPIC_LOGS, did_topic, task_topic, type_topic
+from result_store import HistoryFilter, get_result_store, close_result_store
+from report_renderer import get_report_renderer, close_report_renderer
 from agents import SentinelAgent, OracleAgent
+from agents.chain_client import get_chain_client, close_chain_client
+from agents.koios_batcher import get_koios_batcher
+from agents.network_router import get_network_cache
+from agents.rate_governor import Priority, upstream_priority
 from agents.specialists import (
     BlockScanner, StakeAnalyzer, VoteDoctor,
     MempoolSniffer, ReplayDetector
@@ -18,8 +24,7 @@ import uuid
 import logging
 import json
 import base64
-from datetime import datetime
-import asyncio
+from datetime import datetime, timezone
 
 # Initialize Logging
 logging.basicConfig(level=logging.INFO)
@@ -39,8 +44,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Scan history pagination
 )
 
+# Governance analysis yields upstream capacity to interactive wallet scans
+BACKGROUND_PATH_PREFIXES = ("/api/v1/governance", "/api/v1/treasury", "/api/v1/drep")
+
+
+@app.middleware("http")
+async def assign_upstream_priority(request, call_next):
+    """Run governance requests in the background upstream rate-limit lane."""
+    if request.url.path.startswith(BACKGROUND_PATH_PREFIXES):
+        with upstream_priority(Priority.BACKGROUND):
+            return await call_next(request)
+    return await call_next(request)
+
 # Initialize MessageBus
 message_bus = MessageBus()
 
@@ -52,8 +70,8 @@ message_bus = MessageBus()
 sentinel = SentinelAgent(enable_llm=True, enable_hydra=True)
 oracle = OracleAgent(enable_llm=True)
 
-# In-memory store for scan results (for reports/proofs)
-results_store: Dict[str, Any] = {}
+# Durable store for scan results (for reports/proofs): LRU over SQLite
+results_store = get_result_store()
 
 # Connect agents to each other
 sentinel.set_oracle(oracle)
@@ -154,9 +172,8 @@ async def run_sentinel_scan(policy_id: str, user_tip: int, task_id: str):
     Publishes results to MessageBus for WebSocket clients.
     """
     try:
-        # Wait for client to connect via WebSocket
-        await asyncio.sleep(1.0)
-        
+        # No need to wait for the client: events are buffered per task and
+        # replayed when it connects to /ws/scan/{task_id}
         logger.info(f"[{task_id}] Starting Sentinel scan for policy: {policy_id[:16]}...")
         
         # Prepare scan request for Sentinel agent
@@ -170,7 +187,7 @@ async def run_sentinel_scan(policy_id: str, user_tip: int, task_id: str):
         result = await sentinel.process(scan_request)
         
         # Store result for report/proof retrieval
-        results_store[task_id] = result
+        await results_store.aput(task_id, result)
         
         # Build response envelope for MessageBus
         response_envelope = {
@@ -185,6 +202,7 @@ async def run_sentinel_scan(policy_id: str, user_tip: int, task_id: str):
                 "oracle_result": result.get("oracle_result"),
                 "evidence_hash": result.get("evidence_hash"),
                 "timestamp": result.get("timestamp"),
+                "timings": result.get("timings"),
                 "status": "completed"
             }
         }
@@ -214,6 +232,26 @@ async def run_sentinel_scan(policy_id: str, user_tip: int, task_id: str):
         await message_bus.publish(signed_error)
 
 
+# =============================================================================
+# APPLICATION LIFECYCLE
+# =============================================================================
+
+@app.on_event("startup")
+async def startup():
+    """Pre-warm the shared chain-data connection pool and report renderers."""
+    await get_chain_client().warm_up()
+    await get_report_renderer().warm_up()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop WebSocket writers and report renderers, close upstream connections and the result store."""
+    await message_bus.close()
+    close_report_renderer()
+    await close_chain_client()
+    close_result_store()
+
+
 # =============================================================================
 # API ENDPOINTS
 # =============================================================================
@@ -265,63 +303,56 @@ async def scan(request: ScanRequest, background_tasks: BackgroundTasks):
 
 @app.get("/api/v1/report/{task_id}")
 async def get_audit_report(task_id: str):
-    """Generate and return a detailed audit report in PDF format."""
-    if task_id not in results_store:
-        raise HTTPException(status_code=404, detail="Task ID not found")
-    
-    result = results_store[task_id]
-    
-    # Create PDF
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-    
-    # Header
-    pdf.set_font("Arial", "B", 16)
-    pdf.cell(200, 10, txt="Sentinel Orchestrator Network - Audit Report", ln=1, align="C")
-    pdf.ln(10)
-    
-    # Metadata
-    pdf.set_font("Arial", size=12)
-    pdf.cell(200, 10, txt=f"Report ID: AUDIT-{task_id[:8].upper()}", ln=1)
-    pdf.cell(200, 10, txt=f"Timestamp: {datetime.utcnow().isoformat()}Z", ln=1)
-    pdf.cell(200, 10, txt=f"Verdict: {result.get('verdict')}", ln=1)
-    pdf.cell(200, 10, txt=f"Risk Score: {result.get('risk_score')}", ln=1)
-    pdf.ln(10)
-    
-    # Details
-    pdf.set_font("Arial", "B", 14)
-    pdf.cell(200, 10, txt="Analysis Details", ln=1)
-    pdf.set_font("Arial", size=12)
-    pdf.multi_cell(0, 10, txt=f"Reason: {result.get('reason')}")
-    pdf.ln(5)
-    
-    pdf.cell(200, 10, txt=f"Policy ID: {result.get('policy_id')}", ln=1)
-    pdf.cell(200, 10, txt=f"Hydra Verification: Enabled", ln=1)
-    
-    # Footer
-    pdf.ln(20)
-    pdf.set_font("Arial", "I", 10)
-    pdf.cell(200, 10, txt="Signed by: did:masumi:sentinel_01", ln=1, align="R")
+    """
+    Return the audit report for a scan in PDF format.
     
-    # Output
-    # In fpdf2, output() returns bytearray by default if no name provided
-    pdf_bytes = bytes(pdf.output())
+    Rendered in a worker process and cached by content hash, so downloads
+    never block live verdict delivery and repeat downloads are instant.
+    """
+    result = await results_store.aget(task_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Task ID not found")
     
-    logger.info(f"Generated PDF report for {task_id}: {len(pdf_bytes)} bytes")
+    pdf_bytes = await get_report_renderer().render(task_id, result)
     
     return Response(content=pdf_bytes, media_type="application/pdf", headers={
         "Content-Disposition": f"attachment; filename=AUDIT-{task_id[:8]}.pdf"
     })
 
+@app.get("/api/v1/reports/bundle")
+async def get_audit_report_bundle(request: Request):
+    """
+    Stream the audit reports for several scans as one ZIP archive.
+    
+    Pass the scans as repeated `task_id` query parameters (at most 500).
+    Reports render in parallel and are streamed as each one completes.
+    """
+    task_ids = list(dict.fromkeys(request.query_params.getlist("task_id")))
+    if not task_ids:
+        raise HTTPException(status_code=400, detail="At least one task_id is required")
+    if len(task_ids) > 500:
+        raise HTTPException(status_code=400, detail="At most 500 reports per bundle")
+    
+    reports = []
+    for task_id in task_ids:
+        result = await results_store.aget(task_id)
+        if result is None:
+            raise HTTPException(status_code=404, detail=f"Task ID not found: {task_id}")
+        reports.append((task_id, result))
+    
+    return StreamingResponse(
+        get_report_renderer().stream_bundle(reports),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename=AUDIT-BUNDLE-{len(reports)}.zip"},
+    )
+
 @app.get("/api/v1/proof/{task_id}")
 async def get_cryptographic_proof(task_id: str):
     """Return cryptographic proofs and signatures for the scan."""
-    if task_id not in results_store:
+    result = await results_store.aget(task_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Task ID not found")
     
-    result = results_store[task_id]
-    
     # Construct proof object
     proof = {
         "proof_id": f"PROOF-{task_id[:8].upper()}",
@@ -362,20 +393,79 @@ async def get_system_status():
         "active_agents": 3
     }
 
+@app.get("/api/v1/system/upstream")
+async def get_upstream_status():
+    """Return chain-data client counters: rate governor queues, cache, batching."""
+    return {
+        "chain_client": get_chain_client().get_stats(),
+        "koios_batcher": get_koios_batcher().get_stats(),
+        "network_cache": get_network_cache().get_stats(),
+        "timestamp": datetime.utcnow().isoformat() + "Z"
+    }
+
+@app.get("/api/v1/messages")
+async def get_messages(request: Request, limit: int = 20, before: Optional[int] = None):
+    """
+    Backfill recent MessageBus envelopes, oldest first.
+    
+    Filter with one of `task=<task_id>`, `did=<agent DID>` or
+    `type=<message type>` (default: the global log feed). Pass the
+    returned `next_before` as `before` to page further back.
+    """
+    topics = _topics_from_params(request.query_params)
+    if len(topics) > 1:
+        raise HTTPException(status_code=400, detail="Filter by at most one of task, did, type")
+    frames, cursor = message_bus.query_history(
+        topics[0] if topics else TOPIC_LOGS, max(1, min(limit, 500)), before
+    )
+    # Envelopes are stored pre-encoded; splice them in without re-serializing
+    body = '{"messages":[' + ",".join(frames) + '],"next_before":' + json.dumps(cursor) + "}"
+    return Response(content=body, media_type="application/json")
+
 @app.get("/api/v1/scans/history")
-async def get_scan_history():
-    """Return recent scan history."""
-    history = []
-    for task_id, result in results_store.items():
-        history.append({
-            "task_id": task_id,
-            "policy_id": result.get("policy_id"),
-            "verdict": result.get("verdict"),
-            "timestamp": result.get("timestamp"),
-            "risk_score": result.get("risk_score")
-        })
-    # Sort by timestamp desc
-    return sorted(history, key=lambda x: x.get("timestamp", ""), reverse=True)
+async def get_scan_history(
+    response: Response,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    verdict: Optional[str] = None,
+    policy_prefix: Optional[str] = None,
+    min_risk: Optional[float] = None,
+    max_risk: Optional[float] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+):
+    """
+    Return recent scan history, newest first, one page at a time.
+    
+    Filters: `verdict`, `policy_prefix`, `min_risk` / `max_risk` and a
+    `since` / `until` window (ISO 8601). When more rows exist, the
+    `X-Next-Cursor` response header holds the `cursor` for the next page.
+    """
+    try:
+        filters = HistoryFilter(
+            verdict=verdict.upper() if verdict else None,
+            policy_prefix=policy_prefix,
+            min_risk=min_risk,
+            max_risk=max_risk,
+            since=_parse_timestamp(since),
+            until=_parse_timestamp(until),
+        )
+        history, next_cursor = await results_store.ahistory(max(1, min(limit, 500)), cursor, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return history
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """ISO 8601 query parameter -> Unix seconds (naive times are UTC)."""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
 
 @app.get("/api/v1/agents/info")
 async def agents_info():
@@ -858,15 +948,26 @@ async def drep_consensus(request: Dict[str, Any]):
 # WEBSOCKET ENDPOINT FOR REAL-TIME RESULTS
 # =============================================================================
 
+def _topics_from_params(params) -> List[str]:
+    """MessageBus topics selected by task/did/type query parameters."""
+    return (
+        [task_topic(t) for t in params.getlist("task")]
+        + [did_topic(d) for d in params.getlist("did")]
+        + [type_topic(t) for t in params.getlist("type")]
+    )
+
+
 @app.websocket("/ws/scan/{task_id}")
 async def websocket_scan(websocket: WebSocket, task_id: str):
     """
     WebSocket endpoint to receive real-time scan results.
     
     Clients connect with: ws://localhost:8000/ws/scan/{task_id}
-    Server publishes results when Sentinel completes the scan.
+    Server publishes results when Sentinel completes the scan; only this
+    task's events are sent, and those published before the client
+    connected are replayed first.
     """
-    await message_bus.connect(websocket)
+    await message_bus.connect(websocket, task_id=task_id)
     logger.info(f"Client connected to scan results: {task_id}")
     
     try:
@@ -886,8 +987,19 @@ async def websocket_logs(websocket: WebSocket):
     """
     General WebSocket endpoint for agent activity logs.
     Broadcasts all agent events.
+    
+    The feed can be narrowed with repeatable query parameters, e.g.
+    ws://localhost:8000/ws/logs?did=did:masumi:oracle_01&type=SCAN_RESPONSE
+    (also `task=<task_id>`); only matching events are sent. Add
+    `backfill=N` to first receive the last N matching events from history.
     """
-    await message_bus.connect(websocket)
+    try:
+        backfill = int(websocket.query_params.get("backfill", 0))
+    except ValueError:
+        backfill = 0
+    await message_bus.connect(
+        websocket, topics=_topics_from_params(websocket.query_params), backfill=backfill
+    )
     logger.info("Client connected to activity logs")
     
     try:
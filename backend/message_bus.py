@@ -1,6 +1,13 @@
+import asyncio
+import base64
 import logging
 import json
-from typing import Dict, List, Any, Optional
+import os
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Dict, Iterable, List, Any, Optional, Set, Tuple
 from fastapi import WebSocket, WebSocketDisconnect
 from nacl.signing import VerifyKey
 from nacl.exceptions import BadSignatureError
@@ -10,6 +17,266 @@ from datetime import datetime
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Per-task event buffer: events published for a scan are kept so a client
+# that opens /ws/scan/{task_id} after they were sent still receives them.
+TASK_BUFFER_TTL = float(os.getenv("MESSAGE_BUS_TASK_BUFFER_TTL", "300"))
+TASK_BUFFER_MAX_TASKS = int(os.getenv("MESSAGE_BUS_TASK_BUFFER_MAX_TASKS", "1000"))
+TASK_BUFFER_MAX_EVENTS = 50
+
+# Per-connection outbound queue: each client gets its own writer task, so a
+# slow browser only ever delays itself.
+SEND_QUEUE_SIZE = int(os.getenv("MESSAGE_BUS_SEND_QUEUE_SIZE", "256"))
+OVERFLOW_POLICY = os.getenv("MESSAGE_BUS_OVERFLOW_POLICY", "drop_oldest")
+
+# Signature verification runs in a worker pool, one hop per batch of
+# envelopes published in the same event-loop iteration.
+VERIFY_WORKERS = int(os.getenv("MESSAGE_BUS_VERIFY_WORKERS", "2"))
+VERIFY_BATCH_MAX = 64
+
+# Envelopes kept (pre-encoded) for dashboard backfill and history queries
+HISTORY_SIZE = int(os.getenv("MESSAGE_BUS_HISTORY_SIZE", "1000"))
+
+# Subscription topics. Every published envelope is delivered on the global
+# log feed plus the task, sender/recipient DID and message type it carries.
+TOPIC_LOGS = "logs"
+
+
+def task_topic(task_id: str) -> str:
+    return f"task:{task_id}"
+
+
+def did_topic(did: str) -> str:
+    return f"did:{did}"
+
+
+def type_topic(message_type: str) -> str:
+    return f"type:{message_type}"
+
+
+def message_topics(envelope: Dict[str, Any]) -> List[str]:
+    """Topics an envelope is published on."""
+    topics = [TOPIC_LOGS]
+    payload = envelope.get("payload")
+    if isinstance(payload, dict) and payload.get("task_id"):
+        topics.append(task_topic(payload["task_id"]))
+    for key in ("from_did", "to_did"):
+        if envelope.get(key):
+            topics.append(did_topic(envelope[key]))
+    if envelope.get("type"):
+        topics.append(type_topic(envelope["type"]))
+    return topics
+
+
+def encode_frame(envelope: Dict[str, Any]) -> str:
+    """
+    Serialize an envelope into a WebSocket text frame, once per publish.
+    
+    Same encoding as Starlette's `send_json`, so clients see identical
+    frames; the result is shared by every subscriber and the replay buffer.
+    """
+    return json.dumps(envelope, separators=(",", ":"), ensure_ascii=False)
+
+
+def verify_envelopes(batch: List[Tuple[Dict[str, Any], VerifyKey]]) -> List[Optional[Exception]]:
+    """
+    Check the Ed25519 signatures of a batch of envelopes (worker thread).
+    
+    Each envelope is canonicalized (all fields but `signature`, sorted
+    keys, compact separators) exactly as the agents sign it.
+    
+    Returns:
+        Per envelope: None if the signature is valid, else the error
+    """
+    results: List[Optional[Exception]] = []
+    for envelope, verify_key in batch:
+        try:
+            message = {k: v for k, v in envelope.items() if k != "signature"}
+            message_bytes = json.dumps(
+                message, sort_keys=True, separators=(',', ':')
+            ).encode('utf-8')
+            verify_key.verify(message_bytes, base64.b64decode(envelope.get("signature")))
+            results.append(None)
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+class OverflowPolicy(Enum):
+    """What a connection does when its send queue is full."""
+    DROP_OLDEST = "drop_oldest"  # Discard the oldest queued message
+    COALESCE = "coalesce"        # Newer event for a task replaces its queued one
+    DISCONNECT = "disconnect"    # Close the connection (client reconnects + replays)
+
+
+class ClientConnection:
+    """
+    A WebSocket client with a bounded outbound queue drained by its own
+    writer task.
+    
+    `enqueue` never blocks and is O(1): the queue is an insertion-ordered
+    dict, so dropping the oldest entry and (for COALESCE) replacing a
+    task's queued event in place are both constant time.
+    """
+    
+    def __init__(
+        self,
+        websocket: WebSocket,
+        on_close,
+        max_queue: int = SEND_QUEUE_SIZE,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+    ):
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.policy = policy
+        self.dropped = 0
+        # Messages with a higher sequence number than this are delivered
+        # live; older ones were covered by the replay at connect time
+        self.after_seq = 0
+        self.topics: Set[str] = set()
+        
+        self._on_close = on_close
+        self._queue: "OrderedDict[Any, str]" = OrderedDict()
+        self._ready = asyncio.Event()
+        self._overflowed = False
+        self._writer = asyncio.get_running_loop().create_task(self._write_loop())
+
+    def enqueue(self, seq: int, message: Dict[str, Any], frame: str):
+        """Queue a message's pre-encoded frame, applying the overflow policy."""
+        key: Any = seq
+        if self.policy is OverflowPolicy.COALESCE:
+            payload = message.get("payload")
+            task_id = payload.get("task_id") if isinstance(payload, dict) else None
+            if task_id:
+                key = (task_id, message.get("type"))
+        
+        if key in self._queue:
+            self._queue[key] = frame  # Coalesced: keeps its queue position
+            self.dropped += 1
+        else:
+            self._queue[key] = frame
+            if len(self._queue) > self.max_queue:
+                self._overflow()
+        self._ready.set()
+
+    def _overflow(self):
+        if self.dropped == 0:
+            logger.warning(
+                f"WebSocket client send queue full ({self.max_queue}); policy: {self.policy.value}"
+            )
+        if self.policy is OverflowPolicy.DISCONNECT:
+            self._overflowed = True
+            self.dropped += len(self._queue)
+            self._queue.clear()
+            self._on_close(self.websocket)  # Unregisters and stops the writer
+        else:
+            self._queue.popitem(last=False)
+            self.dropped += 1
+
+    async def _write_loop(self):
+        try:
+            while True:
+                await self._ready.wait()
+                if not self._queue:
+                    self._ready.clear()
+                    continue
+                _, frame = self._queue.popitem(last=False)
+                await self.websocket.send_text(frame)
+        except asyncio.CancelledError:
+            if self._overflowed:
+                # 1013 = try again later; the client reconnects and is
+                # resynchronized from the per-task event buffer
+                try:
+                    await asyncio.wait_for(self.websocket.close(code=1013), timeout=5.0)
+                except Exception:
+                    pass
+            raise
+        except Exception as e:
+            logger.error(f"Failed to send to client: {e}")
+        self._on_close(self.websocket)
+
+    def close(self):
+        """Stop the writer task (the socket itself is owned by the endpoint)."""
+        if self._writer is not asyncio.current_task():
+            self._writer.cancel()
+
+
+class MessageHistory:
+    """
+    Fixed-capacity ring buffer of published envelopes with per-topic indexes.
+    
+    Each entry keeps the envelope and its pre-encoded frame. Appending is
+    O(1) when sequence numbers are contiguous: the evicted entry is then
+    the oldest, at the left of each of its topics' index deques. (Seqs
+    broadcast without being recorded leave gaps; an evicted entry is then
+    removed from the middle of its deques.) Querying the last N messages
+    on a topic (task, sender/recipient DID, type, or the global log feed)
+    is O(N) and never scans the whole buffer.
+    """
+    
+    def __init__(self, capacity: int = HISTORY_SIZE):
+        self.capacity = max(1, capacity)
+        # seq % capacity -> (seq, envelope, frame, topics, timestamp)
+        self._slots: List[Optional[Tuple[int, Dict[str, Any], str, List[str], str]]] = [None] * self.capacity
+        # topic -> seqs of buffered entries on that topic, oldest first
+        self._index: Dict[str, deque] = {}
+
+    def __len__(self) -> int:
+        return len(self._index.get(TOPIC_LOGS, ()))
+
+    def append(self, seq: int, envelope: Dict[str, Any], frame: str):
+        """Store a published envelope, evicting the oldest when full."""
+        slot = seq % self.capacity
+        evicted = self._slots[slot]
+        if evicted is not None:
+            evicted_seq, _, _, evicted_topics, _ = evicted
+            for topic in evicted_topics:
+                seqs = self._index[topic]
+                if seqs and seqs[0] == evicted_seq:
+                    seqs.popleft()
+                elif evicted_seq in seqs:
+                    seqs.remove(evicted_seq)
+                if not seqs:
+                    del self._index[topic]
+        
+        topics = message_topics(envelope)
+        timestamp = envelope.get("timestamp") or datetime.utcnow().isoformat() + "Z"
+        self._slots[slot] = (seq, envelope, frame, topics, timestamp)
+        for topic in topics:
+            self._index.setdefault(topic, deque()).append(seq)
+
+    def query(
+        self,
+        topic: str = TOPIC_LOGS,
+        limit: int = 20,
+        before_seq: Optional[int] = None,
+    ) -> List[Tuple[int, Dict[str, Any], str, str]]:
+        """
+        Get the last `limit` entries on a topic, oldest first.
+        
+        Args:
+            topic: Topic to read (see `message_topics`)
+            limit: Maximum number of entries
+            before_seq: Only entries older than this sequence number
+                (for paging backwards)
+            
+        Returns:
+            List of (seq, envelope, frame, timestamp)
+        """
+        seqs = self._index.get(topic)
+        if not seqs or limit <= 0:
+            return []
+        
+        entries = []
+        for seq in reversed(seqs):
+            if before_seq is not None and seq >= before_seq:
+                continue
+            entry_seq, envelope, frame, _, timestamp = self._slots[seq % self.capacity]
+            entries.append((entry_seq, envelope, frame, timestamp))
+            if len(entries) >= limit:
+                break
+        entries.reverse()
+        return entries
+
 
 class MessageBus:
     """
@@ -20,18 +287,47 @@ class MessageBus:
     - Cryptographic signature verification (IACP/2.0 protocol)
     - WebSocket broadcasting for real-time client updates
     - Message envelope validation and routing
+    - Per-task event replay for late WebSocket subscribers
+    - Per-connection send queues: publishing never waits on a client
+    - Topic subscriptions (task, agent DID, message type, global log feed)
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        send_queue_size: int = SEND_QUEUE_SIZE,
+        overflow_policy: str = OVERFLOW_POLICY,
+        history_size: int = HISTORY_SIZE,
+    ):
         # Registry mapping Agent DIDs (strings) to Ed25519 Public Keys (base64 strings)
         self.registry: Dict[str, str] = {}
+        # Decoded keys, built once at registration
+        self.verify_keys: Dict[str, VerifyKey] = {}
+        
+        # Signature checks waiting for the next batch, and the pool running them
+        self._pending_verifications: List[Tuple[Dict[str, Any], VerifyKey, asyncio.Future]] = []
+        self._verify_executor = ThreadPoolExecutor(
+            max_workers=VERIFY_WORKERS, thread_name_prefix="son-verify"
+        )
+        
+        # Active WebSocket connections and their send queues
+        self.active_connections: Dict[WebSocket, ClientConnection] = {}
+        self.send_queue_size = send_queue_size
+        self.overflow_policy = OverflowPolicy(overflow_policy)
+        
+        # Topic -> subscribed connections, so a publish only touches
+        # interested sockets
+        self.subscribers: Dict[str, Set[ClientConnection]] = {}
+        
+        # Published messages awaiting fan-out, tagged with a sequence number
+        self._outbox: Optional[asyncio.Queue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._seq = 0
         
-        # Active WebSocket connections
-        self.active_connections: List[WebSocket] = []
+        # Recent envelopes, indexed by topic, for backfill and debugging
+        self.history = MessageHistory(history_size)
         
-        # Message history (optional, for debugging)
-        self.message_history: List[Dict[str, Any]] = []
-        self.max_history = 100
+        # task_id -> (last event time, [(seq, envelope, frame)]), oldest task first
+        self.task_events: "OrderedDict[str, Tuple[float, List[Tuple[int, Dict[str, Any], str]]]]" = OrderedDict()
         
         logger.info("MessageBus initialized")
 
@@ -39,18 +335,92 @@ class MessageBus:
     # CONNECTION MANAGEMENT
     # =========================================================================
 
-    async def connect(self, websocket: WebSocket):
-        """Accept and register a new WebSocket connection."""
+    async def connect(
+        self,
+        websocket: WebSocket,
+        task_id: Optional[str] = None,
+        topics: Optional[Iterable[str]] = None,
+        backfill: int = 0,
+    ):
+        """
+        Accept and register a new WebSocket connection.
+        
+        Args:
+            websocket: The connection to register
+            task_id: Subscribe to this task's events; those already
+                published are replayed (in order) before live ones
+            topics: Additional topics to subscribe to. Without a task or
+                topics, the connection gets the global log feed.
+            backfill: Also replay up to this many of the most recent
+                history entries on the subscribed topics
+        """
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self._ensure_dispatcher()
+        
+        connection = ClientConnection(
+            websocket, self.disconnect, self.send_queue_size, self.overflow_policy
+        )
+        topics = set(topics or ())
+        if task_id:
+            topics.add(task_topic(task_id))
+        topics = topics or {TOPIC_LOGS}
+        
+        # Replay and registration happen without yielding to the loop, so
+        # every event is delivered exactly once: buffered ones via replay,
+        # later ones via the dispatcher
+        replay: Dict[int, Tuple[Dict[str, Any], str]] = {}
+        if backfill > 0:
+            for topic in topics:
+                for seq, envelope, frame, _ in self.history.query(topic, backfill):
+                    replay[seq] = (envelope, frame)
+            for seq in sorted(replay)[:-backfill]:
+                del replay[seq]
+        if task_id:
+            for seq, envelope, frame in self._task_events(task_id):
+                replay[seq] = (envelope, frame)
+        for seq in sorted(replay):
+            connection.enqueue(seq, *replay[seq])
+        
+        connection.after_seq = self._seq
+        self.active_connections[websocket] = connection
+        for topic in topics:
+            self.subscribe_topic(websocket, topic)
         logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
 
     def disconnect(self, websocket: WebSocket):
         """Unregister a closed WebSocket connection."""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        connection = self.active_connections.pop(websocket, None)
+        if connection is not None:
+            for topic in list(connection.topics):
+                self.unsubscribe_topic(websocket, topic, connection)
+            connection.close()
             logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
 
+    def subscribe_topic(self, websocket: WebSocket, topic: str):
+        """Deliver messages published on `topic` to a connection."""
+        connection = self.active_connections.get(websocket)
+        if connection is None:
+            return
+        connection.topics.add(topic)
+        self.subscribers.setdefault(topic, set()).add(connection)
+
+    def unsubscribe_topic(
+        self,
+        websocket: WebSocket,
+        topic: str,
+        connection: Optional[ClientConnection] = None,
+    ):
+        """Stop delivering messages published on `topic` to a connection."""
+        connection = connection or self.active_connections.get(websocket)
+        if connection is None:
+            return
+        connection.topics.discard(topic)
+        subscribers = self.subscribers.get(topic)
+        if subscribers is not None:
+            subscribers.discard(connection)
+            if not subscribers:
+                del self.subscribers[topic]
+
     # =========================================================================
     # AGENT REGISTRATION
     # =========================================================================
@@ -64,12 +434,18 @@ class MessageBus:
             public_key_b64: Base64-encoded Ed25519 public key
         """
         self.registry[did] = public_key_b64
+        try:
+            self.verify_keys[did] = VerifyKey(base64.b64decode(public_key_b64))
+        except Exception as e:
+            self.verify_keys.pop(did, None)
+            logger.error(f"❌ Invalid public key for {did}: {str(e)}")
         logger.info(f"✅ Registered agent: {did}")
 
     def unregister_agent(self, did: str):
         """Unregister an agent from the message bus."""
         if did in self.registry:
             del self.registry[did]
+            self.verify_keys.pop(did, None)
             logger.info(f"Unregistered agent: {did}")
 
     def get_registered_agents(self) -> List[str]:
@@ -117,116 +493,223 @@ class MessageBus:
             return False
 
         # Verify the signature
-        public_key_b64 = self.registry[sender_did]
+        verify_key = self.verify_keys.get(sender_did)
         
-        if not await self._verify_signature(
-            envelope, public_key_b64, sender_did
+        if verify_key is None or not await self._verify_signature(
+            envelope, verify_key, sender_did
         ):
             logger.error(f"❌ SECURITY ALERT: Invalid signature from {sender_did}. Dropping message.")
             return False
 
         # Signature valid - broadcast the message
-        logger.info(f"✅ Verified {message_type} from {sender_did}. Broadcasting to {len(self.active_connections)} clients...")
-        
-        # Store in history
-        self._store_message(envelope)
+        logger.info(f"✅ Verified {message_type} from {sender_did}. Broadcasting to subscribers...")
         
-        # Broadcast to all connected clients
-        await self.broadcast(envelope)
+        # The frame is encoded once here and shared by history, replay and
+        # subscribers. Record the message under its seq before handing it
+        # to the per-connection queues (which returns immediately)
+        frame = encode_frame(envelope)
+        seq = self._next_seq()
+        self._store_message(seq, envelope, frame)
+        self._buffer_task_event(seq, envelope, frame)
+        self._enqueue_broadcast(seq, envelope, frame)
         
         return True
 
     async def _verify_signature(
         self,
         envelope: Dict[str, Any],
-        public_key_b64: str,
+        verify_key: VerifyKey,
         sender_did: str
     ) -> bool:
         """
         Verify the Ed25519 signature of an envelope.
         
+        The check is queued and runs in the worker pool together with every
+        other envelope published in the same loop iteration, so signature
+        checking never blocks the event loop.
+        
         Args:
             envelope: The signed message envelope
-            public_key_b64: Base64-encoded public key
+            verify_key: The sender's cached verifying key
             sender_did: The sender's DID (for logging)
             
         Returns:
             bool: True if signature is valid
         """
-        try:
-            signature_b64 = envelope.get("signature")
-            
-            # Reconstruct the original message (exclude signature)
-            message = {k: v for k, v in envelope.items() if k != "signature"}
-            
-            # Serialize deterministically
-            message_bytes = json.dumps(
-                message, sort_keys=True, separators=(',', ':')
-            ).encode('utf-8')
-            
-            import base64 as b64
-            signature_bytes = b64.b64decode(signature_b64)
-            
-            # Verify
-            public_key_bytes = b64.b64decode(public_key_b64)
-            verify_key = VerifyKey(public_key_bytes)
-            verify_key.verify(message_bytes, signature_bytes)
-            
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self._pending_verifications:
+            loop.call_soon(self._flush_verifications)
+        self._pending_verifications.append((envelope, verify_key, future))
+        if len(self._pending_verifications) >= VERIFY_BATCH_MAX:
+            self._flush_verifications()
+        
+        error = await future
+        if error is None:
             return True
-
-        except BadSignatureError:
+        if isinstance(error, BadSignatureError):
             logger.error(f"❌ Signature verification failed for {sender_did}")
-            return False
-        except Exception as e:
-            logger.error(f"❌ Error verifying signature: {str(e)}")
-            return False
+        else:
+            logger.error(f"❌ Error verifying signature: {str(error)}")
+        return False
 
-    async def broadcast(self, message: Dict[str, Any]):
+    def _flush_verifications(self):
+        """Send the pending signature checks to the worker pool as one batch."""
+        batch, self._pending_verifications = self._pending_verifications, []
+        if not batch:
+            return
+        
+        def resolve(done: asyncio.Future):
+            try:
+                errors = done.result()
+            except Exception as e:
+                errors = [e] * len(batch)
+            for (_, _, future), error in zip(batch, errors):
+                if not future.done():
+                    future.set_result(error)
+        
+        loop = asyncio.get_running_loop()
+        loop.run_in_executor(
+            self._verify_executor, verify_envelopes, [(e, k) for e, k, _ in batch]
+        ).add_done_callback(resolve)
+
+    async def broadcast(self, message: Dict[str, Any], frame: Optional[str] = None):
         """
-        Broadcast a message to all connected WebSocket clients.
+        Broadcast a message to the WebSocket clients subscribed to any of
+        its topics (see `message_topics`).
+        
+        Constant time regardless of client count or speed: the message is
+        queued for the dispatcher, which places it on each subscriber's
+        send queue.
+        
+        Unlike `publish`, the message is not verified and is not recorded
+        in history or the per-task replay buffers.
         
         Args:
             message: The message envelope to broadcast
+            frame: `message` already encoded with `encode_frame`; it is
+                sent as-is to every subscriber
         """
-        if not self.active_connections:
-            logger.debug("No active connections to broadcast to")
-            return
+        self._enqueue_broadcast(self._next_seq(), message, frame or encode_frame(message))
 
-        disconnected_clients = []
-        
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Failed to send to client: {e}")
-                disconnected_clients.append(connection)
-        
-        # Clean up disconnected clients
-        for connection in disconnected_clients:
-            self.disconnect(connection)
+    def _next_seq(self) -> int:
+        """Allocate the sequence number of a new message."""
+        self._seq += 1
+        return self._seq
+
+    def _enqueue_broadcast(self, seq: int, message: Dict[str, Any], frame: str):
+        """Queue a message for the dispatcher under an allocated seq."""
+        self._ensure_dispatcher()
+        self._outbox.put_nowait((seq, message, frame))
+
+    def _ensure_dispatcher(self):
+        """Start the fan-out task on the running loop if needed."""
+        if self._dispatcher is None or self._dispatcher.done():
+            self._outbox = self._outbox or asyncio.Queue()
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def _dispatch(self):
+        """Fan published messages out to their subscribers' send queues."""
+        while True:
+            seq, message, frame = await self._outbox.get()
+            recipients: Set[ClientConnection] = set()
+            for topic in message_topics(message):
+                recipients.update(self.subscribers.get(topic, ()))
+            if not recipients:
+                logger.debug("No subscribers to broadcast to")
+                continue
+            for connection in recipients:
+                if seq > connection.after_seq:
+                    connection.enqueue(seq, message, frame)
+
+    async def close(self):
+        """Stop the dispatcher, all connection writers and the verify pool."""
+        for websocket in list(self.active_connections):
+            self.disconnect(websocket)
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            self._dispatcher = None
+        self._verify_executor.shutdown(wait=False)
 
     # =========================================================================
     # MESSAGE HISTORY & UTILITY
     # =========================================================================
 
-    def _store_message(self, envelope: Dict[str, Any]):
-        """Store message in history for debugging."""
-        message_record = {
-            "from_did": envelope.get("from_did"),
-            "type": envelope.get("type"),
-            "timestamp": envelope.get("timestamp", datetime.utcnow().isoformat() + "Z"),
-            "payload_keys": list(envelope.get("payload", {}).keys())
-        }
-        
-        self.message_history.append(message_record)
-        
-        # Keep history size bounded
-        if len(self.message_history) > self.max_history:
-            self.message_history = self.message_history[-self.max_history:]
+    def _store_message(self, seq: int, envelope: Dict[str, Any], frame: str):
+        """Store message in history."""
+        self.history.append(seq, envelope, frame)
 
     def get_message_history(self, limit: int = 20) -> List[Dict[str, Any]]:
-        """Get recent message history."""
-        return self.message_history[-limit:]
+        """Get recent message history (summaries, for debugging)."""
+        return [
+            {
+                "from_did": envelope.get("from_did"),
+                "type": envelope.get("type"),
+                "timestamp": timestamp,
+                "payload_keys": list((envelope.get("payload") or {}).keys()),
+            }
+            for _, envelope, _, timestamp in self.history.query(TOPIC_LOGS, limit)
+        ]
+
+    def query_history(
+        self,
+        topic: str = TOPIC_LOGS,
+        limit: int = 20,
+        before_seq: Optional[int] = None,
+    ) -> Tuple[List[str], Optional[int]]:
+        """
+        Get the most recent pre-encoded envelopes published on a topic.
+        
+        Args:
+            topic: Topic to read (see `message_topics`)
+            limit: Maximum number of envelopes
+            before_seq: Cursor from a previous call, to page further back
+            
+        Returns:
+            (frames oldest first, cursor for the next older page or None)
+        """
+        # One extra entry tells whether an older page exists
+        entries = self.history.query(topic, limit + 1, before_seq)
+        cursor = None
+        if len(entries) > limit:
+            entries = entries[1:]
+            cursor = entries[0][0]
+        return [frame for _, _, frame, _ in entries], cursor
+
+    # =========================================================================
+    # PER-TASK EVENT BUFFER
+    # =========================================================================
+
+    def _buffer_task_event(self, seq: int, envelope: Dict[str, Any], frame: str):
+        """Keep a published envelope for replay if it belongs to a task."""
+        payload = envelope.get("payload")
+        task_id = payload.get("task_id") if isinstance(payload, dict) else None
+        if not task_id:
+            return
+
+        now = time.monotonic()
+        _, events = self.task_events.pop(task_id, (now, []))
+        events.append((seq, envelope, frame))
+        del events[:-TASK_BUFFER_MAX_EVENTS]
+        self.task_events[task_id] = (now, events)
+        self._expire_task_events(now)
+
+    def _expire_task_events(self, now: float):
+        """Drop buffers past their TTL, and the oldest beyond the task limit."""
+        while self.task_events:
+            task_id, (last_event, _) = next(iter(self.task_events.items()))
+            if len(self.task_events) <= TASK_BUFFER_MAX_TASKS and now - last_event < TASK_BUFFER_TTL:
+                break
+            del self.task_events[task_id]
+
+    def get_task_events(self, task_id: str) -> List[Dict[str, Any]]:
+        """Get the buffered envelopes published for a task, oldest first."""
+        return [envelope for _, envelope, _ in self._task_events(task_id)]
+
+    def _task_events(self, task_id: str) -> List[Tuple[int, Dict[str, Any], str]]:
+        self._expire_task_events(time.monotonic())
+        _, events = self.task_events.get(task_id, (0.0, []))
+        return list(events)
 
     # =========================================================================
     # LEGACY METHODS (for backward compatibility)
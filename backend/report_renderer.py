@@ -0,0 +1,247 @@
+"""
+=============================================================================
+Sentinel Orchestrator Network (SON) - Audit Report Renderer
+=============================================================================
+
+Renders PDF audit reports off the event loop.
+
+- FPDF runs in a process pool, so a download never holds the event loop
+  (or the GIL) that delivers live WebSocket verdicts.
+- Rendered PDFs are cached by content address: the SHA-256 of the task ID
+  and the canonical JSON of its result. A result never changes once
+  stored, so repeat downloads are served from memory, and concurrent
+  requests for the same report share a single render.
+- Multi-scan bundles are streamed as a ZIP with one PDF per scan. Reports
+  render in parallel and each is sent as soon as it is ready, so the first
+  bytes go out long before the last scan is rendered.
+
+Usage:
+    from report_renderer import get_report_renderer
+
+    pdf_bytes = await get_report_renderer().render(task_id, result)
+
+Configuration (all optional, via environment):
+    REPORT_RENDER_WORKERS     Renderer processes (2)
+    REPORT_CACHE_MAX_BYTES    Rendered PDFs kept in memory (64 MB)
+
+=============================================================================
+"""
+
+import os
+import io
+import json
+import asyncio
+import hashlib
+import logging
+import zipfile
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fpdf import FPDF
+
+logger = logging.getLogger("SON.report_renderer")
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+REPORT_RENDER_WORKERS = int(os.getenv("REPORT_RENDER_WORKERS", "2"))
+REPORT_CACHE_MAX_BYTES = int(os.getenv("REPORT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Bump when the report layout changes, so cached PDFs are not reused
+REPORT_TEMPLATE_VERSION = "1"
+
+
+# =============================================================================
+# RENDERING (runs in the worker processes)
+# =============================================================================
+
+def render_audit_report(task_id: str, result: Dict[str, Any]) -> bytes:
+    """
+    Render the PDF audit report for one scan result.
+
+    Deterministic for a given (task_id, result): the report is stamped
+    with the scan's own timestamp, which is what makes caching by content
+    address valid.
+    """
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+
+    # Header
+    pdf.set_font("Arial", "B", 16)
+    pdf.cell(200, 10, txt="Sentinel Orchestrator Network - Audit Report", ln=1, align="C")
+    pdf.ln(10)
+
+    # Metadata
+    timestamp = result.get("timestamp") or datetime.utcnow().isoformat() + "Z"
+    pdf.set_font("Arial", size=12)
+    pdf.cell(200, 10, txt=f"Report ID: AUDIT-{task_id[:8].upper()}", ln=1)
+    pdf.cell(200, 10, txt=f"Timestamp: {timestamp}", ln=1)
+    pdf.cell(200, 10, txt=f"Verdict: {result.get('verdict')}", ln=1)
+    pdf.cell(200, 10, txt=f"Risk Score: {result.get('risk_score')}", ln=1)
+    pdf.ln(10)
+
+    # Details
+    pdf.set_font("Arial", "B", 14)
+    pdf.cell(200, 10, txt="Analysis Details", ln=1)
+    pdf.set_font("Arial", size=12)
+    pdf.multi_cell(0, 10, txt=f"Reason: {result.get('reason')}")
+    pdf.ln(5)
+
+    pdf.cell(200, 10, txt=f"Policy ID: {result.get('policy_id')}", ln=1)
+    pdf.cell(200, 10, txt=f"Hydra Verification: Enabled", ln=1)
+
+    # Footer
+    pdf.ln(20)
+    pdf.set_font("Arial", "I", 10)
+    pdf.cell(200, 10, txt="Signed by: did:masumi:sentinel_01", ln=1, align="R")
+
+    # In fpdf2, output() returns bytearray by default if no name provided
+    return bytes(pdf.output())
+
+
+def report_key(task_id: str, result: Dict[str, Any]) -> str:
+    """Content address of a report: hash of the template, task and result."""
+    canonical = json.dumps(result, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{REPORT_TEMPLATE_VERSION}|{task_id}|{canonical}".encode()).hexdigest()
+
+
+# =============================================================================
+# RENDERER
+# =============================================================================
+
+class _ChunkBuffer(io.RawIOBase):
+    """Write-only stream whose contents are drained between ZIP entries."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+class ReportRenderer:
+    """Process-pool PDF renderer with a content-addressed, size-bounded cache."""
+
+    def __init__(
+        self,
+        workers: int = REPORT_RENDER_WORKERS,
+        cache_max_bytes: int = REPORT_CACHE_MAX_BYTES,
+    ):
+        self.workers = max(1, workers)
+        self.cache_max_bytes = cache_max_bytes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # report key -> PDF bytes, least recently used first
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._cache_bytes = 0
+        # report key -> render in progress, shared by concurrent requests
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: workers import only this module, not the app (and
+            # don't inherit its threads and sockets the way fork would)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def warm_up(self) -> None:
+        """Start the worker processes now rather than on the first download."""
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(executor, os.getpid) for _ in range(self.workers)))
+
+    def _remember(self, key: str, pdf_bytes: bytes) -> None:
+        if len(pdf_bytes) > self.cache_max_bytes:
+            return
+        self._cache[key] = pdf_bytes
+        self._cache_bytes += len(pdf_bytes)
+        while self._cache_bytes > self.cache_max_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= len(evicted)
+
+    async def render(self, task_id: str, result: Dict[str, Any]) -> bytes:
+        """Get the PDF audit report for a scan, rendering it if not cached."""
+        key = report_key(task_id, result)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_executor(), render_audit_report, task_id, result)
+        self._inflight[key] = future
+        try:
+            pdf_bytes = await asyncio.shield(future)
+        finally:
+            self._inflight.pop(key, None)
+        self._remember(key, pdf_bytes)
+        logger.info(f"Rendered audit report for {task_id}: {len(pdf_bytes)} bytes")
+        return pdf_bytes
+
+    async def stream_bundle(
+        self,
+        reports: List[Tuple[str, Dict[str, Any]]],
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a ZIP archive with one audit report per (task_id, result).
+
+        All reports are submitted to the pool up front; entries are written
+        in request order as soon as each one is ready.
+        """
+        renders = [asyncio.ensure_future(self.render(task_id, result)) for task_id, result in reports]
+        buffer = _ChunkBuffer()
+        try:
+            # Stored, not deflated: PDF streams are already compressed
+            with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+                for (task_id, _), pending in zip(reports, renders):
+                    # Full task ID: short prefixes can collide within a bundle
+                    archive.writestr(f"AUDIT-{task_id}.pdf", await pending)
+                    yield buffer.drain()
+            yield buffer.drain()
+        finally:
+            for pending in renders:
+                pending.cancel()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_report_renderer: Optional[ReportRenderer] = None
+
+
+def get_report_renderer() -> ReportRenderer:
+    """Get the process-wide audit report renderer."""
+    global _report_renderer
+    if _report_renderer is None:
+        _report_renderer = ReportRenderer()
+    return _report_renderer
+
+
+def close_report_renderer() -> None:
+    """Shut down the renderer's worker processes (call on shutdown)."""
+    global _report_renderer
+    if _report_renderer is not None:
+        _report_renderer.close()
+        _report_renderer = None
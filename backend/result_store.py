@@ -0,0 +1,505 @@
+"""
+=============================================================================
+Sentinel Orchestrator Network (SON) - Scan Result Store
+=============================================================================
+
+Durable, bounded storage for completed scan results, backing
+`/api/v1/report/{task_id}`, `/api/v1/proof/{task_id}` and the scan history.
+
+Two tiers:
+
+- an in-memory LRU of decoded results, for the reports and proofs users
+  open right after a scan, in front of
+- a pluggable on-disk backend. The default is SQLite in WAL mode, so
+  results survive restarts and every uvicorn worker on a host shares them
+  (readers never block the single writer).
+
+Backend I/O runs on a dedicated thread (the `a*` methods), so a slow disk
+or a write lock held by another worker never stalls the event loop.
+
+Payloads are stored as zlib-compressed JSON (typically 5-10x smaller than
+the raw result) and expire after a retention period; expired rows are
+purged in bulk on an index, at most once a minute, as results are written.
+
+The history fields (policy ID, verdict, risk score, timestamp) are also
+kept as indexed columns, so the scan history is served newest-first with
+keyset (cursor) pagination and filters, at a cost proportional to the
+page size - payloads are never decompressed for it.
+
+Usage:
+    from result_store import HistoryFilter, get_result_store
+
+    store = get_result_store()
+    await store.aput(task_id, result)
+    result = await store.aget(task_id)
+
+    rows, cursor = await store.ahistory(limit=50, filters=HistoryFilter(verdict="DANGER"))
+
+    # Blocking dict-style access, for scripts and maintenance
+    if task_id in store:
+        result = store[task_id]
+
+Configuration (all optional, via environment):
+    RESULT_STORE_PATH           SQLite file ("" = in-memory only;
+                                default: backend/data/son_results.db)
+    RESULT_STORE_CACHE_SIZE     Results kept decoded in memory (1024)
+    RESULT_STORE_TTL            Retention in seconds, 0 = forever (30 days)
+    RESULT_STORE_COMPRESSION    zlib level 0-9 (6)
+
+=============================================================================
+"""
+
+import os
+import json
+import asyncio
+import time
+import zlib
+import base64
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("SON.result_store")
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+RESULT_STORE_PATH = os.getenv(
+    "RESULT_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "son_results.db"),
+)
+RESULT_STORE_CACHE_SIZE = int(os.getenv("RESULT_STORE_CACHE_SIZE", "1024"))
+RESULT_STORE_TTL = float(os.getenv("RESULT_STORE_TTL", str(30 * 24 * 3600)))
+RESULT_STORE_COMPRESSION = int(os.getenv("RESULT_STORE_COMPRESSION", "6"))
+
+# Minimum seconds between sweeps for expired rows
+PURGE_INTERVAL = 60.0
+
+# Result fields kept as indexed columns for the scan history
+HISTORY_FIELDS = ("policy_id", "verdict", "risk_score", "timestamp")
+
+
+@dataclass
+class HistoryFilter:
+    """Scan history filters; None means no constraint."""
+    verdict: Optional[str] = None
+    policy_prefix: Optional[str] = None
+    min_risk: Optional[float] = None
+    max_risk: Optional[float] = None
+    since: Optional[float] = None  # Unix seconds, inclusive
+    until: Optional[float] = None  # Unix seconds, exclusive
+
+
+def encode_cursor(created_at: float, task_id: str) -> str:
+    """Opaque cursor pointing just past a history row."""
+    return base64.urlsafe_b64encode(f"{created_at!r}|{task_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    """Inverse of encode_cursor; raises ValueError if malformed."""
+    try:
+        created_at, task_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return float(created_at), task_id
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+# =============================================================================
+# BACKENDS
+# =============================================================================
+
+class ResultBackend(ABC):
+    """On-disk tier of the result store: task_id -> compressed payload."""
+
+    @abstractmethod
+    def get(self, task_id: str, now: float) -> Optional[Tuple[bytes, float]]:
+        """Return (payload, expires_at) for an unexpired result, or None."""
+
+    @abstractmethod
+    def put(
+        self,
+        task_id: str,
+        payload: bytes,
+        created_at: float,
+        expires_at: float,
+        summary: Dict[str, Any],
+    ) -> None:
+        """Store or replace a result; `summary` holds its HISTORY_FIELDS."""
+
+    @abstractmethod
+    def history(
+        self,
+        now: float,
+        limit: int,
+        after: Optional[Tuple[float, str]],
+        filters: HistoryFilter,
+    ) -> List[Tuple[float, str, Dict[str, Any]]]:
+        """
+        Return up to `limit` unexpired (created_at, task_id, summary) rows,
+        newest first, strictly older than the `after` position.
+        """
+
+    @abstractmethod
+    def iter_items(self, now: float) -> Iterator[Tuple[str, bytes]]:
+        """Yield (task_id, payload) for unexpired results, oldest first."""
+
+    @abstractmethod
+    def count(self, now: float) -> int:
+        """Number of unexpired results."""
+
+    @abstractmethod
+    def purge_expired(self, now: float) -> int:
+        """Delete expired results; returns how many were removed."""
+
+    def close(self) -> None:
+        """Release resources."""
+
+
+class SQLiteResultBackend(ResultBackend):
+    """
+    SQLite backend in WAL mode.
+
+    `synchronous=NORMAL` makes a commit a WAL append without fsync (the WAL
+    is synced at checkpoints), so writes are cheap enough to do inline; a
+    crash can lose only the last few results, never corrupt the file.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path or ":memory:"
+        self._lock = threading.Lock()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA busy_timeout = 5000")
+        if self.path != ":memory:":
+            self._db.execute("PRAGMA journal_mode = WAL")
+            self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " task_id TEXT PRIMARY KEY,"
+            " created_at REAL NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " payload BLOB NOT NULL,"
+            " policy_id TEXT,"
+            " verdict TEXT,"
+            " risk_score REAL,"
+            " timestamp TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_expires_at ON results (expires_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_history ON results (created_at, task_id)")
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS results_verdict ON results (verdict, created_at, task_id)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_policy ON results (policy_id)")
+
+    def get(self, task_id: str, now: float) -> Optional[Tuple[bytes, float]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload, expires_at FROM results WHERE task_id = ? AND expires_at > ?",
+                (task_id, now),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put(
+        self,
+        task_id: str,
+        payload: bytes,
+        created_at: float,
+        expires_at: float,
+        summary: Dict[str, Any],
+    ) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (task_id, created_at, expires_at, payload,"
+                " policy_id, verdict, risk_score, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (task_id, created_at, expires_at, payload, *(summary.get(f) for f in HISTORY_FIELDS)),
+            )
+
+    def history(
+        self,
+        now: float,
+        limit: int,
+        after: Optional[Tuple[float, str]],
+        filters: HistoryFilter,
+    ) -> List[Tuple[float, str, Dict[str, Any]]]:
+        where = ["expires_at > ?"]
+        params: List[Any] = [now]
+        if after is not None:
+            where.append("(created_at, task_id) < (?, ?)")
+            params.extend(after)
+        if filters.verdict is not None:
+            where.append("verdict = ?")
+            params.append(filters.verdict)
+        if filters.policy_prefix:
+            # Range on the index instead of LIKE (which can't use it)
+            where.append("policy_id >= ? AND policy_id < ?")
+            params.extend([filters.policy_prefix, filters.policy_prefix + "\U0010ffff"])
+        if filters.min_risk is not None:
+            where.append("risk_score >= ?")
+            params.append(filters.min_risk)
+        if filters.max_risk is not None:
+            where.append("risk_score <= ?")
+            params.append(filters.max_risk)
+        if filters.since is not None:
+            where.append("created_at >= ?")
+            params.append(filters.since)
+        if filters.until is not None:
+            where.append("created_at < ?")
+            params.append(filters.until)
+        
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT created_at, task_id, {', '.join(HISTORY_FIELDS)} FROM results"
+                f" WHERE {' AND '.join(where)}"
+                " ORDER BY created_at DESC, task_id DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [(row[0], row[1], dict(zip(HISTORY_FIELDS, row[2:]))) for row in rows]
+
+    def iter_items(self, now: float) -> Iterator[Tuple[str, bytes]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT task_id, payload FROM results WHERE expires_at > ? ORDER BY created_at",
+                (now,),
+            ).fetchall()
+        yield from rows
+
+    def count(self, now: float) -> int:
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM results WHERE expires_at > ?", (now,)
+            ).fetchone()[0]
+
+    def purge_expired(self, now: float) -> int:
+        with self._lock:
+            return self._db.execute("DELETE FROM results WHERE expires_at <= ?", (now,)).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+# =============================================================================
+# RESULT STORE
+# =============================================================================
+
+class ResultStore:
+    """
+    Scan results by task_id: an LRU of decoded results over a backend.
+
+    The async methods (`aput`, `aget`, `ahistory`) are for the event loop:
+    the LRU is consulted in place and only backend I/O is handed to the
+    store's I/O thread. The blocking dict operations (`in`, `[]`, `[]=`,
+    `get`, `items`, `len`) call the backend directly.
+    Results are write-once per task, so the LRU tier never goes stale even
+    when several workers share the backend.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[ResultBackend] = None,
+        cache_size: int = RESULT_STORE_CACHE_SIZE,
+        ttl: float = RESULT_STORE_TTL,
+        compression: int = RESULT_STORE_COMPRESSION,
+    ):
+        self.backend = backend or SQLiteResultBackend(RESULT_STORE_PATH)
+        self.cache_size = cache_size
+        self.ttl = ttl
+        self.compression = compression
+        # task_id -> (expires_at, result), least recently used first
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._last_purge = 0.0
+        # One thread: the backend serializes access anyway, and a single
+        # writer keeps a busy SQLite file from tying up several threads
+        self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="son-result-store")
+
+    def _expires_at(self, now: float) -> float:
+        return now + self.ttl if self.ttl > 0 else float("inf")
+
+    def _remember(self, task_id: str, expires_at: float, result: Dict[str, Any]) -> None:
+        self._cache[task_id] = (expires_at, result)
+        self._cache.move_to_end(task_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _encode(self, result: Dict[str, Any]) -> bytes:
+        raw = json.dumps(result, separators=(",", ":"), default=str).encode("utf-8")
+        return zlib.compress(raw, self.compression)
+
+    @staticmethod
+    def _decode(payload: bytes) -> Dict[str, Any]:
+        return json.loads(zlib.decompress(payload))
+
+    async def _run_io(self, fn, *args: Any) -> Any:
+        """Run a blocking backend call on the store's I/O thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._io_executor, fn, *args)
+
+    def _write(self, task_id: str, result: Dict[str, Any], now: float, expires_at: float, purge: bool) -> None:
+        """Encode and write one result, then purge expired rows if due."""
+        summary = {field: result.get(field) for field in HISTORY_FIELDS}
+        self.backend.put(task_id, self._encode(result), now, expires_at, summary)
+        if purge:
+            removed = self.backend.purge_expired(now)
+            if removed:
+                logger.info(f"Purged {removed} expired scan results")
+
+    def _purge_due(self, now: float) -> bool:
+        if now - self._last_purge >= PURGE_INTERVAL:
+            self._last_purge = now
+            return True
+        return False
+
+    def _cached(self, task_id: str, now: float) -> Optional[Dict[str, Any]]:
+        cached = self._cache.get(task_id)
+        if cached is None:
+            return None
+        expires_at, result = cached
+        if expires_at > now:
+            self._cache.move_to_end(task_id)
+            return result
+        del self._cache[task_id]
+        return None
+
+    def _load(self, task_id: str, now: float) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Read and decode one result from the backend: (expires_at, result) or None."""
+        row = self.backend.get(task_id, now)
+        if row is None:
+            return None
+        payload, expires_at = row
+        return expires_at, self._decode(payload)
+
+    def _page(
+        self,
+        rows: List[Tuple[float, str, Dict[str, Any]]],
+        limit: int,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        page = [{"task_id": task_id, **summary} for _, task_id, summary in rows[:limit]]
+        next_cursor = encode_cursor(*rows[limit - 1][:2]) if len(rows) > limit else None
+        return page, next_cursor
+
+    async def aput(self, task_id: str, result: Dict[str, Any]) -> None:
+        """Store a scan result; it is readable from the LRU immediately."""
+        now = time.time()
+        expires_at = self._expires_at(now)
+        self._remember(task_id, expires_at, result)
+        await self._run_io(self._write, task_id, result, now, expires_at, self._purge_due(now))
+
+    async def aget(self, task_id: str, default: Any = None) -> Any:
+        """Get a scan result, or `default` if unknown or expired."""
+        now = time.time()
+        result = self._cached(task_id, now)
+        if result is not None:
+            return result
+        loaded = await self._run_io(self._load, task_id, now)
+        if loaded is None:
+            return default
+        self._remember(task_id, *loaded)
+        return loaded[1]
+
+    async def ahistory(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        filters: Optional[HistoryFilter] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Page through the scan history, newest first.
+        
+        Args:
+            limit: Page size
+            cursor: `next_cursor` from the previous page (None = newest)
+            filters: Optional verdict / policy prefix / risk / time filters
+            
+        Returns:
+            (rows of task_id + HISTORY_FIELDS, next_cursor or None at the end)
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        after = decode_cursor(cursor) if cursor else None
+        rows = await self._run_io(
+            self.backend.history, time.time(), limit + 1, after, filters or HistoryFilter()
+        )
+        return self._page(rows, limit)
+
+    def put(self, task_id: str, result: Dict[str, Any]) -> None:
+        """Store a scan result (blocking; use `aput` on the event loop)."""
+        now = time.time()
+        expires_at = self._expires_at(now)
+        self._write(task_id, result, now, expires_at, self._purge_due(now))
+        self._remember(task_id, expires_at, result)
+
+    def get(self, task_id: str, default: Any = None) -> Any:
+        """Get a scan result, or `default` (blocking; use `aget` on the event loop)."""
+        now = time.time()
+        result = self._cached(task_id, now)
+        if result is not None:
+            return result
+        loaded = self._load(task_id, now)
+        if loaded is None:
+            return default
+        self._remember(task_id, *loaded)
+        return loaded[1]
+
+    def history(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        filters: Optional[HistoryFilter] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Blocking form of `ahistory`."""
+        after = decode_cursor(cursor) if cursor else None
+        rows = self.backend.history(time.time(), limit + 1, after, filters or HistoryFilter())
+        return self._page(rows, limit)
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (task_id, result) for every stored result, oldest first."""
+        for task_id, payload in self.backend.iter_items(time.time()):
+            yield task_id, self._decode(payload)
+
+    def close(self) -> None:
+        # Let queued writes land before the connection goes away
+        self._io_executor.shutdown(wait=True)
+        self._cache.clear()
+        self.backend.close()
+
+    def __contains__(self, task_id: str) -> bool:
+        return self.get(task_id) is not None
+
+    def __getitem__(self, task_id: str) -> Dict[str, Any]:
+        result = self.get(task_id)
+        if result is None:
+            raise KeyError(task_id)
+        return result
+
+    def __setitem__(self, task_id: str, result: Dict[str, Any]) -> None:
+        self.put(task_id, result)
+
+    def __len__(self) -> int:
+        return self.backend.count(time.time())
+
+
+_result_store: Optional[ResultStore] = None
+
+
+def get_result_store() -> ResultStore:
+    """Get the process-wide scan result store."""
+    global _result_store
+    if _result_store is None:
+        _result_store = ResultStore()
+    return _result_store
+
+
+def close_result_store() -> None:
+    """Close the process-wide result store (call on shutdown)."""
+    global _result_store
+    if _result_store is not None:
+        _result_store.close()
+        _result_store = None
@@ -0,0 +1,616 @@
+"""
+=============================================================================
+Sentinel Orchestrator Network (SON) - Offline Upstream Simulator
+=============================================================================
+
+A local stand-in for every upstream the agents call, so the full pipeline
+(`SentinelAgent.process`, `/api/v1/scan`, governance analysis) can run in
+CI and under load without spending provider quota:
+
+    /blockfrost/{network}/api/v0/...   Blockfrost endpoints used by agents
+    /koios/{network}/api/v1/...        Koios endpoints (incl. batch POSTs)
+    /ipfs/{cid}                        IPFS gateway (CIP-100/108 metadata)
+    /v1beta/models/{model}:generateContent   Gemini generate_content (REST)
+    /_sim/stats, /_sim/reset           Request counters for benchmarks
+
+Responses are derived from a seed and the requested identifier, so the same
+address always has the same balance, stake key, transactions and pool, in
+every run. Latency per provider is drawn from a configurable distribution,
+and 5xx errors, 429s (with Retry-After) and per-provider rate limits can be
+injected to exercise retry and governor paths.
+
+Usage:
+    uvicorn upstream_simulator:app --port 8765
+
+    BLOCKFROST_API_URL=http://127.0.0.1:8765/blockfrost/preprod/api
+    BLOCKFROST_API_KEY=simulated
+    KOIOS_API_URL=http://127.0.0.1:8765/koios/preprod/api/v1
+    KOIOS_MAINNET_API_URL=http://127.0.0.1:8765/koios/mainnet/api/v1
+    IPFS_GATEWAYS=http://127.0.0.1:8765/ipfs/
+    GEMINI_API_ENDPOINT=http://127.0.0.1:8765
+
+Configuration (all optional, via environment):
+    SIM_PORT                    Port when run as a script (8765)
+    SIM_SEED                    Seed for data, latency and faults (42)
+    SIM_LATENCY_BLOCKFROST      Latency distribution in ms (lognormal:60:0.4)
+    SIM_LATENCY_KOIOS           (lognormal:120:0.5)
+    SIM_LATENCY_IPFS            (lognormal:300:0.6)
+    SIM_LATENCY_GEMINI          (lognormal:900:0.3)
+    SIM_ERROR_RATE              Fraction of requests answered 503 (0)
+    SIM_THROTTLE_RATE           Fraction of requests answered 429 (0)
+    SIM_RETRY_AFTER             Retry-After seconds sent with 429s (1)
+    SIM_RATE_LIMIT_BLOCKFROST   Enforced requests/second, 0 = off (0)
+    SIM_RATE_LIMIT_KOIOS        (0)
+    SIM_MISSING_RATE            Fraction of identifiers not on chain (0.1)
+
+Latency distributions: `const:<ms>`, `uniform:<min>:<max>`,
+`normal:<mean>:<stddev>`, `lognormal:<median>:<sigma>`, `exp:<mean>`.
+
+=============================================================================
+"""
+
+import os
+import re
+import json
+import math
+import random
+import asyncio
+import hashlib
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from agents.rate_governor import TokenBucket
+
+logger = logging.getLogger("SON.upstream_simulator")
+
+PROVIDERS = ("blockfrost", "koios", "ipfs", "gemini")
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Parse a latency distribution spec into a sampler returning seconds.
+
+    Raises:
+        ValueError: If the distribution is unknown or malformed
+    """
+    name, *args = spec.split(":")
+    try:
+        values = [float(a) for a in args]
+        if name == "const":
+            (ms,) = values
+            return lambda rng: ms / 1000.0
+        if name == "uniform":
+            low, high = values
+            return lambda rng: rng.uniform(low, high) / 1000.0
+        if name == "normal":
+            mean, stddev = values
+            return lambda rng: max(0.0, rng.gauss(mean, stddev)) / 1000.0
+        if name == "lognormal":
+            median, sigma = values
+            return lambda rng: rng.lognormvariate(math.log(median), sigma) / 1000.0
+        if name == "exp":
+            (mean,) = values
+            return lambda rng: rng.expovariate(1.0 / mean) / 1000.0
+    except ValueError:
+        pass
+    raise ValueError(f"Invalid latency distribution: '{spec}'")
+
+
+@dataclass
+class SimulatorConfig:
+    """Knobs for one simulator instance."""
+    seed: int = 42
+    latency: Dict[str, str] = field(default_factory=lambda: {
+        "blockfrost": "lognormal:60:0.4",
+        "koios": "lognormal:120:0.5",
+        "ipfs": "lognormal:300:0.6",
+        "gemini": "lognormal:900:0.3",
+    })
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: float = 1.0
+    rate_limits: Dict[str, float] = field(default_factory=dict)
+    missing_rate: float = 0.1
+
+    @classmethod
+    def from_env(cls) -> "SimulatorConfig":
+        defaults = cls()
+        return cls(
+            seed=int(os.getenv("SIM_SEED", str(defaults.seed))),
+            latency={
+                p: os.getenv(f"SIM_LATENCY_{p.upper()}", defaults.latency[p]) for p in PROVIDERS
+            },
+            error_rate=float(os.getenv("SIM_ERROR_RATE", "0")),
+            throttle_rate=float(os.getenv("SIM_THROTTLE_RATE", "0")),
+            retry_after=float(os.getenv("SIM_RETRY_AFTER", "1")),
+            rate_limits={
+                p: float(os.getenv(f"SIM_RATE_LIMIT_{p.upper()}", "0")) for p in ("blockfrost", "koios")
+            },
+            missing_rate=float(os.getenv("SIM_MISSING_RATE", str(defaults.missing_rate))),
+        )
+
+
+# =============================================================================
+# DETERMINISTIC CHAIN DATA
+# =============================================================================
+
+class ChainData:
+    """Seeded, stable fake chain state keyed by identifier."""
+
+    def __init__(self, seed: int, missing_rate: float):
+        self.seed = seed
+        self.missing_rate = missing_rate
+
+    def rng(self, *key: Any) -> random.Random:
+        return random.Random(f"{self.seed}:" + ":".join(str(k) for k in key))
+
+    def hex(self, *key: Any, size: int = 32) -> str:
+        return hashlib.sha256(f"{self.seed}:{key}".encode()).hexdigest()[:size * 2]
+
+    def exists(self, identifier: str) -> bool:
+        return self.rng("exists", identifier).random() >= self.missing_rate
+
+    # -- Addresses / accounts -------------------------------------------------
+
+    def stake_address(self, address: str) -> Optional[str]:
+        if self.rng("enterprise", address).random() < 0.15:
+            return None  # Enterprise address - no stake part
+        prefix = "stake_test1u" if address.startswith("addr_test") else "stake1u"
+        return prefix + self.hex("stake", address, size=26)
+
+    def address(self, address: str) -> Dict[str, Any]:
+        rng = self.rng("address", address)
+        return {
+            "address": address,
+            "amount": [{"unit": "lovelace", "quantity": str(rng.randint(2, 50_000) * 1_000_000)}],
+            "stake_address": self.stake_address(address),
+            "type": "shelley",
+            "script": False,
+        }
+
+    def address_utxos(self, address: str) -> List[Dict[str, Any]]:
+        rng = self.rng("utxos", address)
+        return [
+            {
+                "address": address,
+                "tx_hash": self.hex("utxo", address, i),
+                "output_index": rng.randint(0, 3),
+                "amount": [{"unit": "lovelace", "quantity": str(rng.randint(1, 5_000) * 1_000_000)}],
+                "data_hash": None,
+            }
+            for i in range(rng.randint(1, 8))
+        ]
+
+    def address_txs(self, address: str, count: int) -> List[Dict[str, Any]]:
+        rng = self.rng("txs", address)
+        total = rng.randint(0, 40)
+        block_time = 1_700_000_000 + rng.randint(0, 10_000_000)
+        txs = []
+        for i in range(min(count, total)):
+            block_time -= rng.randint(20, 86_400)
+            txs.append({
+                "tx_hash": self.hex("tx", address, i),
+                "tx_index": rng.randint(0, 50),
+                "block_height": 2_000_000 - i * 10,
+                "block_time": block_time,
+            })
+        return txs
+
+    def account(self, stake_address: str) -> Dict[str, Any]:
+        rng = self.rng("account", stake_address)
+        return {
+            "stake_address": stake_address,
+            "active": True,
+            "controlled_amount": str(rng.randint(1, 2_000_000) * 1_000_000),
+            "rewards_sum": str(rng.randint(0, 20_000) * 1_000_000),
+            "pool_id": self.pool_ids(50)[rng.randrange(50)] if rng.random() < 0.8 else None,
+            "drep_id": rng.choice([None, "drep_always_abstain", "drep_always_no_confidence", "drep1" + self.hex("drep", stake_address, size=28)]),
+        }
+
+    def drep(self, drep_id: str) -> Optional[Dict[str, Any]]:
+        rng = self.rng("drep", drep_id)
+        if rng.random() < 0.9:
+            return None  # Most stake keys are not registered DReps
+        return {"drep_id": drep_id, "amount": str(rng.randint(1, 10_000_000) * 1_000_000),
+                "active": rng.random() < 0.8, "retired": False}
+
+    # -- Transactions ---------------------------------------------------------
+
+    def tx(self, tx_hash: str) -> Dict[str, Any]:
+        rng = self.rng("tx", tx_hash)
+        fee = rng.randint(170_000, 450_000) if rng.random() < 0.97 else rng.randint(2_000_000, 15_000_000)
+        return {
+            "hash": tx_hash,
+            "block_time": 1_700_000_000 + rng.randint(0, 10_000_000),
+            "block_height": rng.randint(1_000_000, 2_000_000),
+            "fees": str(fee),
+            "size": rng.randint(300, 16_000),
+            "valid_contract": rng.random() > 0.01,
+            "output_amount": [{"unit": "lovelace", "quantity": str(rng.randint(1, 10_000) * 1_000_000)}],
+        }
+
+    def tx_utxos(self, tx_hash: str) -> Dict[str, Any]:
+        rng = self.rng("tx_utxos", tx_hash)
+
+        def _io(kind: str, i: int) -> Dict[str, Any]:
+            lovelace = rng.randint(1_000_000, 5_000_000_000) if rng.random() > 0.1 else rng.randint(900_000, 1_400_000)
+            entry = {
+                "address": "addr_test1q" + self.hex(kind, tx_hash, i, size=28),
+                "amount": [{"unit": "lovelace", "quantity": str(lovelace)}],
+                "data_hash": None,
+            }
+            if kind == "in":
+                # Spent outputs come from a small shared pool, so double spends occur
+                entry.update(tx_hash=self.hex("spent", rng.randrange(5000)), output_index=rng.randint(0, 2),
+                             reference=False, collateral=False)
+            return entry
+
+        return {
+            "hash": tx_hash,
+            "inputs": [_io("in", i) for i in range(rng.randint(1, 4))],
+            "outputs": [_io("out", i) for i in range(rng.randint(1, 5))],
+        }
+
+    def tx_redeemers(self, tx_hash: str) -> List[Dict[str, Any]]:
+        rng = self.rng("redeemers", tx_hash)
+        if rng.random() < 0.7:
+            return []
+        return [{"tx_index": i, "purpose": "spend", "unit_mem": str(rng.randint(100_000, 14_000_000)),
+                 "unit_steps": str(rng.randint(50_000_000, 10_000_000_000))} for i in range(rng.randint(1, 3))]
+
+    # -- Pools / governance / epochs ------------------------------------------
+
+    def pool_ids(self, count: int) -> List[str]:
+        return ["pool1" + self.hex("pool", i, size=28) for i in range(count)]
+
+    def pool(self, pool_id: str) -> Dict[str, Any]:
+        rng = self.rng("pool", pool_id)
+        return {
+            "pool_id": pool_id,
+            "live_stake": str(rng.randint(1_000, 80_000_000) * 1_000_000),
+            "live_saturation": round(rng.uniform(0.01, 1.05), 4),
+            "blocks_minted": rng.randint(0, 20_000),
+            "retiring_epoch": rng.randint(500, 600) if rng.random() < 0.03 else None,
+        }
+
+    def pool_metadata(self, pool_id: str) -> Optional[Dict[str, Any]]:
+        rng = self.rng("pool_meta", pool_id)
+        if rng.random() < 0.1:
+            return None
+        return {"pool_id": pool_id, "name": f"Simulated Pool {pool_id[5:11]}", "ticker": pool_id[5:9].upper()}
+
+    def proposals(self, count: int) -> List[Dict[str, Any]]:
+        types = ["TreasuryWithdrawals", "ParameterChange", "InfoAction", "HardForkInitiation",
+                 "NoConfidence", "NewConstitution", "NewCommittee"]
+        rng = self.rng("proposals")
+        return [
+            {"tx_hash": self.hex("proposal", i), "cert_index": 0,
+             "governance_type": rng.choices(types, weights=[30, 30, 25, 3, 2, 2, 8])[0]}
+            for i in range(count)
+        ]
+
+    def proposal(self, proposal_id: str) -> Dict[str, Any]:
+        rng = self.rng("proposal", proposal_id)
+        return {
+            "tx_hash": proposal_id.split("#")[0].split("/")[0],
+            "cert_index": 0,
+            "governance_type": "TreasuryWithdrawals",
+            "amount": rng.randint(10_000, 60_000_000) * 1_000_000,
+            "proposer_id": "stake_test1u" + self.hex("proposer", proposal_id, size=26),
+            "deposit": "100000000000",
+        }
+
+    def proposal_votes(self, proposal_id: str) -> List[Dict[str, Any]]:
+        rng = self.rng("votes", proposal_id)
+        return [
+            {"voter_role": rng.choice(["drep", "spo", "constitutional_committee"]),
+             "voter": "drep1" + self.hex("voter", proposal_id, i, size=28),
+             "vote": rng.choices(["yes", "no", "abstain"], weights=[5, 3, 2])[0]}
+            for i in range(rng.randint(0, 60))
+        ]
+
+    def epoch_parameters(self, epoch: int = 180) -> Dict[str, Any]:
+        return {
+            "epoch": epoch, "min_fee_a": 44, "min_fee_b": 155381,
+            "drep_deposit": "500000000", "gov_action_deposit": "100000000000",
+        }
+
+    def ipfs_document(self, cid: str) -> Dict[str, Any]:
+        rng = self.rng("ipfs", cid)
+        words = ["milestone", "deliverable", "audit", "tooling", "community", "research", "metric", "budget"]
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(20, 400)))
+        return {
+            "@context": {"CIP100": "https://github.com/cardano-foundation/CIPs/blob/master/CIP-0100/README.md#"},
+            "hashAlgorithm": "blake2b-256",
+            "authors": [],
+            "body": {
+                "title": f"Simulated proposal {cid[:8]}",
+                "abstract": text[:400],
+                "motivation": text,
+                "rationale": text[::-1],
+                "amount": rng.randint(10_000, 60_000_000) * 1_000_000,
+                "references": [{"@type": "Other", "label": "Spec", "uri": f"ipfs://{cid}"}],
+            },
+        }
+
+
+# =============================================================================
+# FAKE GEMINI
+# =============================================================================
+
+_JSON_FIELD_RE = re.compile(r'^\s*"(\w+)":\s*(.+?),?\s*$')
+
+
+def fake_generation(prompt: str, rng: random.Random) -> str:
+    """
+    Answer a prompt the way the agents' parsers expect.
+
+    Prompts with an "OUTPUT FORMAT (strict JSON)" template get a JSON object
+    with every templated field filled in; anything else gets prose.
+    """
+    if "strict JSON" not in prompt:
+        return "Simulated analysis: no anomalies beyond the supplied findings."
+
+    answer: Dict[str, Any] = {}
+    template = prompt.split("strict JSON", 1)[1]
+    for line in template.splitlines():
+        match = _JSON_FIELD_RE.match(line)
+        if not match:
+            continue
+        key, hint = match.groups()
+        if hint.startswith("["):
+            answer[key] = [] if rng.random() < 0.5 else ["SIMULATED_FLAG: Generated by upstream simulator"]
+        elif "|" in hint:
+            answer[key] = rng.choice(re.findall(r'"([^"]+)"', hint))
+        elif re.match(r"^\d+\.\d+-\d+\.\d+$", hint):
+            answer[key] = round(rng.random(), 2)
+        elif re.match(r"^\d+-\d+$", hint):
+            low, high = (int(v) for v in hint.split("-"))
+            answer[key] = rng.randint(low, high)
+        else:
+            answer[key] = "Simulated response generated offline."
+    return json.dumps(answer)
+
+
+# =============================================================================
+# APPLICATION
+# =============================================================================
+
+def create_simulator_app(config: Optional[SimulatorConfig] = None) -> FastAPI:
+    """Create the simulator ASGI app."""
+    config = config or SimulatorConfig.from_env()
+    chain = ChainData(config.seed, config.missing_rate)
+    faults = random.Random(config.seed)
+    samplers = {p: parse_latency(spec) for p, spec in config.latency.items()}
+    buckets = {p: TokenBucket(rate, rate) for p, rate in config.rate_limits.items() if rate > 0}
+    calls: Counter = Counter()
+
+    app = FastAPI(title="SON Upstream Simulator", version="1.0.0")
+
+    def _endpoint_name(path: str) -> str:
+        """Collapse identifiers out of a path for per-endpoint counters."""
+        return re.sub(r"/(addr|stake|pool|drep)[a-z_]*1[0-9a-z]+|/[0-9a-f]{40,}(#\d+)?|/Qm\w+|/bafy\w+", "/{id}", path)
+
+    @app.middleware("http")
+    async def simulate_network(request: Request, call_next):
+        """Apply latency, fault injection and rate limits per provider."""
+        path = request.url.path
+        provider = next((p for p in PROVIDERS if path.startswith(f"/{p}/")), None)
+        if path.startswith("/v1"):
+            provider = "gemini"
+        if provider is None:
+            return await call_next(request)
+
+        calls[(provider, request.method, _endpoint_name(path))] += 1
+        await asyncio.sleep(samplers[provider](faults))
+
+        bucket = buckets.get(provider)
+        if bucket is not None and not bucket.take():
+            return JSONResponse({"status_code": 429, "error": "Project Over Limit"}, status_code=429,
+                                headers={"Retry-After": str(max(1, math.ceil(bucket.time_until_token())))})
+        roll = faults.random()
+        if roll < config.throttle_rate:
+            return JSONResponse({"status_code": 429, "error": "Project Over Limit"}, status_code=429,
+                                headers={"Retry-After": f"{config.retry_after:g}"})
+        if roll < config.throttle_rate + config.error_rate:
+            return JSONResponse({"status_code": 503, "error": "Service Unavailable"}, status_code=503)
+        return await call_next(request)
+
+    def _not_found() -> JSONResponse:
+        return JSONResponse({"status_code": 404, "error": "Not Found"}, status_code=404)
+
+    # -------------------------------------------------------------------------
+    # BLOCKFROST
+    # -------------------------------------------------------------------------
+
+    bf = "/blockfrost/{network}/api/v0"
+
+    @app.get(bf + "/health")
+    async def bf_health(network: str):
+        return {"is_healthy": True}
+
+    @app.get(bf + "/addresses/{address}")
+    async def bf_address(network: str, address: str):
+        return chain.address(address) if chain.exists(address) else _not_found()
+
+    @app.get(bf + "/addresses/{address}/utxos")
+    async def bf_address_utxos(network: str, address: str):
+        return chain.address_utxos(address) if chain.exists(address) else _not_found()
+
+    @app.get(bf + "/addresses/{address}/transactions")
+    async def bf_address_txs(network: str, address: str, count: int = 100):
+        return chain.address_txs(address, count) if chain.exists(address) else _not_found()
+
+    @app.get(bf + "/accounts/{stake_address}")
+    async def bf_account(network: str, stake_address: str):
+        return chain.account(stake_address) if chain.exists(stake_address) else _not_found()
+
+    @app.get(bf + "/governance/dreps/{drep_id}")
+    async def bf_drep(network: str, drep_id: str):
+        return chain.drep(drep_id) or _not_found()
+
+    @app.get(bf + "/governance/proposals")
+    async def bf_proposals(network: str, count: int = 100):
+        return chain.proposals(count)
+
+    @app.get(bf + "/governance/proposals/{proposal_id:path}")
+    async def bf_proposal(network: str, proposal_id: str):
+        if proposal_id.endswith("/votes"):
+            proposal_id = proposal_id[:-len("/votes")]
+            return chain.proposal_votes(proposal_id) if chain.exists(proposal_id) else _not_found()
+        return chain.proposal(proposal_id) if chain.exists(proposal_id) else _not_found()
+
+    @app.get(bf + "/pools")
+    async def bf_pools(network: str, count: int = 100):
+        return chain.pool_ids(count)
+
+    @app.get(bf + "/pools/{pool_id}")
+    async def bf_pool(network: str, pool_id: str):
+        return chain.pool(pool_id)
+
+    @app.get(bf + "/pools/{pool_id}/metadata")
+    async def bf_pool_metadata(network: str, pool_id: str):
+        return chain.pool_metadata(pool_id) or _not_found()
+
+    @app.get(bf + "/epochs/latest/parameters")
+    async def bf_epoch_parameters(network: str):
+        return chain.epoch_parameters()
+
+    @app.get(bf + "/txs/{tx_hash}")
+    async def bf_tx(network: str, tx_hash: str):
+        return chain.tx(tx_hash) if chain.exists(tx_hash) else _not_found()
+
+    @app.get(bf + "/txs/{tx_hash}/utxos")
+    async def bf_tx_utxos(network: str, tx_hash: str):
+        return chain.tx_utxos(tx_hash) if chain.exists(tx_hash) else _not_found()
+
+    @app.get(bf + "/txs/{tx_hash}/redeemers")
+    async def bf_tx_redeemers(network: str, tx_hash: str):
+        return chain.tx_redeemers(tx_hash) if chain.exists(tx_hash) else _not_found()
+
+    # -------------------------------------------------------------------------
+    # KOIOS
+    # -------------------------------------------------------------------------
+
+    koios = "/koios/{network}/api/v1"
+
+    @app.get(koios + "/tip")
+    async def koios_tip(network: str):
+        return [{"epoch_no": 180, "abs_slot": 75_000_000, "block_height": 2_000_000, "block_time": 1_710_000_000}]
+
+    @app.get(koios + "/epoch_params")
+    async def koios_epoch_params(network: str, _limit: int = 1):
+        return [chain.epoch_parameters(180 - i) for i in range(_limit)]
+
+    def _rows(identifiers: List[str], build: Callable[[str], Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [build(i) for i in identifiers if chain.exists(i)]
+
+    @app.post(koios + "/tx_info")
+    async def koios_tx_info(network: str, request: Request):
+        body = await request.json()
+        return _rows(body.get("_tx_hashes", []), lambda h: {
+            "tx_hash": h, "block_time": chain.tx(h)["block_time"], "fee": chain.tx(h)["fees"],
+            "amount": int(chain.tx(h)["output_amount"][0]["quantity"]),
+        })
+
+    @app.get(koios + "/tx_info")
+    async def koios_tx_info_query(network: str):
+        # Unfiltered history query (treasury statistics)
+        return [{"tx_hash": chain.hex("history", i), "amount": chain.rng("history", i).randint(1, 80_000) * 1_000_000_000}
+                for i in range(100)]
+
+    @app.post(koios + "/address_info")
+    async def koios_address_info(network: str, request: Request):
+        body = await request.json()
+        return _rows(body.get("_addresses", []), lambda a: {
+            "address": a, "balance": chain.address(a)["amount"][0]["quantity"],
+            "stake_address": chain.stake_address(a), "utxo_set": [],
+        })
+
+    @app.post(koios + "/account_info")
+    async def koios_account_info(network: str, request: Request):
+        body = await request.json()
+        return _rows(body.get("_stake_addresses", []), lambda s: {
+            "stake_address": s, "status": "registered",
+            "delegated_pool": chain.account(s)["pool_id"],
+            "total_balance": chain.account(s)["controlled_amount"],
+            "rewards": chain.account(s)["rewards_sum"],
+        })
+
+    @app.get(koios + "/policy_asset_list")
+    async def koios_policy_assets(network: str, _asset_policy: str = ""):
+        if not chain.exists(_asset_policy):
+            return []
+        rng = chain.rng("policy", _asset_policy)
+        return [{"asset_name": chain.hex("asset", _asset_policy, i, size=8), "total_supply": str(rng.randint(1, 10**9))}
+                for i in range(rng.randint(1, 5))]
+
+    # -------------------------------------------------------------------------
+    # IPFS / GEMINI
+    # -------------------------------------------------------------------------
+
+    @app.get("/ipfs/{cid}")
+    async def ipfs_gateway(cid: str):
+        return chain.ipfs_document(cid) if chain.exists(cid) else _not_found()
+
+    @app.post("/{version}/models/{model}:generateContent")
+    async def gemini_generate_content(version: str, model: str, request: Request):
+        body = await request.json()
+        prompt = "\n".join(
+            part.get("text", "")
+            for content in body.get("contents", [])
+            for part in content.get("parts", [])
+        )
+        text = fake_generation(prompt, chain.rng("gemini", hashlib.sha256(prompt.encode()).hexdigest()))
+        return {
+            "candidates": [{
+                "content": {"parts": [{"text": text}], "role": "model"},
+                "finishReason": "STOP",
+                "index": 0,
+            }],
+            "usageMetadata": {
+                "promptTokenCount": len(prompt) // 4,
+                "candidatesTokenCount": len(text) // 4,
+                "totalTokenCount": (len(prompt) + len(text)) // 4,
+            },
+        }
+
+    # -------------------------------------------------------------------------
+    # SIMULATOR CONTROL
+    # -------------------------------------------------------------------------
+
+    @app.get("/_sim/stats")
+    async def sim_stats():
+        """Request counts per provider and endpoint since start or last reset."""
+        by_provider: Counter = Counter()
+        endpoints = []
+        for (provider, method, endpoint), count in sorted(calls.items()):
+            by_provider[provider] += count
+            endpoints.append({"provider": provider, "method": method, "endpoint": endpoint, "count": count})
+        return {"total": sum(by_provider.values()), "providers": dict(by_provider), "endpoints": endpoints}
+
+    @app.post("/_sim/reset")
+    async def sim_reset():
+        calls.clear()
+        return {"status": "reset"}
+
+    return app
+
+
+app = create_simulator_app()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    logging.basicConfig(level=logging.INFO)
+    uvicorn.run(app, host="127.0.0.1", port=int(os.getenv("SIM_PORT", "8765")), log_level="warning")